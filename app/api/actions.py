@@ -4,77 +4,168 @@ Actions API Routes
 POST endpoints for triggering operations.
 """
 
+from __future__ import annotations
+
+import asyncio
+import hashlib
 import logging
-from functools import partial
-from fastapi import APIRouter, BackgroundTasks, HTTPException, status
+from collections.abc import Iterator
+from typing import Annotated
+
+import orjson
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 
+from app import services
+from app.core import JobQueue, ORJSONResponse
 from app.models import (
-    ScanRequest,
-    MarkReadRequest,
-    DeleteScanRequest,
-    UnsubscribeRequest,
-    DeleteEmailsRequest,
-    DeleteBulkRequest,
-    DownloadEmailsRequest,
-    CreateLabelRequest,
     ApplyLabelRequest,
-    RemoveLabelRequest,
     ArchiveRequest,
-    MarkImportantRequest,
+    CreateLabelRequest,
+    DeleteBulkRequest,
+    DeleteEmailsRequest,
+    DeleteScanRequest,
+    DownloadEmailsRequest,
+    ExportByIdsRequest,
     ExportRequest,
+    MarkImportantRequest,
+    MarkReadRequest,
+    NonEmptyStr,
     ProcessUnsubscribeLabelRequest,
+    RemoveAccountRequest,
+    RemoveLabelRequest,
+    ScanRequest,
     SearchThreadsRequest,
-    ExportByIdsRequest,
     SwitchAccountRequest,
-    RemoveAccountRequest,
+    UnsubscribeRequest,
 )
-from app.services import (
-    scan_emails,
-    get_gmail_service,
-    sign_out,
-    get_accounts,
-    switch_account,
-    remove_account,
-    unsubscribe_single,
-    mark_emails_as_read,
-    scan_senders_for_delete,
-    delete_emails_by_sender,
-    delete_emails_bulk_background,
-    download_emails_background,
-    create_label,
-    delete_label,
-    apply_label_to_senders_background,
-    remove_label_from_senders_background,
-    archive_emails_background,
-    mark_important_background,
+from app.services.gmail.export import (
+    search_thread_previews,
+    start_export_threads_by_ids,
+    start_export_threads_by_query,
 )
+from app.services.gmail.unsubscribe import process_unsubscribe_label
 
-router = APIRouter(prefix="/api", tags=["Actions"])
+router = APIRouter(
+    prefix="/api", tags=["Actions"], default_response_class=ORJSONResponse
+)
 logger = logging.getLogger(__name__)
 
 
-@router.post("/scan")
-async def api_scan(request: ScanRequest, background_tasks: BackgroundTasks):
+def get_job_queue(request: Request) -> JobQueue:
+    """Dependency returning the app-wide background job queue."""
+    return request.app.state.job_queue
+
+
+JobQueueDep = Annotated[JobQueue, Depends(get_job_queue)]
+
+
+def _queue_full() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many operations in progress. Please try again shortly.",
+    )
+
+
+def _enqueue(jobs: JobQueue, fn, *args, **kwargs) -> str:
+    """Queue a background job, rejecting the request if the queue is full."""
+    try:
+        return jobs.submit(fn, *args, **kwargs)
+    except asyncio.QueueFull as e:
+        raise _queue_full() from e
+
+
+def _enqueue_once(jobs: JobQueue, route: str, fn, *args) -> ORJSONResponse:
+    """Queue a job unless an identical request to `route` is still in flight.
+
+    Duplicate submissions (e.g. a double-clicked scan button) get the running
+    job's ID back instead of starting another full Gmail pass.
+    """
+    key = hashlib.blake2b(
+        orjson.dumps([route, *args], option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).hexdigest()
+    try:
+        job_id, created = jobs.submit_once(key, fn, *args)
+    except asyncio.QueueFull as e:
+        raise _queue_full() from e
+    if not created:
+        return ORJSONResponse(
+            {"status": "already_running", "job_id": job_id},
+            headers={"Location": f"/api/jobs/{job_id}"},
+        )
+    return _accepted(job_id)
+
+
+def _start_sign_in(app: FastAPI) -> None:
+    """Run get_gmail_service on the app's dedicated OAuth executor.
+
+    Sign-in is kept off the job queue so it neither waits behind long Gmail
+    jobs nor takes a worker away from them.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(app.state.oauth_executor, services.get_gmail_service)
+    app.state.oauth_tasks.add(future)
+
+    def done(fut: asyncio.Future) -> None:
+        app.state.oauth_tasks.discard(fut)
+        if not fut.cancelled() and fut.exception() is not None:
+            logger.error("Sign-in failed", exc_info=fut.exception())
+
+    future.add_done_callback(done)
+
+
+def _export_response(
+    chunks: Iterator[str] | None, error: str | None
+) -> StreamingResponse:
+    """Stream a started thread export as a text attachment.
+
+    Raises:
+        HTTPException: 500 if the export could not be started
+    """
+    if error:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error,
+        )
+    # The remaining batches are fetched as Starlette iterates the chunks in
+    # its threadpool
+    return StreamingResponse(
+        chunks,
+        media_type="text/plain",
+        headers={"Content-Disposition": "attachment; filename=email_export.txt"},
+    )
+
+
+def _accepted(job_id: str) -> ORJSONResponse:
+    """202 response pointing the client at the queued job's status."""
+    return ORJSONResponse(
+        {"status": "started", "job_id": job_id},
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={"Location": f"/api/jobs/{job_id}"},
+    )
+
+
+@router.post("/scan", status_code=status.HTTP_202_ACCEPTED)
+async def api_scan(request: ScanRequest, jobs: JobQueueDep):
     """Start email scan for unsubscribe links."""
-    filters_dict = (
-        request.filters.model_dump(exclude_none=True) if request.filters else None
+    return _enqueue_once(
+        jobs, "/scan", services.scan_emails, request.limit, request.filters_payload
     )
-    background_tasks.add_task(scan_emails, request.limit, filters_dict)
-    return {"status": "started"}
 
 
 @router.post("/sign-in")
-async def api_sign_in(background_tasks: BackgroundTasks):
+async def api_sign_in(request: Request):
     """Trigger OAuth sign-in flow."""
-    background_tasks.add_task(get_gmail_service)
+    _start_sign_in(request.app)
     return {"status": "signing_in"}
 
 
-@router.post("/sign-out")
+@router.post("/sign-out", response_model=None)
 async def api_sign_out():
     """Sign out and clear credentials."""
     try:
-        return sign_out()
+        return ORJSONResponse(await run_in_threadpool(services.sign_out))
     except Exception as e:
         logger.exception("Error during sign-out")
         raise HTTPException(
@@ -83,11 +174,16 @@ async def api_sign_out():
         ) from e
 
 
-@router.post("/unsubscribe")
+@router.post("/unsubscribe", response_model=None)
 async def api_unsubscribe(request: UnsubscribeRequest):
     """Unsubscribe from a single sender."""
     try:
-        return unsubscribe_single(request.domain, request.link)
+        # Blocks on the sender's server for up to 10s per request; keep it
+        # off the event loop
+        result = await run_in_threadpool(
+            services.unsubscribe_single, request.domain, request.link
+        )
+        return ORJSONResponse(result)
     except Exception as e:
         logger.exception("Error during unsubscribe")
         raise HTTPException(
@@ -96,38 +192,38 @@ async def api_unsubscribe(request: UnsubscribeRequest):
         ) from e
 
 
-@router.post("/mark-read")
-async def api_mark_read(request: MarkReadRequest, background_tasks: BackgroundTasks):
+@router.post("/mark-read", status_code=status.HTTP_202_ACCEPTED)
+async def api_mark_read(request: MarkReadRequest, jobs: JobQueueDep):
     """Mark emails as read."""
-    filters_dict = (
-        request.filters.model_dump(exclude_none=True) if request.filters else None
+    return _enqueue_once(
+        jobs,
+        "/mark-read",
+        services.mark_emails_as_read,
+        request.count,
+        request.filters_payload,
     )
-    background_tasks.add_task(mark_emails_as_read, request.count, filters_dict)
-    return {"status": "started"}
 
 
-@router.post("/delete-scan")
-async def api_delete_scan(
-    request: DeleteScanRequest, background_tasks: BackgroundTasks
-):
+@router.post("/delete-scan", status_code=status.HTTP_202_ACCEPTED)
+async def api_delete_scan(request: DeleteScanRequest, jobs: JobQueueDep):
     """Scan senders for bulk delete."""
-    filters_dict = (
-        request.filters.model_dump(exclude_none=True) if request.filters else None
+    return _enqueue_once(
+        jobs,
+        "/delete-scan",
+        services.scan_senders_for_delete,
+        request.limit,
+        request.filters_payload,
     )
-    background_tasks.add_task(scan_senders_for_delete, request.limit, filters_dict)
-    return {"status": "started"}
 
 
-@router.post("/delete-emails")
+@router.post("/delete-emails", response_model=None)
 async def api_delete_emails(request: DeleteEmailsRequest):
     """Delete emails from a specific sender."""
-    if not request.sender or not request.sender.strip():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Sender email is required",
-        )
     try:
-        return delete_emails_by_sender(request.sender)
+        result = await run_in_threadpool(
+            services.delete_emails_by_sender, request.sender
+        )
+        return ORJSONResponse(result)
     except Exception as e:
         logger.exception("Error deleting emails")
         raise HTTPException(
@@ -136,33 +232,30 @@ async def api_delete_emails(request: DeleteEmailsRequest):
         ) from e
 
 
-@router.post("/delete-emails-bulk")
-async def api_delete_emails_bulk(
-    request: DeleteBulkRequest, background_tasks: BackgroundTasks
-):
+@router.post("/delete-emails-bulk", status_code=status.HTTP_202_ACCEPTED)
+async def api_delete_emails_bulk(request: DeleteBulkRequest, jobs: JobQueueDep):
     """Delete emails from multiple senders (background task with progress)."""
-    background_tasks.add_task(delete_emails_bulk_background, request.senders)
-    return {"status": "started"}
+    job_id = _enqueue(jobs, services.delete_emails_bulk_background, request.senders)
+    return _accepted(job_id)
 
 
-@router.post("/download-emails")
-async def api_download_emails(
-    request: DownloadEmailsRequest, background_tasks: BackgroundTasks
-):
+@router.post("/download-emails", status_code=status.HTTP_202_ACCEPTED)
+async def api_download_emails(request: DownloadEmailsRequest, jobs: JobQueueDep):
     """Start downloading email metadata for selected senders."""
     # Note: Empty list is allowed - service function will handle it gracefully
-    background_tasks.add_task(download_emails_background, request.senders)
-    return {"status": "started"}
+    job_id = _enqueue(jobs, services.download_emails_background, request.senders)
+    return _accepted(job_id)
 
 
 # ----- Label Management Endpoints -----
 
 
-@router.post("/labels")
+@router.post("/labels", response_model=None)
 async def api_create_label(request: CreateLabelRequest):
     """Create a new Gmail label."""
     try:
-        return create_label(request.name)
+        result = await run_in_threadpool(services.create_label, request.name)
+        return ORJSONResponse(result)
     except Exception as e:
         logger.exception("Error creating label")
         raise HTTPException(
@@ -171,16 +264,12 @@ async def api_create_label(request: CreateLabelRequest):
         ) from e
 
 
-@router.delete("/labels/{label_id}")
-async def api_delete_label(label_id: str):
+@router.delete("/labels/{label_id}", response_model=None)
+async def api_delete_label(label_id: NonEmptyStr):
     """Delete a Gmail label."""
-    if not label_id or not label_id.strip():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Label ID is required",
-        )
     try:
-        return delete_label(label_id)
+        result = await run_in_threadpool(services.delete_label, label_id)
+        return ORJSONResponse(result)
     except Exception as e:
         logger.exception("Error deleting label")
         raise HTTPException(
@@ -189,194 +278,149 @@ async def api_delete_label(label_id: str):
         ) from e
 
 
-@router.post("/apply-label")
-async def api_apply_label(
-    request: ApplyLabelRequest, background_tasks: BackgroundTasks
-):
+@router.post("/apply-label", status_code=status.HTTP_202_ACCEPTED)
+async def api_apply_label(request: ApplyLabelRequest, jobs: JobQueueDep):
     """Apply a label to emails from selected senders."""
-    if not request.label_id or not request.label_id.strip():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Label ID is required",
-        )
-    if not request.senders:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="At least one sender is required",
-        )
-    background_tasks.add_task(
-        apply_label_to_senders_background, request.label_id, request.senders
+    job_id = _enqueue(
+        jobs,
+        services.apply_label_to_senders_background,
+        request.label_id,
+        request.senders,
     )
-    return {"status": "started"}
+    return _accepted(job_id)
 
 
-@router.post("/remove-label")
-async def api_remove_label(
-    request: RemoveLabelRequest, background_tasks: BackgroundTasks
-):
+@router.post("/remove-label", status_code=status.HTTP_202_ACCEPTED)
+async def api_remove_label(request: RemoveLabelRequest, jobs: JobQueueDep):
     """Remove a label from emails from selected senders."""
-    if not request.label_id or not request.label_id.strip():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Label ID is required",
-        )
-    if not request.senders:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="At least one sender is required",
-        )
-    background_tasks.add_task(
-        remove_label_from_senders_background, request.label_id, request.senders
+    job_id = _enqueue(
+        jobs,
+        services.remove_label_from_senders_background,
+        request.label_id,
+        request.senders,
     )
-    return {"status": "started"}
+    return _accepted(job_id)
 
 
-@router.post("/archive")
-async def api_archive(request: ArchiveRequest, background_tasks: BackgroundTasks):
+@router.post("/archive", status_code=status.HTTP_202_ACCEPTED)
+async def api_archive(request: ArchiveRequest, jobs: JobQueueDep):
     """Archive emails from selected senders (remove from inbox)."""
-    if not request.senders:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="At least one sender is required",
-        )
-    background_tasks.add_task(archive_emails_background, request.senders)
-    return {"status": "started"}
+    job_id = _enqueue(jobs, services.archive_emails_background, request.senders)
+    return _accepted(job_id)
 
 
-@router.post("/mark-important")
-async def api_mark_important(
-    request: MarkImportantRequest, background_tasks: BackgroundTasks
-):
+@router.post("/mark-important", status_code=status.HTTP_202_ACCEPTED)
+async def api_mark_important(request: MarkImportantRequest, jobs: JobQueueDep):
     """Mark/unmark emails from selected senders as important."""
-    if not request.senders:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="At least one sender is required",
-        )
-    background_tasks.add_task(
-        partial(mark_important_background, request.senders, important=request.important)
+    job_id = _enqueue(
+        jobs,
+        services.mark_important_background,
+        request.senders,
+        important=request.important,
     )
-    return {"status": "started"}
+    return _accepted(job_id)
 
 
 @router.post("/export-threads")
 async def api_export_threads(request: ExportRequest):
     """Export email threads by search query to a text file."""
-    from fastapi.responses import Response
-    from app.services.gmail.export import export_threads_by_query
-
-    try:
-        # Call the export function
-        export_content = export_threads_by_query(
-            query=request.query,
-            max_threads=request.max_threads
-        )
-
-        # Return as downloadable text file
-        return Response(
-            content=export_content,
-            media_type="text/plain",
-            headers={
-                "Content-Disposition": "attachment; filename=email_export.txt"
-            }
-        )
-    except Exception as e:
-        logger.exception("Error during thread export")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to export threads: {str(e)}"
-        ) from e
+    # Sign-in, the search and the first batch happen before responding, so
+    # their errors get an error status; later threads stream as fetched
+    chunks, error = await run_in_threadpool(
+        start_export_threads_by_query,
+        query=request.query,
+        max_threads=request.max_threads,
+    )
+    return _export_response(chunks, error)
 
 
 @router.post("/process-unsubscribe-label")
 async def api_process_unsubscribe_label(request: ProcessUnsubscribeLabelRequest):
     """Process emails with 'Unsubscribe' label and visit unsubscribe links."""
-    from app.services.gmail.unsubscribe import process_unsubscribe_label
-
     try:
-        result = process_unsubscribe_label(label_name=request.label_name)
+        result = await run_in_threadpool(
+            process_unsubscribe_label, label_name=request.label_name
+        )
         return {"success": True, "message": result}
     except Exception as e:
         logger.exception("Error processing unsubscribe label")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to process unsubscribe label: {str(e)}"
+            detail=f"Failed to process unsubscribe label: {e!s}"
         ) from e
 
 
 # ----- Search & Selective Export Endpoints -----
 
 
-@router.post("/search-threads")
+@router.post("/search-threads", response_model=None)
 async def api_search_threads(request: SearchThreadsRequest):
     """Search for email threads and return previews (sender, subject, date, snippet)."""
-    from app.services.gmail.export import search_thread_previews
-
-    result = search_thread_previews(query=request.query, max_results=request.max_results)
+    # Lists and batch-fetches threads from Gmail; keep it off the event loop
+    result = await run_in_threadpool(
+        search_thread_previews, query=request.query, max_results=request.max_results
+    )
     if not result["success"]:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=result.get("error", "Search failed"),
         )
-    return result
+    return ORJSONResponse(result)
 
 
 @router.post("/export-selected")
 async def api_export_selected(request: ExportByIdsRequest):
     """Export specific email threads by ID to a text file."""
-    from fastapi.responses import Response
-    from app.services.gmail.export import export_threads_by_ids
-
-    try:
-        export_content = export_threads_by_ids(thread_ids=request.thread_ids)
-        return Response(
-            content=export_content,
-            media_type="text/plain",
-            headers={"Content-Disposition": "attachment; filename=email_export.txt"},
-        )
-    except Exception as e:
-        logger.exception("Error during selective export")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to export: {str(e)}",
-        ) from e
+    chunks, error = await run_in_threadpool(
+        start_export_threads_by_ids, thread_ids=request.thread_ids
+    )
+    return _export_response(chunks, error)
 
 
 # ----- Multi-Account Endpoints -----
 
 
-@router.get("/accounts")
-async def api_get_accounts():
-    """Get list of signed-in accounts."""
-    return {"accounts": get_accounts()}
+@router.get("/accounts", response_model=None)
+async def api_get_accounts(request: Request):
+    """Get list of signed-in accounts.
+
+    Sends an ETag so polling clients get an empty 304 while nothing changed.
+    """
+    accounts = await run_in_threadpool(services.get_accounts)
+    body = orjson.dumps({"accounts": accounts})
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
-@router.post("/accounts/switch")
+@router.post("/accounts/switch", response_model=None)
 async def api_switch_account(request: SwitchAccountRequest):
     """Switch active account."""
-    result = switch_account(request.email)
+    result = await run_in_threadpool(services.switch_account, request.email)
     if not result.get("success"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=result.get("error", "Failed to switch account"),
         )
-    return result
+    return ORJSONResponse(result)
 
 
-@router.post("/accounts/remove")
+@router.post("/accounts/remove", response_model=None)
 async def api_remove_account(request: RemoveAccountRequest):
     """Remove a signed-in account."""
-    result = remove_account(request.email)
+    result = await run_in_threadpool(services.remove_account, request.email)
     if not result.get("success"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=result.get("error", "Failed to remove account"),
         )
-    return result
+    return ORJSONResponse(result)
 
 
 @router.post("/accounts/add")
-async def api_add_account(background_tasks: BackgroundTasks):
+async def api_add_account(request: Request):
     """Trigger OAuth flow to add a new account."""
-    background_tasks.add_task(get_gmail_service)
+    _start_sign_in(request.app)
     return {"status": "signing_in"}
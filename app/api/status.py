@@ -7,26 +7,10 @@ GET endpoints for checking status of various operations.
 import logging
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
 from fastapi.responses import Response
 
-from app.services import (
-    get_scan_status,
-    get_scan_results,
-    check_login_status,
-    get_web_auth_status,
-    get_unread_count,
-    get_mark_read_status,
-    get_delete_scan_status,
-    get_delete_scan_results,
-    get_delete_bulk_status,
-    get_download_status,
-    get_download_csv,
-    get_labels,
-    get_label_operation_status,
-    get_archive_status,
-    get_important_status,
-)
+from app import services
 
 router = APIRouter(prefix="/api", tags=["Status"])
 logger = logging.getLogger(__name__)
@@ -36,7 +20,7 @@ logger = logging.getLogger(__name__)
 async def api_status():
     """Get email scan status."""
     try:
-        return get_scan_status()
+        return services.get_scan_status()
     except Exception as e:
         logger.exception("Error getting scan status")
         raise HTTPException(
@@ -49,7 +33,7 @@ async def api_status():
 async def api_results():
     """Get email scan results."""
     try:
-        return get_scan_results()
+        return services.get_scan_results()
     except Exception as e:
         logger.exception("Error getting scan results")
         raise HTTPException(
@@ -62,7 +46,7 @@ async def api_results():
 async def api_auth_status():
     """Get authentication status."""
     try:
-        return check_login_status()
+        return services.check_login_status()
     except Exception as e:
         logger.exception("Error getting auth status")
         raise HTTPException(
@@ -75,7 +59,7 @@ async def api_auth_status():
 async def api_web_auth_status():
     """Get web auth status for Docker/headless mode."""
     try:
-        return get_web_auth_status()
+        return services.get_web_auth_status()
     except Exception as e:
         logger.exception("Error getting web auth status")
         raise HTTPException(
@@ -88,7 +72,7 @@ async def api_web_auth_status():
 async def api_unread_count():
     """Get unread email count."""
     try:
-        return get_unread_count()
+        return services.get_unread_count()
     except Exception as e:
         logger.exception("Error getting unread count")
         raise HTTPException(
@@ -101,7 +85,7 @@ async def api_unread_count():
 async def api_mark_read_status():
     """Get mark-as-read operation status."""
     try:
-        return get_mark_read_status()
+        return services.get_mark_read_status()
     except Exception as e:
         logger.exception("Error getting mark-read status")
         raise HTTPException(
@@ -114,7 +98,7 @@ async def api_mark_read_status():
 async def api_delete_scan_status():
     """Get delete scan status."""
     try:
-        return get_delete_scan_status()
+        return services.get_delete_scan_status()
     except Exception as e:
         logger.exception("Error getting delete scan status")
         raise HTTPException(
@@ -127,7 +111,7 @@ async def api_delete_scan_status():
 async def api_delete_scan_results():
     """Get delete scan results (senders grouped by count)."""
     try:
-        return get_delete_scan_results()
+        return services.get_delete_scan_results()
     except Exception as e:
         logger.exception("Error getting delete scan results")
         raise HTTPException(
@@ -140,7 +124,7 @@ async def api_delete_scan_results():
 async def api_download_status():
     """Get download operation status."""
     try:
-        return get_download_status()
+        return services.get_download_status()
     except Exception as e:
         logger.exception("Error getting download status")
         raise HTTPException(
@@ -153,7 +137,7 @@ async def api_download_status():
 async def api_download_csv():
     """Get the generated CSV file."""
     try:
-        csv_data = get_download_csv()
+        csv_data = services.get_download_csv()
         if not csv_data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -181,7 +165,7 @@ async def api_download_csv():
 async def api_delete_bulk_status():
     """Get bulk delete operation status."""
     try:
-        return get_delete_bulk_status()
+        return services.get_delete_bulk_status()
     except Exception as e:
         logger.exception("Error getting delete bulk status")
         raise HTTPException(
@@ -197,7 +181,7 @@ async def api_delete_bulk_status():
 async def api_get_labels():
     """Get all Gmail labels."""
     try:
-        return get_labels()
+        return services.get_labels()
     except Exception as e:
         logger.exception("Error getting labels")
         raise HTTPException(
@@ -210,7 +194,7 @@ async def api_get_labels():
 async def api_label_operation_status():
     """Get label operation status (apply/remove)."""
     try:
-        return get_label_operation_status()
+        return services.get_label_operation_status()
     except Exception as e:
         logger.exception("Error getting label operation status")
         raise HTTPException(
@@ -223,7 +207,7 @@ async def api_label_operation_status():
 async def api_archive_status():
     """Get archive operation status."""
     try:
-        return get_archive_status()
+        return services.get_archive_status()
     except Exception as e:
         logger.exception("Error getting archive status")
         raise HTTPException(
@@ -236,10 +220,22 @@ async def api_archive_status():
 async def api_important_status():
     """Get mark important operation status."""
     try:
-        return get_important_status()
+        return services.get_important_status()
     except Exception as e:
         logger.exception("Error getting important status")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get important status",
         ) from e
+
+
+@router.get("/jobs/{job_id}")
+async def api_job_status(job_id: str, request: Request):
+    """Get the state of a queued background job."""
+    job = request.app.state.job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    return job
@@ -1,4 +1,6 @@
 """Core module exports."""
 
 from .config import settings
+from .jobs import JobQueue
+from .responses import ORJSONResponse
 from .state import state
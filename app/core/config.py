@@ -5,6 +5,7 @@ Central configuration and settings for the application.
 """
 
 import os
+
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -44,6 +45,23 @@ class Settings(BaseSettings):
             return normalized in ("true", "1", "yes", "on")
         return bool(v)
 
+    # Background jobs
+    job_workers: int = Field(
+        default=8,
+        ge=1,
+        description="Number of background operations that can run concurrently",
+    )
+    job_queue_size: int = Field(
+        default=1024,
+        ge=1,
+        description="Maximum number of background operations waiting to run",
+    )
+    oauth_workers: int = Field(
+        default=2,
+        ge=1,
+        description="Threads reserved for starting OAuth sign-in flows",
+    )
+
     credentials_file: str = "credentials.json"
     token_file: str = "token.json"
 
@@ -0,0 +1,148 @@
+"""
+Background Job Queue
+--------------------
+Bounded queue of background operations drained by a fixed pool of workers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """Runs blocking service functions on a dedicated thread pool.
+
+    Request handlers submit jobs and return immediately; `workers` coroutines
+    pull jobs off a bounded asyncio queue and run each one in the executor,
+    so at most `workers` Gmail operations run at the same time.
+
+    Every submitted job gets an ID whose state (queued, running, done,
+    failed) can be looked up with `get`. Finished jobs beyond `history` are
+    forgotten oldest-first.
+    """
+
+    def __init__(
+        self, workers: int = 8, maxsize: int = 1024, history: int = 1024
+    ) -> None:
+        self.workers = workers
+        self.maxsize = maxsize
+        self.history = history
+        self._queue: asyncio.Queue | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._jobs: OrderedDict[str, dict] = OrderedDict()
+        # Dedupe keys of queued/running jobs, and the reverse lookup
+        self._inflight: dict[str, str] = {}
+        self._inflight_keys: dict[str, str] = {}
+
+    async def start(self) -> None:
+        """Create the queue and start the worker tasks (call from the event loop)."""
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="gmail-job"
+        )
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """Stop the workers and drop any jobs that have not started yet."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> str:
+        """Queue `fn(*args, **kwargs)` to run in the background.
+
+        Returns:
+            ID of the new job
+
+        Raises:
+            RuntimeError: If the queue has not been started
+            asyncio.QueueFull: If `maxsize` jobs are already pending
+        """
+        if self._queue is None:
+            raise RuntimeError("Job queue is not running")
+        job_id = uuid.uuid4().hex
+        self._queue.put_nowait((job_id, fn, args, kwargs))
+        self._jobs[job_id] = {
+            "id": job_id,
+            "name": getattr(fn, "__name__", repr(fn)),
+            "state": "queued",
+            "error": None,
+        }
+        return job_id
+
+    def submit_once(
+        self, key: str, fn: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> tuple[str, bool]:
+        """Queue a job unless one with the same `key` is still queued or running.
+
+        Returns:
+            Tuple of (job ID, whether a new job was queued)
+
+        Raises:
+            RuntimeError: If the queue has not been started
+            asyncio.QueueFull: If `maxsize` jobs are already pending
+        """
+        if (job_id := self._inflight.get(key)) is not None:
+            return job_id, False
+        job_id = self.submit(fn, *args, **kwargs)
+        self._inflight[key] = job_id
+        self._inflight_keys[job_id] = key
+        return job_id, True
+
+    def get(self, job_id: str) -> dict | None:
+        """Get a copy of a job's status, or None if the ID is unknown."""
+        job = self._jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+    async def join(self) -> None:
+        """Wait until every queued job has finished."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    def _forget_finished(self) -> None:
+        """Drop the oldest finished jobs once more than `history` are tracked."""
+        excess = len(self._jobs) - self.history
+        if excess <= 0:
+            return
+        finished = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job["state"] in ("done", "failed")
+        ]
+        for job_id in finished[:excess]:
+            del self._jobs[job_id]
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job_id, fn, args, kwargs = await self._queue.get()
+            job = self._jobs[job_id]
+            job["state"] = "running"
+            try:
+                await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+                job["state"] = "done"
+            except Exception as e:
+                logger.exception("Background job %s failed", job["name"])
+                job["state"] = "failed"
+                job["error"] = str(e)
+            finally:
+                if (key := self._inflight_keys.pop(job_id, None)) is not None:
+                    del self._inflight[key]
+                self._queue.task_done()
+                self._forget_finished()
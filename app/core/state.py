@@ -14,6 +14,8 @@ class AppState:
         # Multi-account state
         # accounts: list of {"email": str, "token_file": str}
         self.accounts: list = []
+        # accounts_by_email: the same account dicts keyed by email
+        self.accounts_by_email: dict = {}
         # active_account: email of currently active account, or None
         self.active_account: str | None = None
 
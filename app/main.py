@@ -7,14 +7,17 @@ Main application factory and configuration.
 import hashlib
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from app.core import settings
-from app.api import status_router, actions_router
+from app.api import actions_router, status_router
+from app.core import JobQueue, settings
+from app.services.gmail.export import shutdown_fetch_executor
 
 templates = Jinja2Templates(directory="templates")
 
@@ -117,9 +120,21 @@ async def lifespan(app: FastAPI):
     """Application lifespan - startup and shutdown events."""
     # Startup
     print(f"{settings.app_name} v{settings.app_version} starting...")
+    job_queue = JobQueue(workers=settings.job_workers, maxsize=settings.job_queue_size)
+    await job_queue.start()
+    app.state.job_queue = job_queue
+    # Sign-in gets its own threads so it never waits behind Gmail jobs
+    oauth_executor = ThreadPoolExecutor(
+        max_workers=settings.oauth_workers, thread_name_prefix="oauth"
+    )
+    app.state.oauth_executor = oauth_executor
+    app.state.oauth_tasks = set()
     yield
     # Shutdown
     print("Shutting down...")
+    await job_queue.stop()
+    oauth_executor.shutdown(wait=False, cancel_futures=True)
+    shutdown_fetch_executor()
 
 
 def create_app() -> FastAPI:
@@ -134,6 +149,9 @@ def create_app() -> FastAPI:
         redoc_url="/redoc",
     )
 
+    # Compress larger responses (thread exports are plain text and shrink well)
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
     # Mount static files
     app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -1,28 +1,29 @@
 """Models module exports."""
 
 from .schemas import (
-    ScanRequest,
-    MarkReadRequest,
-    DeleteScanRequest,
-    UnsubscribeRequest,
-    DeleteEmailsRequest,
-    DeleteBulkRequest,
-    DownloadEmailsRequest,
-    CreateLabelRequest,
     ApplyLabelRequest,
-    RemoveLabelRequest,
     ArchiveRequest,
-    MarkImportantRequest,
+    AuthStatusResponse,
+    CreateLabelRequest,
+    DeleteBulkRequest,
+    DeleteEmailsRequest,
+    DeleteResponse,
+    DeleteScanRequest,
+    DownloadEmailsRequest,
+    ExportByIdsRequest,
     ExportRequest,
+    MarkImportantRequest,
+    MarkReadRequest,
+    NonEmptyStr,
     ProcessUnsubscribeLabelRequest,
-    SearchThreadsRequest,
-    ExportByIdsRequest,
-    SwitchAccountRequest,
     RemoveAccountRequest,
-    StatusResponse,
-    AuthStatusResponse,
+    RemoveLabelRequest,
+    ScanRequest,
     ScanStatusResponse,
+    SearchThreadsRequest,
+    StatusResponse,
+    SwitchAccountRequest,
     UnreadCountResponse,
+    UnsubscribeRequest,
     UnsubscribeResponse,
-    DeleteResponse,
 )
@@ -4,17 +4,46 @@ Pydantic Models - Request/Response Schemas
 Data validation and serialization.
 """
 
-from typing import Optional
-from pydantic import BaseModel, Field, field_validator
+from functools import cached_property
+from typing import Annotated, Optional
+from pydantic import (
+    AfterValidator,
+    BaseModel,
+    ConfigDict,
+    Field,
+    StringConstraints,
+    field_validator,
+)
 import re
 
 
+def _dedupe_senders(senders: list[str]) -> list[str]:
+    """Drop repeated senders (case-insensitive), keeping first occurrence order."""
+    seen: set[str] = set()
+    unique = []
+    for sender in senders:
+        key = sender.casefold()
+        if key not in seen:
+            seen.add(key)
+            unique.append(sender)
+    return unique
+
+
+# Required string that is not blank once surrounding whitespace is stripped
+NonEmptyStr = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+
+# Sender addresses; duplicates would repeat the same Gmail search per sender
+SenderList = Annotated[list[str], AfterValidator(_dedupe_senders)]
+
+
 # ----- Filter Model -----
 
 
 class FiltersModel(BaseModel):
     """Gmail filter options with validation."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     older_than: Optional[str] = Field(
         default=None,
         description="Filter emails older than (e.g., 7d, 30d, 90d, 180d, 365d)",
@@ -95,20 +124,47 @@ class FiltersModel(BaseModel):
             raise ValueError("sender must be a valid email address or domain")
         return sender
 
+    @cached_property
+    def as_dict(self) -> dict[str, str]:
+        """Non-empty filters as a plain dict (built once; the model is immutable)."""
+        return self.model_dump(exclude_none=True)
+
 
 # ----- Request Models -----
 
 
-class ScanRequest(BaseModel):
+class RequestModel(BaseModel):
+    """Base for API request bodies: unknown fields rejected, instances immutable."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+
+class FilteredRequest(RequestModel):
+    """Base for requests that accept Gmail filter options."""
+
+    filters: FiltersModel = Field(
+        default_factory=FiltersModel, description="Gmail filter options"
+    )
+
+    @field_validator("filters", mode="before")
+    @classmethod
+    def default_null_filters(cls, v):
+        # Clients may send "filters": null for "no filters"
+        return FiltersModel() if v is None else v
+
+    @property
+    def filters_payload(self) -> Optional[dict[str, str]]:
+        """Filters as passed to the services: a dict, or None if none are set."""
+        return self.filters.as_dict or None
+
+
+class ScanRequest(FilteredRequest):
     """Request to start email scan."""
 
     limit: int = Field(default=500, ge=1, le=5000, description="Max emails to scan")
-    filters: Optional[FiltersModel] = Field(
-        default=None, description="Gmail filter options"
-    )
 
 
-class MarkReadRequest(BaseModel):
+class MarkReadRequest(FilteredRequest):
     """Request to mark emails as read."""
 
     count: int = Field(
@@ -117,81 +173,83 @@ class MarkReadRequest(BaseModel):
         le=100000,
         description="Number of emails to mark. Use 0 to mark all.",
     )
-    filters: Optional[FiltersModel] = Field(
-        default=None, description="Gmail filter options"
-    )
 
 
-class DeleteScanRequest(BaseModel):
+class DeleteScanRequest(FilteredRequest):
     """Request to scan senders for deletion."""
 
     limit: int = Field(default=1000, ge=1, le=10000, description="Max emails to scan")
-    filters: Optional[FiltersModel] = Field(
-        default=None, description="Gmail filter options"
-    )
 
 
-class UnsubscribeRequest(BaseModel):
+class UnsubscribeRequest(RequestModel):
     """Request to unsubscribe from a sender."""
 
     domain: str = Field(default="", description="Sender domain")
     link: str = Field(default="", description="Unsubscribe link URL")
 
 
-class DeleteEmailsRequest(BaseModel):
+class DeleteEmailsRequest(RequestModel):
     """Request to delete emails from a sender."""
 
-    sender: str = Field(default="", description="Sender email address")
+    sender: NonEmptyStr = Field(..., description="Sender email address")
 
 
-class DeleteBulkRequest(BaseModel):
+class DeleteBulkRequest(RequestModel):
     """Request to delete emails from multiple senders."""
 
-    senders: list[str] = Field(default=[], description="List of sender addresses")
+    senders: SenderList = Field(default=[], description="List of sender addresses")
 
 
-class DownloadEmailsRequest(BaseModel):
+class DownloadEmailsRequest(RequestModel):
     """Request to download emails from selected senders."""
 
-    senders: list[str] = Field(default=[], description="List of sender addresses")
+    senders: SenderList = Field(default=[], description="List of sender addresses")
 
 
-class CreateLabelRequest(BaseModel):
+class CreateLabelRequest(RequestModel):
     """Request to create a new Gmail label."""
 
     name: str = Field(..., min_length=1, max_length=100, description="Label name")
 
 
-class ApplyLabelRequest(BaseModel):
+class ApplyLabelRequest(RequestModel):
     """Request to apply a label to emails from selected senders."""
 
-    label_id: str = Field(..., description="Gmail label ID to apply")
-    senders: list[str] = Field(default=[], description="List of sender addresses")
+    label_id: NonEmptyStr = Field(..., description="Gmail label ID to apply")
+    senders: SenderList = Field(
+        ..., min_length=1, description="List of sender addresses"
+    )
 
 
-class RemoveLabelRequest(BaseModel):
+class RemoveLabelRequest(RequestModel):
     """Request to remove a label from selected senders."""
 
-    label_id: str = Field(..., description="Gmail label ID to remove")
-    senders: list[str] = Field(default=[], description="List of sender addresses")
+    label_id: NonEmptyStr = Field(..., description="Gmail label ID to remove")
+    senders: SenderList = Field(
+        ..., min_length=1, description="List of sender addresses"
+    )
 
 
-class ArchiveRequest(BaseModel):
+class ArchiveRequest(RequestModel):
     """Request to archive emails from selected senders."""
 
-    senders: list[str] = Field(default=[], description="List of sender addresses")
+    senders: SenderList = Field(
+        ..., min_length=1, description="List of sender addresses"
+    )
 
 
-class MarkImportantRequest(BaseModel):
+class MarkImportantRequest(RequestModel):
     """Request to mark/unmark emails as important."""
 
-    senders: list[str] = Field(default=[], description="List of sender addresses")
+    senders: SenderList = Field(
+        ..., min_length=1, description="List of sender addresses"
+    )
     important: bool = Field(
         default=True, description="True to mark important, False to unmark"
     )
 
 
-class ExportRequest(BaseModel):
+class ExportRequest(RequestModel):
     """Request to export email threads by search query."""
 
     query: str = Field(..., min_length=1, description="Gmail search query")
@@ -200,7 +258,7 @@ class ExportRequest(BaseModel):
     )
 
 
-class ProcessUnsubscribeLabelRequest(BaseModel):
+class ProcessUnsubscribeLabelRequest(RequestModel):
     """Request to process emails with 'Unsubscribe' label."""
 
     label_name: str = Field(
@@ -208,7 +266,7 @@ class ProcessUnsubscribeLabelRequest(BaseModel):
     )
 
 
-class SearchThreadsRequest(BaseModel):
+class SearchThreadsRequest(RequestModel):
     """Request to search for thread previews."""
 
     query: str = Field(..., min_length=1, description="Gmail search query")
@@ -217,19 +275,19 @@ class SearchThreadsRequest(BaseModel):
     )
 
 
-class ExportByIdsRequest(BaseModel):
+class ExportByIdsRequest(RequestModel):
     """Request to export specific threads by their IDs."""
 
     thread_ids: list[str] = Field(..., min_length=1, description="List of thread IDs to export")
 
 
-class SwitchAccountRequest(BaseModel):
+class SwitchAccountRequest(RequestModel):
     """Request to switch active account."""
 
     email: str = Field(..., min_length=1, description="Email of account to switch to")
 
 
-class RemoveAccountRequest(BaseModel):
+class RemoveAccountRequest(RequestModel):
     """Request to remove a signed-in account."""
 
     email: str = Field(..., min_length=1, description="Email of account to remove")
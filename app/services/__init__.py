@@ -1,56 +1,125 @@
-"""Services module exports."""
-
-from .auth import (
-    get_gmail_service,
-    sign_out,
-    check_login_status,
-    get_web_auth_status,
-    is_web_auth_mode,
-    needs_auth_setup,
-    # Multi-account
-    get_accounts,
-    switch_account,
-    remove_account,
-)
+"""Services module exports.
+
+Exports are resolved lazily (PEP 562): importing ``app.services`` does not load
+the Gmail client libraries until a service function is first looked up.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
 
-from .gmail import (
+_GMAIL = "app.services.gmail"
+
+# Exported name -> module that defines it
+_LAZY_EXPORTS = {
+    # Auth
+    "get_gmail_service": "app.services.auth",
+    "sign_out": "app.services.auth",
+    "check_login_status": "app.services.auth",
+    "get_web_auth_status": "app.services.auth",
+    "is_web_auth_mode": "app.services.auth",
+    "needs_auth_setup": "app.services.auth",
+    # Multi-account
+    "get_accounts": "app.services.auth",
+    "switch_account": "app.services.auth",
+    "remove_account": "app.services.auth",
     # Filters
-    build_gmail_query,
+    "build_gmail_query": f"{_GMAIL}.helpers",
     # Scanning
-    scan_emails,
-    get_scan_status,
-    get_scan_results,
+    "scan_emails": f"{_GMAIL}.scan",
+    "get_scan_status": f"{_GMAIL}.scan",
+    "get_scan_results": f"{_GMAIL}.scan",
     # Unsubscribe
-    unsubscribe_single,
+    "unsubscribe_single": f"{_GMAIL}.unsubscribe",
     # Mark as read
-    get_unread_count,
-    mark_emails_as_read,
-    get_mark_read_status,
+    "get_unread_count": f"{_GMAIL}.mark_read",
+    "mark_emails_as_read": f"{_GMAIL}.mark_read",
+    "get_mark_read_status": f"{_GMAIL}.mark_read",
     # Delete
-    scan_senders_for_delete,
-    get_delete_scan_status,
-    get_delete_scan_results,
-    delete_emails_by_sender,
-    delete_emails_bulk,
-    delete_emails_bulk_background,
-    get_delete_bulk_status,
+    "scan_senders_for_delete": f"{_GMAIL}.delete",
+    "get_delete_scan_status": f"{_GMAIL}.delete",
+    "get_delete_scan_results": f"{_GMAIL}.delete",
+    "delete_emails_by_sender": f"{_GMAIL}.delete",
+    "delete_emails_bulk": f"{_GMAIL}.delete",
+    "delete_emails_bulk_background": f"{_GMAIL}.delete",
+    "get_delete_bulk_status": f"{_GMAIL}.delete",
     # Download
-    download_emails_background,
-    get_download_status,
-    get_download_csv,
+    "download_emails_background": f"{_GMAIL}.download",
+    "get_download_status": f"{_GMAIL}.download",
+    "get_download_csv": f"{_GMAIL}.download",
     # Labels
-    get_labels,
-    create_label,
-    delete_label,
-    apply_label_to_senders_background,
-    remove_label_from_senders_background,
-    get_label_operation_status,
+    "get_labels": f"{_GMAIL}.labels",
+    "create_label": f"{_GMAIL}.labels",
+    "delete_label": f"{_GMAIL}.labels",
+    "apply_label_to_senders_background": f"{_GMAIL}.labels",
+    "remove_label_from_senders_background": f"{_GMAIL}.labels",
+    "get_label_operation_status": f"{_GMAIL}.labels",
     # Archive
-    archive_emails_background,
-    get_archive_status,
+    "archive_emails_background": f"{_GMAIL}.archive",
+    "get_archive_status": f"{_GMAIL}.archive",
     # Mark Important
-    mark_important_background,
-    get_important_status,
+    "mark_important_background": f"{_GMAIL}.important",
+    "get_important_status": f"{_GMAIL}.important",
     # Preview
-    preview_emails_from_sender,
-)
+    "preview_emails_from_sender": f"{_GMAIL}.preview",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """Import the module defining `name` on first access and cache the value."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .auth import (
+        check_login_status,
+        get_accounts,
+        get_gmail_service,
+        get_web_auth_status,
+        is_web_auth_mode,
+        needs_auth_setup,
+        remove_account,
+        sign_out,
+        switch_account,
+    )
+    from .gmail import (
+        apply_label_to_senders_background,
+        archive_emails_background,
+        build_gmail_query,
+        create_label,
+        delete_emails_bulk,
+        delete_emails_bulk_background,
+        delete_emails_by_sender,
+        delete_label,
+        download_emails_background,
+        get_archive_status,
+        get_delete_bulk_status,
+        get_delete_scan_results,
+        get_delete_scan_status,
+        get_download_csv,
+        get_download_status,
+        get_important_status,
+        get_label_operation_status,
+        get_labels,
+        get_mark_read_status,
+        get_scan_results,
+        get_scan_status,
+        get_unread_count,
+        mark_emails_as_read,
+        mark_important_background,
+        preview_emails_from_sender,
+        remove_label_from_senders_background,
+        scan_emails,
+        scan_senders_for_delete,
+        unsubscribe_single,
+    )
@@ -5,30 +5,99 @@ Handles OAuth2 authentication with Gmail API.
 Supports multiple signed-in accounts with active account switching.
 """
 
+from __future__ import annotations
+
+import hashlib
+import importlib
 import json
 import logging
 import os
 import platform
 import re
 import shutil
+import tempfile
 import threading
 import time
+from functools import partial
 from http.server import HTTPServer
+from typing import TYPE_CHECKING
 
+import orjson
 from google.auth.exceptions import RefreshError
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 
 from app.core import settings, state
 from app.services.auth_handlers import OAuthCallbackHandler
 
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+
 logger = logging.getLogger(__name__)
 
+# Heavy Google client imports, loaded on first use (see __getattr__ / _lazy)
+_LAZY_IMPORTS = {
+    "Credentials": "google.oauth2.credentials",
+    "Request": "google.auth.transport.requests",
+    "build": "googleapiclient.discovery",
+    "InstalledAppFlow": "google_auth_oauthlib.flow",
+    "OrjsonModel": "app.services.json_model",
+}
+
+
+def __getattr__(name: str):
+    """Import a lazily loaded Google client name on first access and cache it."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def _lazy(name: str):
+    """Resolve a lazily imported name, honouring any value already set on the module."""
+    value = globals().get(name)
+    return value if value is not None else __getattr__(name)
+
 # Track auth in progress
 _auth_in_progress = {"active": False}
 
+# Short-lived cache of get_accounts() (the UI polls it); registry writes clear it
+_ACCOUNTS_CACHE_TTL = 5.0
+_accounts_cache: dict = {"accounts": None, "expires": 0.0}
+_accounts_cache_lock = threading.Lock()
+
+# _sync_state() re-reads the registry at most once per TTL; concurrent callers
+# wait for the in-flight sync instead of hitting the disk themselves
+_SYNC_STATE_TTL = 0.5
+_sync_cache: dict = {"expires": 0.0, "generation": 0}
+_sync_lock = threading.Lock()
+
+_ACCOUNTS_REGISTRY = "accounts.json"
+
+# Characters not allowed in per-account token filenames
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
+# Parsed accounts.json, keyed on (st_mtime_ns, st_size) of the file it came from
+_registry_cache: dict = {"entry": None}
+
+# check_login_status() trusts a recent successful validation for a few seconds,
+# as long as the active account and its token file are unchanged
+_LOGIN_STATUS_TTL = 5.0
+_login_status_cache: dict = {"entry": None}
+
+# (path, file key) of the credentials file last found to hold valid JSON
+_credentials_path_cache: dict = {"entry": None}
+
+# (payload digest, file key) of our last write, to skip rewriting identical content
+_registry_last_write: dict = {"entry": None}
+
+# token_file -> ((st_mtime_ns, st_size), Credentials) for unchanged token files
+_creds_cache: dict[str, tuple[tuple[int, int], Credentials]] = {}
+
+# Built Gmail services, per thread (httplib2 connections are not thread-safe):
+# token_file -> (Credentials the service was built with, service)
+_service_cache = threading.local()
+
 
 # ---------------------------------------------------------------------------
 # Token file helpers for multi-account
@@ -37,7 +106,7 @@ _auth_in_progress = {"active": False}
 
 def _sanitize_email(email: str) -> str:
     """Convert email to a safe filename component."""
-    return re.sub(r"[^A-Za-z0-9._-]", "_", email)
+    return _UNSAFE_FILENAME_CHARS.sub("_", email)
 
 
 def _token_file_for(email: str) -> str:
@@ -46,53 +115,153 @@ def _token_file_for(email: str) -> str:
 
 
 def _is_file_empty(file_path: str) -> bool:
-    """Check if a file exists and is empty."""
-    if not os.path.exists(file_path):
-        return False
+    """Check if a file exists and is empty (a single stat, no read)."""
     try:
-        with open(file_path, "r") as f:
-            return not f.read().strip()
+        return os.stat(file_path).st_size == 0
     except OSError:
         return False
 
 
+def _file_key(file_path: str) -> tuple[int, int]:
+    """Return (st_mtime_ns, st_size) identifying the current version of a file."""
+    st = os.stat(file_path)
+    return st.st_mtime_ns, st.st_size
+
+
 def _load_accounts_registry() -> tuple[list[dict], str | None]:
     """Load accounts and active email from accounts.json.
 
     Returns:
         (accounts_list, active_email)  where accounts_list is [{"email": str, "token_file": str}, ...]
     """
-    registry_path = "accounts.json"
-    if not os.path.exists(registry_path) or _is_file_empty(registry_path):
-        return [], None
+    registry_path = _ACCOUNTS_REGISTRY
     try:
-        with open(registry_path, "r") as f:
-            data = json.load(f)
-        accounts = [
-            a for a in data.get("accounts", [])
-            if a.get("token_file") and os.path.exists(a["token_file"]) and not _is_file_empty(a["token_file"])
-        ]
-        return accounts, data.get("active")
-    except (json.JSONDecodeError, OSError):
+        st = os.stat(registry_path)
+    except OSError:
+        return [], None
+    if st.st_size == 0:
         return [], None
 
+    # Re-parse only when the file changed since the last read
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _registry_cache["entry"]
+    if cached is not None and cached[0] == key:
+        data = cached[1]
+    else:
+        try:
+            with open(registry_path, "rb") as f:
+                data = orjson.loads(f.read())
+        except (orjson.JSONDecodeError, OSError):
+            return [], None
+        _registry_cache["entry"] = (key, data)
+
+    # Token files can disappear independently of the registry, so filter every
+    # call: keep accounts whose token file exists and is non-empty
+    listed = [a for a in data.get("accounts", []) if a.get("token_file")]
+    sizes = _token_file_sizes([a["token_file"] for a in listed])
+    accounts = [dict(a) for a in listed if sizes.get(a["token_file"])]
+    return accounts, data.get("active")
+
+
+def _token_file_sizes(token_files: list[str]) -> dict[str, int]:
+    """Return {token_file: size in bytes} for the given token files that exist.
+
+    Token files normally sit in the working directory, so those are read from
+    one os.scandir() listing (on Windows its entries carry stat data, saving a
+    file open per account); any other path is stat'ed directly.
+    """
+    sizes: dict[str, int] = {}
+    local = {tf for tf in token_files if not os.path.dirname(tf)}
+    if local:
+        try:
+            with os.scandir(".") as entries:
+                for entry in entries:
+                    if entry.name in local:
+                        try:
+                            sizes[entry.name] = entry.stat().st_size
+                        except OSError:
+                            pass
+        except OSError:
+            pass
+    for tf in token_files:
+        if tf not in local:
+            try:
+                sizes[tf] = os.stat(tf).st_size
+            except OSError:
+                pass
+    return sizes
+
 
 def _save_accounts_registry(accounts: list[dict], active_email: str | None) -> None:
-    """Save accounts registry to accounts.json."""
-    with open("accounts.json", "w") as f:
-        json.dump({"accounts": accounts, "active": active_email}, f, indent=2)
+    """Save accounts registry to accounts.json.
+
+    The file is replaced atomically, so readers never see a partial write, and
+    is left alone if it still holds exactly what we last wrote.
+    """
+    payload = orjson.dumps(
+        {"accounts": accounts, "active": active_email},
+        option=orjson.OPT_INDENT_2,
+    )
+    digest = hashlib.blake2b(payload, digest_size=16).digest()
+    try:
+        unchanged = _registry_last_write["entry"] == (digest, _file_key(_ACCOUNTS_REGISTRY))
+    except OSError:
+        unchanged = False
+
+    if not unchanged:
+        fd, tmp_path = tempfile.mkstemp(dir=".", prefix=".accounts-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, _ACCOUNTS_REGISTRY)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        _registry_last_write["entry"] = (digest, _file_key(_ACCOUNTS_REGISTRY))
+        _registry_cache["entry"] = None
+    _invalidate_accounts_cache()
+
+
+def _invalidate_accounts_cache() -> None:
+    """Force the next get_accounts(), _sync_state() and check_login_status() calls
+    to re-read the registry."""
+    with _accounts_cache_lock:
+        _accounts_cache["accounts"] = None
+        _login_status_cache["entry"] = None
+        _sync_cache["generation"] += 1
+        _sync_cache["expires"] = 0.0
 
 
 def _sync_state() -> None:
     """Sync state.accounts / state.active_account from registry, update current_user."""
+    with _sync_lock:
+        if time.monotonic() < _sync_cache["expires"]:
+            return
+        generation = _sync_cache["generation"]
+        _refresh_state_from_registry()
+        # Don't mark a sync fresh if the registry was written while it ran
+        if _sync_cache["generation"] == generation:
+            _sync_cache["expires"] = time.monotonic() + _SYNC_STATE_TTL
+
+
+def _refresh_state_from_registry() -> None:
+    """Load the registry into state.accounts / state.active_account / state.current_user."""
     accounts, active = _load_accounts_registry()
+    _apply_accounts_state(accounts, active)
+
+
+def _apply_accounts_state(accounts: list[dict], active: str | None) -> None:
+    """Set state.accounts / state.active_account / state.current_user from registry contents."""
     state.accounts = accounts
-    emails = [a["email"] for a in accounts]
+    state.accounts_by_email = {a["email"]: a for a in accounts}
 
-    if active and active in emails:
+    if active and active in state.accounts_by_email:
         state.active_account = active
-    elif emails:
-        state.active_account = emails[0]
+    elif accounts:
+        state.active_account = accounts[0]["email"]
     else:
         state.active_account = None
 
@@ -108,33 +277,49 @@ def _sync_state() -> None:
 
 
 def get_accounts() -> list[dict]:
-    """Get list of signed-in accounts with active flag."""
+    """Get list of signed-in accounts with active flag.
+
+    Results are cached for a few seconds; saving the registry clears the cache.
+    """
+    with _accounts_cache_lock:
+        cached = _accounts_cache["accounts"]
+        if cached is not None and time.monotonic() < _accounts_cache["expires"]:
+            return [dict(a) for a in cached]
+        generation = _sync_cache["generation"]
+
     _sync_state()
-    return [
+    accounts = [
         {"email": a["email"], "active": a["email"] == state.active_account}
         for a in state.accounts
     ]
+    with _accounts_cache_lock:
+        # Don't cache a list built before a registry write cleared the cache
+        if _sync_cache["generation"] == generation:
+            _accounts_cache["accounts"] = accounts
+            _accounts_cache["expires"] = time.monotonic() + _ACCOUNTS_CACHE_TTL
+    return [dict(a) for a in accounts]
 
 
 def switch_account(email: str) -> dict:
     """Switch active account to the given email."""
     _sync_state()
-    if not any(a["email"] == email for a in state.accounts):
+    if email not in state.accounts_by_email:
         return {"success": False, "error": f"Account {email} not found"}
     _save_accounts_registry(state.accounts, email)
-    _sync_state()
+    _apply_accounts_state(state.accounts, email)
     return {"success": True, "active": email}
 
 
 def remove_account(email: str) -> dict:
     """Remove a signed-in account (deletes its token file)."""
     _sync_state()
-    acct = next((a for a in state.accounts if a["email"] == email), None)
+    acct = state.accounts_by_email.get(email)
     if not acct:
         return {"success": False, "error": f"Account {email} not found"}
 
     # Delete token file
     tf = acct["token_file"]
+    _creds_cache.pop(tf, None)
     if os.path.exists(tf):
         try:
             os.remove(tf)
@@ -144,7 +329,7 @@ def remove_account(email: str) -> dict:
     remaining = [a for a in state.accounts if a["email"] != email]
     new_active = remaining[0]["email"] if remaining else None
     _save_accounts_registry(remaining, new_active)
-    _sync_state()
+    _apply_accounts_state(remaining, new_active)
 
     return {"success": True, "active": state.active_account}
 
@@ -160,9 +345,26 @@ def is_web_auth_mode() -> bool:
 
 
 def needs_auth_setup() -> bool:
-    """Check if at least one account is signed in."""
+    """Check if at least one account is signed in.
+
+    With no registered accounts, a usable settings.token_file (the one
+    get_gmail_service falls back to) still counts as signed in.
+    """
     _sync_state()
-    return len(state.accounts) == 0
+    if state.accounts:
+        return False
+    return not _has_usable_token(settings.token_file)
+
+
+def _has_usable_token(token_file: str) -> bool:
+    """Return True if token_file holds credentials that are valid or refreshable."""
+    if not os.path.exists(token_file):
+        return False
+    try:
+        creds = _load_credentials(token_file)
+    except (ValueError, OSError):
+        return False
+    return bool(creds.valid or creds.refresh_token)
 
 
 def get_web_auth_status() -> dict:
@@ -175,18 +377,66 @@ def get_web_auth_status() -> dict:
     }
 
 
+def _load_credentials(token_file: str) -> Credentials:
+    """Load credentials from token_file, reusing the parsed object while the file is unchanged.
+
+    Raises:
+        ValueError, OSError: As Credentials.from_authorized_user_file
+    """
+    try:
+        key = _file_key(token_file)
+    except OSError:
+        # Can't tell which version this is; load without caching
+        return _lazy("Credentials").from_authorized_user_file(
+            token_file, settings.scopes
+        )
+    cached = _creds_cache.get(token_file)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    creds = _lazy("Credentials").from_authorized_user_file(
+        token_file, settings.scopes
+    )
+    _creds_cache[token_file] = (key, creds)
+    return creds
+
+
+def _build_service(token_file: str, creds: Credentials):
+    """Return a Gmail service for creds, reusing this thread's last one for token_file."""
+    services = getattr(_service_cache, "services", None)
+    if services is None:
+        services = _service_cache.services = {}
+    cached = services.get(token_file)
+    if cached is not None and cached[0] is creds:
+        return cached[1]
+    service = _lazy("build")(
+        "gmail",
+        "v1",
+        credentials=creds,
+        cache_discovery=False,
+        model=_lazy("OrjsonModel")(),
+    )
+    services[token_file] = (creds, service)
+    return service
+
+
 def _try_refresh_creds(creds: Credentials, token_file: str) -> Credentials | None:
     """Attempt to refresh expired credentials and save to token_file."""
     try:
-        creds.refresh(Request())
+        creds.refresh(_lazy("Request")())
         try:
             with open(token_file, "w") as token:
                 token.write(creds.to_json())
+                token.flush()
+                st = os.fstat(token.fileno())
+            # Keep serving the refreshed object for the file we just wrote
+            _creds_cache[token_file] = ((st.st_mtime_ns, st.st_size), creds)
         except OSError:
+            _creds_cache.pop(token_file, None)
             logger.exception("Failed to save refreshed token")
         return creds
     except RefreshError as e:
         logger.warning(f"Token refresh failed: {e}")
+        _creds_cache.pop(token_file, None)
         try:
             os.remove(token_file)
         except OSError:
@@ -194,28 +444,50 @@ def _try_refresh_creds(creds: Credentials, token_file: str) -> Credentials | Non
         return None
 
 
+def _remember_credentials_path(path: str) -> None:
+    """Record that path currently holds valid credentials JSON."""
+    try:
+        _credentials_path_cache["entry"] = (path, _file_key(path))
+    except OSError:
+        _credentials_path_cache["entry"] = None
+
+
 def _get_credentials_path() -> str | None:
-    """Get valid credentials file path (from file or env var)."""
-    if os.path.exists(settings.credentials_file):
-        if _is_file_empty(settings.credentials_file):
+    """Get valid credentials file path (from file or env var).
+
+    A credentials file that was validated before and has not changed since is
+    not read again.
+    """
+    credentials_file = settings.credentials_file
+    if os.path.exists(credentials_file):
+        entry = _credentials_path_cache["entry"]
+        if entry is not None and entry[0] == credentials_file:
+            try:
+                if entry[1] == _file_key(credentials_file):
+                    return credentials_file
+            except OSError:
+                pass
+        if _is_file_empty(credentials_file):
             logger.error("Credentials file is empty.")
             return None
         try:
-            with open(settings.credentials_file, "r") as f:
-                json.loads(f.read().strip())
-            return settings.credentials_file
-        except (FileNotFoundError, json.JSONDecodeError, OSError) as e:
+            with open(credentials_file, "rb") as f:
+                orjson.loads(f.read())
+            _remember_credentials_path(credentials_file)
+            return credentials_file
+        except (FileNotFoundError, orjson.JSONDecodeError, OSError) as e:
             logger.error(f"Credentials file issue: {e}")
             return None
 
     env_creds = os.environ.get("GOOGLE_CREDENTIALS")
     if env_creds:
         try:
-            json.loads(env_creds)
-            with open(settings.credentials_file, "w") as f:
+            orjson.loads(env_creds)
+            with open(credentials_file, "w") as f:
                 f.write(env_creds)
-            return settings.credentials_file
-        except (json.JSONDecodeError, TypeError, OSError) as e:
+            _remember_credentials_path(credentials_file)
+            return credentials_file
+        except (orjson.JSONDecodeError, TypeError, OSError) as e:
             logger.error(f"GOOGLE_CREDENTIALS env var issue: {e}")
             return None
 
@@ -227,6 +499,27 @@ def _get_credentials_path() -> str | None:
 # ---------------------------------------------------------------------------
 
 
+def _active_token_file() -> str:
+    """Return the active account's token file, or settings.token_file if there is none."""
+    if state.active_account:
+        acct = state.accounts_by_email.get(state.active_account)
+        if acct:
+            return acct["token_file"]
+    return settings.token_file
+
+
+def get_gmail_credentials() -> Credentials | None:
+    """Return the active account's cached credentials, or None if they can't be loaded.
+
+    Call after get_gmail_service, which refreshes expired credentials.
+    """
+    _sync_state()
+    try:
+        return _load_credentials(_active_token_file())
+    except (ValueError, OSError):
+        return None
+
+
 def get_gmail_service():
     """Get authenticated Gmail API service for the active account.
 
@@ -235,18 +528,12 @@ def get_gmail_service():
     """
     _sync_state()
 
-    # Find active account's token file
     creds = None
-    token_file = settings.token_file  # fallback
-
-    if state.active_account:
-        acct = next((a for a in state.accounts if a["email"] == state.active_account), None)
-        if acct:
-            token_file = acct["token_file"]
+    token_file = _active_token_file()
 
     if os.path.exists(token_file) and not _is_file_empty(token_file):
         try:
-            creds = Credentials.from_authorized_user_file(token_file, settings.scopes)
+            creds = _load_credentials(token_file)
         except (ValueError, OSError) as e:
             logger.warning(f"Failed to load credentials from {token_file}: {e}")
             try:
@@ -275,7 +562,9 @@ def get_gmail_service():
             def run_oauth() -> None:
                 try:
                     try:
-                        flow = InstalledAppFlow.from_client_secrets_file(creds_path, settings.scopes)
+                        flow = _lazy("InstalledAppFlow").from_client_secrets_file(
+                            creds_path, settings.scopes
+                        )
                     except (ValueError, json.JSONDecodeError, OSError, FileNotFoundError) as e:
                         logger.error(f"Failed to load credentials: {e}")
                         print(f"ERROR: credentials.json issue: {e}")
@@ -316,15 +605,13 @@ def get_gmail_service():
                             state.pending_auth_url["url"] = authorization_url
 
                         callback_event = threading.Event()
-                        callback_lock = threading.Lock()
-                        callback_data: dict = {"code": None, "error": None}
-
-                        def handler_factory(*args, **kwargs):
-                            return OAuthCallbackHandler(
-                                callback_event, callback_lock, callback_data, *args, **kwargs
-                            )
+                        callback_result: list[tuple[str | None, str | None]] = []
+                        handler_factory = partial(
+                            OAuthCallbackHandler, callback_event, callback_result
+                        )
 
                         server = None
+                        serve_thread = None
                         try:
                             try:
                                 server = HTTPServer((bind_address, settings.oauth_port), handler_factory)
@@ -341,21 +628,15 @@ def get_gmail_service():
                                 except Exception as e:
                                     logger.warning(f"Failed to open browser: {e}")
 
-                            server.timeout = 1.0
-                            start_time = time.time()
-                            while not callback_event.is_set():
-                                if time.time() - start_time > 300:
-                                    raise TimeoutError("OAuth authorization timed out after 5 minutes.")
-                                try:
-                                    server.handle_request()
-                                except Exception as e:
-                                    if "address already in use" in str(e).lower():
-                                        raise
-                                callback_event.wait(timeout=0.1)
+                            # Serve callbacks on their own thread and block until one arrives
+                            serve_thread = threading.Thread(
+                                target=server.serve_forever, name="oauth-callback", daemon=True
+                            )
+                            serve_thread.start()
+                            if not callback_event.wait(timeout=300):
+                                raise TimeoutError("OAuth authorization timed out after 5 minutes.")
 
-                            with callback_lock:
-                                auth_code = callback_data["code"]
-                                error_message = callback_data["error"]
+                            auth_code, error_message = callback_result[0]
 
                             if error_message:
                                 raise ValueError(f"OAuth error: {error_message}")
@@ -365,6 +646,8 @@ def get_gmail_service():
                             flow.fetch_token(code=auth_code)
                             new_creds = flow.credentials
                         finally:
+                            if serve_thread is not None:
+                                server.shutdown()
                             if server is not None:
                                 try:
                                     server.server_close()
@@ -384,7 +667,7 @@ def get_gmail_service():
 
                     # Get email from profile
                     try:
-                        tmp_service = build("gmail", "v1", credentials=new_creds)
+                        tmp_service = _lazy("build")("gmail", "v1", credentials=new_creds)
                         profile = tmp_service.users().getProfile(userId="me").execute()
                         new_email = profile.get("emailAddress", "unknown")
                     except Exception as e:
@@ -410,7 +693,7 @@ def get_gmail_service():
                             if a["email"] == new_email:
                                 a["token_file"] = new_token_file
                     _save_accounts_registry(accounts, new_email)
-                    _sync_state()
+                    _apply_accounts_state(accounts, new_email)
 
                 except Exception as e:
                     logger.error(f"OAuth error: {e}", exc_info=True)
@@ -427,7 +710,7 @@ def get_gmail_service():
 
     # Build Gmail service
     try:
-        service = build("gmail", "v1", credentials=creds)
+        service = _build_service(token_file, creds)
     except Exception as e:
         logger.error(f"Failed to build Gmail service: {e}")
         return (None, f"Failed to connect to Gmail API: {str(e)}.")
@@ -464,8 +747,11 @@ def sign_out() -> dict:
         return result
 
     # Legacy: remove old token.json
-    if os.path.exists(settings.token_file):
-        os.remove(settings.token_file)
+    legacy_token_file = settings.token_file
+    _creds_cache.pop(legacy_token_file, None)
+    if os.path.exists(legacy_token_file):
+        os.remove(legacy_token_file)
+    _invalidate_accounts_cache()
     state.current_user = {"email": None, "logged_in": False}
     state.reset_scan()
     state.reset_delete_scan()
@@ -473,21 +759,49 @@ def sign_out() -> dict:
     return {"success": True, "message": "Signed out successfully", "results_cleared": True}
 
 
+def _login_status_key(email: str, token_file: str) -> tuple | None:
+    """Identify an account's current token file version, or None if it can't be stat'ed."""
+    try:
+        return email, token_file, _file_key(token_file)
+    except OSError:
+        return None
+
+
+def _login_status_fresh(email: str, token_file: str) -> bool:
+    """Whether email/token_file was validated recently and the file is unchanged since."""
+    entry = _login_status_cache["entry"]
+    if entry is None or time.monotonic() >= entry[1]:
+        return False
+    key = _login_status_key(email, token_file)
+    return key is not None and key == entry[0]
+
+
+def _remember_login_status(email: str, token_file: str) -> None:
+    """Record a successful validation of email/token_file."""
+    key = _login_status_key(email, token_file)
+    if key is not None:
+        _login_status_cache["entry"] = (key, time.monotonic() + _LOGIN_STATUS_TTL)
+
+
 def check_login_status() -> dict:
     """Check if user is logged in and get their email."""
     _sync_state()
 
     if state.active_account:
-        acct = next((a for a in state.accounts if a["email"] == state.active_account), None)
+        acct = state.accounts_by_email.get(state.active_account)
         if acct:
             tf = acct["token_file"]
+            if _login_status_fresh(state.active_account, tf):
+                return {"email": state.active_account, "logged_in": True}
             if os.path.exists(tf) and not _is_file_empty(tf):
                 try:
-                    creds = Credentials.from_authorized_user_file(tf, settings.scopes)
+                    creds = _load_credentials(tf)
                     if creds and creds.valid:
+                        _remember_login_status(state.active_account, tf)
                         return {"email": state.active_account, "logged_in": True}
                     elif creds and creds.expired and creds.refresh_token:
                         if _try_refresh_creds(creds, tf):
+                            _remember_login_status(state.active_account, tf)
                             return {"email": state.active_account, "logged_in": True}
                 except (ValueError, OSError) as e:
                     logger.warning(f"Credentials issue for {state.active_account}: {e}")
@@ -500,26 +814,28 @@ def check_login_status() -> dict:
         remaining = [a for a in state.accounts if a["email"] != state.active_account]
         new_active = remaining[0]["email"] if remaining else None
         _save_accounts_registry(remaining, new_active)
-        _sync_state()
+        _apply_accounts_state(remaining, new_active)
         if state.active_account:
             return check_login_status()
 
     # Legacy migration: check old token.json
-    if os.path.exists(settings.token_file) and not _is_file_empty(settings.token_file):
+    legacy_token_file = settings.token_file
+    if os.path.exists(legacy_token_file) and not _is_file_empty(legacy_token_file):
         try:
-            creds = Credentials.from_authorized_user_file(settings.token_file, settings.scopes)
+            creds = _load_credentials(legacy_token_file)
             if creds and (creds.valid or (creds.expired and creds.refresh_token)):
                 if creds.expired:
-                    creds = _try_refresh_creds(creds, settings.token_file)
+                    creds = _try_refresh_creds(creds, legacy_token_file)
                 if creds and creds.valid:
-                    svc = build("gmail", "v1", credentials=creds)
+                    svc = _lazy("build")("gmail", "v1", credentials=creds)
                     profile = svc.users().getProfile(userId="me").execute()
                     email = profile.get("emailAddress", "Unknown")
                     # Migrate to multi-account
                     new_tf = _token_file_for(email)
-                    os.rename(settings.token_file, new_tf)
-                    _save_accounts_registry([{"email": email, "token_file": new_tf}], email)
-                    _sync_state()
+                    os.rename(legacy_token_file, new_tf)
+                    migrated = [{"email": email, "token_file": new_tf}]
+                    _save_accounts_registry(migrated, email)
+                    _apply_accounts_state(migrated, email)
                     return {"email": email, "logged_in": True}
         except Exception as e:
             logger.error(f"Legacy token migration error: {e}")
@@ -4,9 +4,11 @@ OAuth Callback Handlers
 HTTP request handlers for OAuth2 callback processing.
 """
 
+from __future__ import annotations
+
 import logging
 from http.server import BaseHTTPRequestHandler
-from threading import Event, Lock
+from threading import Event
 from urllib.parse import parse_qs, urlparse
 
 from app.core import state
@@ -18,41 +20,44 @@ class OAuthCallbackHandler(BaseHTTPRequestHandler):
     """HTTP request handler for OAuth2 callback processing.
 
     This handler processes OAuth2 callbacks, validates CSRF state tokens,
-    and communicates results back to the main OAuth flow via thread-safe
-    primitives.
+    and communicates results back to the main OAuth flow. The callback server
+    handles one request at a time, so the first outcome recorded wins.
 
     Args:
         callback_event: Threading event to signal callback completion
-        callback_lock: Threading lock to protect shared callback data
-        callback_data: Dictionary to store callback results (code/error)
+        callback_result: List the (code, error) outcome is appended to
     """
 
     def __init__(
         self,
         callback_event: Event,
-        callback_lock: Lock,
-        callback_data: dict,
+        callback_result: list,
         *args,
         **kwargs,
     ):
-        """Initialize the handler with thread-safe callback primitives."""
+        """Initialize the handler with the flow's event and result list."""
         self.callback_event = callback_event
-        self.callback_lock = callback_lock
-        self.callback_data = callback_data
+        self.callback_result = callback_result
         super().__init__(*args, **kwargs)
 
+    def _record(self, code: str | None, error: str | None) -> None:
+        """Store the callback outcome, clear the OAuth state and wake the flow."""
+        with state.oauth_state_lock:
+            state.oauth_state["state"] = None
+        self.callback_result.append((code, error))
+        self.callback_event.set()
+
     def do_GET(self):
         """Handle GET request for OAuth callback."""
         # Prevent processing multiple callbacks
-        with self.callback_lock:
-            if self.callback_event.is_set():
-                self.send_response(200)
-                self.send_header("Content-type", "text/html")
-                self.end_headers()
-                self.wfile.write(
-                    b"<html><body><h1>Callback already processed</h1><p>You can close this window.</p></body></html>"
-                )
-                return
+        if self.callback_event.is_set():
+            self.send_response(200)
+            self.send_header("Content-type", "text/html")
+            self.end_headers()
+            self.wfile.write(
+                b"<html><body><h1>Callback already processed</h1><p>You can close this window.</p></body></html>"
+            )
+            return
 
         parsed_url = urlparse(self.path)
         query_params = parse_qs(parsed_url.query)
@@ -71,14 +76,11 @@ class OAuthCallbackHandler(BaseHTTPRequestHandler):
             logger.error(
                 "OAuth callback received but no stored state found - possible CSRF attack or state expired"
             )
-            with self.callback_lock:
-                self.callback_data["error"] = (
-                    "OAuth callback received but no stored state found - possible CSRF attack or state expired"
-                )
-                # Clear state on security error
-                with state.oauth_state_lock:
-                    state.oauth_state["state"] = None
-                self.callback_event.set()
+            # Clear state on security error
+            self._record(
+                None,
+                "OAuth callback received but no stored state found - possible CSRF attack or state expired",
+            )
             self.send_response(403)
             self.send_header("Content-type", "text/html")
             self.end_headers()
@@ -91,14 +93,11 @@ class OAuthCallbackHandler(BaseHTTPRequestHandler):
             logger.error(
                 "OAuth callback missing state parameter - possible CSRF attack or malformed request"
             )
-            with self.callback_lock:
-                self.callback_data["error"] = (
-                    "OAuth callback missing state parameter - possible CSRF attack or malformed request"
-                )
-                # Clear state on security error
-                with state.oauth_state_lock:
-                    state.oauth_state["state"] = None
-                self.callback_event.set()
+            # Clear state on security error
+            self._record(
+                None,
+                "OAuth callback missing state parameter - possible CSRF attack or malformed request",
+            )
             self.send_response(403)
             self.send_header("Content-type", "text/html")
             self.end_headers()
@@ -114,14 +113,8 @@ class OAuthCallbackHandler(BaseHTTPRequestHandler):
                 stored_state[:20] if len(stored_state) > 20 else stored_state,
                 incoming_state[:20] if len(incoming_state) > 20 else incoming_state,
             )
-            with self.callback_lock:
-                self.callback_data["error"] = (
-                    "OAuth state mismatch - possible CSRF attack"
-                )
-                # Clear state on security error to prevent reuse
-                with state.oauth_state_lock:
-                    state.oauth_state["state"] = None
-                self.callback_event.set()
+            # Clear state on security error to prevent reuse
+            self._record(None, "OAuth state mismatch - possible CSRF attack")
             self.send_response(403)
             self.send_header("Content-type", "text/html")
             self.end_headers()
@@ -133,12 +126,8 @@ class OAuthCallbackHandler(BaseHTTPRequestHandler):
         if "code" in query_params:
             code_list = query_params["code"]
             if code_list and len(code_list) > 0:
-                with self.callback_lock:
-                    self.callback_data["code"] = code_list[0]
-                    # Clear OAuth state after successful verification
-                    with state.oauth_state_lock:
-                        state.oauth_state["state"] = None
-                    self.callback_event.set()
+                # Clear OAuth state after successful verification
+                self._record(code_list[0], None)
                 self.send_response(200)
                 self.send_header("Content-type", "text/html")
                 self.end_headers()
@@ -147,12 +136,7 @@ class OAuthCallbackHandler(BaseHTTPRequestHandler):
                 )
             else:
                 # Empty code parameter - invalid request
-                with self.callback_lock:
-                    self.callback_data["error"] = "Empty authorization code"
-                    self.callback_data["code"] = None
-                    with state.oauth_state_lock:
-                        state.oauth_state["state"] = None
-                    self.callback_event.set()
+                self._record(None, "Empty authorization code")
                 logger.warning("OAuth callback received empty code parameter")
                 self.send_response(400)
                 self.send_header("Content-type", "text/html")
@@ -166,14 +150,11 @@ class OAuthCallbackHandler(BaseHTTPRequestHandler):
                 error_message = error_list[0]
                 error_description = query_params.get("error_description", [""])
                 error_description = error_description[0] if error_description else ""
-                with self.callback_lock:
-                    self.callback_data["error"] = error_message + (
-                        f" - {error_description}" if error_description else ""
-                    )
-                    # Clear OAuth state on error
-                    with state.oauth_state_lock:
-                        state.oauth_state["state"] = None
-                    self.callback_event.set()
+                # Clear OAuth state on error
+                self._record(
+                    None,
+                    error_message + (f" - {error_description}" if error_description else ""),
+                )
                 logger.error(
                     f"OAuth callback error: {error_message}"
                     + (f" - {error_description}" if error_description else "")
@@ -186,12 +167,7 @@ class OAuthCallbackHandler(BaseHTTPRequestHandler):
                 )
             else:
                 # Empty error parameter - invalid request
-                with self.callback_lock:
-                    self.callback_data["error"] = "Empty error parameter received"
-                    self.callback_data["code"] = None
-                    with state.oauth_state_lock:
-                        state.oauth_state["state"] = None
-                    self.callback_event.set()
+                self._record(None, "Empty error parameter received")
                 logger.warning("OAuth callback received empty error parameter")
                 self.send_response(400)
                 self.send_header("Content-type", "text/html")
@@ -13,116 +13,197 @@ This module is split into multiple files for better organization:
 - labels.py: Label management operations
 - archive.py: Archive operations
 - important.py: Mark important operations
+
+Exports are resolved lazily (PEP 562): a submodule is only imported when one of
+its names is first looked up here.
 """
 
-# Import all functions for backward compatibility
-from app.services.auth import get_gmail_service
-from app.services.gmail.helpers import (
-    build_gmail_query,
-    validate_unsafe_url,
-    get_unsubscribe_from_headers,
-    get_sender_info,
-    get_subject,
-)
-from app.services.gmail.scan import (
-    scan_emails,
-    get_scan_status,
-    get_scan_results,
-)
-from app.services.gmail.unsubscribe import (
-    unsubscribe_single,
-)
-from app.services.gmail.mark_read import (
-    get_unread_count,
-    mark_emails_as_read,
-    get_mark_read_status,
-)
-from app.services.gmail.delete import (
-    scan_senders_for_delete,
-    get_delete_scan_status,
-    get_delete_scan_results,
-    delete_emails_by_sender,
-    delete_emails_bulk,
-    delete_emails_bulk_background,
-    get_delete_bulk_status,
-)
-from app.services.gmail.download import (
-    download_emails_background,
-    get_download_status,
-    get_download_csv,
-)
-from app.services.gmail.labels import (
-    get_labels,
-    create_label,
-    delete_label,
-    apply_label_to_senders_background,
-    remove_label_from_senders_background,
-    get_label_operation_status,
-)
-from app.services.gmail.archive import (
-    archive_emails_background,
-    get_archive_status,
-)
-from app.services.gmail.important import (
-    mark_important_background,
-    get_important_status,
-)
-from app.services.gmail.preview import (
-    preview_emails_from_sender,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+_PKG = "app.services.gmail"
+
+# Exported name -> module that defines it
+_LAZY_EXPORTS = {
+    # Auth (for backward compatibility)
+    "get_gmail_service": "app.services.auth",
+    # Helpers
+    "batch_list_message_ids": f"{_PKG}.helpers",
+    "batch_modify_messages": f"{_PKG}.helpers",
+    "modify_messages": f"{_PKG}.helpers",
+    "build_gmail_query": f"{_PKG}.helpers",
+    "validate_unsafe_url": f"{_PKG}.helpers",
+    "get_unsubscribe_from_headers": f"{_PKG}.helpers",
+    "get_sender_info": f"{_PKG}.helpers",
+    "get_subject": f"{_PKG}.helpers",
+    # Scanning
+    "scan_emails": f"{_PKG}.scan",
+    "get_scan_status": f"{_PKG}.scan",
+    "get_scan_results": f"{_PKG}.scan",
+    # Unsubscribe
+    "unsubscribe_single": f"{_PKG}.unsubscribe",
+    # Mark as read
+    "get_unread_count": f"{_PKG}.mark_read",
+    "mark_emails_as_read": f"{_PKG}.mark_read",
+    "get_mark_read_status": f"{_PKG}.mark_read",
+    # Delete
+    "scan_senders_for_delete": f"{_PKG}.delete",
+    "get_delete_scan_status": f"{_PKG}.delete",
+    "get_delete_scan_results": f"{_PKG}.delete",
+    "delete_emails_by_sender": f"{_PKG}.delete",
+    "delete_emails_bulk": f"{_PKG}.delete",
+    "delete_emails_bulk_background": f"{_PKG}.delete",
+    "get_delete_bulk_status": f"{_PKG}.delete",
+    # Download
+    "download_emails_background": f"{_PKG}.download",
+    "get_download_status": f"{_PKG}.download",
+    "get_download_csv": f"{_PKG}.download",
+    # Labels
+    "get_labels": f"{_PKG}.labels",
+    "create_label": f"{_PKG}.labels",
+    "delete_label": f"{_PKG}.labels",
+    "apply_label_to_senders_background": f"{_PKG}.labels",
+    "remove_label_from_senders_background": f"{_PKG}.labels",
+    "get_label_operation_status": f"{_PKG}.labels",
+    # Archive
+    "archive_emails_background": f"{_PKG}.archive",
+    "get_archive_status": f"{_PKG}.archive",
+    # Important
+    "mark_important_background": f"{_PKG}.important",
+    "get_important_status": f"{_PKG}.important",
+    # Preview
+    "preview_emails_from_sender": f"{_PKG}.preview",
+}
 
-# Export private helper functions with underscore-prefixed aliases for backward compatibility.
+# Underscore-prefixed aliases of helper functions, kept for backward compatibility.
 # These are used by tests that import the original function names from this module.
-_get_unsubscribe_from_headers = get_unsubscribe_from_headers
-_get_sender_info = get_sender_info
-_get_subject = get_subject
+_ALIASES = {
+    "_get_unsubscribe_from_headers": "get_unsubscribe_from_headers",
+    "_get_sender_info": "get_sender_info",
+    "_get_subject": "get_subject",
+}
 
 # Export all public functions
 __all__ = [
-    # Archive
+    "_get_sender_info",
+    "_get_subject",
+    "_get_unsubscribe_from_headers",
+    "apply_label_to_senders_background",
     "archive_emails_background",
-    "get_archive_status",
-    # Auth (for backward compatibility)
-    "get_gmail_service",
-    # Delete
+    "batch_list_message_ids",
+    "batch_modify_messages",
+    "build_gmail_query",
+    "create_label",
     "delete_emails_bulk",
     "delete_emails_bulk_background",
     "delete_emails_by_sender",
+    "delete_label",
+    "download_emails_background",
+    "get_archive_status",
     "get_delete_bulk_status",
     "get_delete_scan_results",
     "get_delete_scan_status",
-    "scan_senders_for_delete",
-    # Download
-    "download_emails_background",
     "get_download_csv",
     "get_download_status",
-    # Helpers
-    "build_gmail_query",
-    "validate_unsafe_url",
-    # Important
+    "get_gmail_service",
     "get_important_status",
-    "mark_important_background",
-    # Labels
-    "apply_label_to_senders_background",
-    "create_label",
-    "delete_label",
     "get_label_operation_status",
     "get_labels",
-    "remove_label_from_senders_background",
-    # Mark as read
     "get_mark_read_status",
+    "get_scan_results",
+    "get_scan_status",
     "get_unread_count",
     "mark_emails_as_read",
-    # Preview
+    "mark_important_background",
+    "modify_messages",
     "preview_emails_from_sender",
-    # Private helpers (for testing)
-    "_get_sender_info",
-    "_get_subject",
-    "_get_unsubscribe_from_headers",
-    # Scanning
-    "get_scan_results",
-    "get_scan_status",
+    "remove_label_from_senders_background",
     "scan_emails",
-    # Unsubscribe
+    "scan_senders_for_delete",
     "unsubscribe_single",
+    "validate_unsafe_url",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the module defining `name` on first access and cache the value."""
+    target = _ALIASES.get(name, name)
+    module_name = _LAZY_EXPORTS.get(target)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), target)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from app.services.auth import get_gmail_service
+    from app.services.gmail.archive import (
+        archive_emails_background,
+        get_archive_status,
+    )
+    from app.services.gmail.delete import (
+        delete_emails_bulk,
+        delete_emails_bulk_background,
+        delete_emails_by_sender,
+        get_delete_bulk_status,
+        get_delete_scan_results,
+        get_delete_scan_status,
+        scan_senders_for_delete,
+    )
+    from app.services.gmail.download import (
+        download_emails_background,
+        get_download_csv,
+        get_download_status,
+    )
+    from app.services.gmail.helpers import (
+        batch_list_message_ids,
+        batch_modify_messages,
+        build_gmail_query,
+        get_sender_info,
+        get_subject,
+        get_unsubscribe_from_headers,
+        modify_messages,
+        validate_unsafe_url,
+    )
+    from app.services.gmail.helpers import (
+        get_sender_info as _get_sender_info,
+    )
+    from app.services.gmail.helpers import (
+        get_subject as _get_subject,
+    )
+    from app.services.gmail.helpers import (
+        get_unsubscribe_from_headers as _get_unsubscribe_from_headers,
+    )
+    from app.services.gmail.important import (
+        get_important_status,
+        mark_important_background,
+    )
+    from app.services.gmail.labels import (
+        apply_label_to_senders_background,
+        create_label,
+        delete_label,
+        get_label_operation_status,
+        get_labels,
+        remove_label_from_senders_background,
+    )
+    from app.services.gmail.mark_read import (
+        get_mark_read_status,
+        get_unread_count,
+        mark_emails_as_read,
+    )
+    from app.services.gmail.preview import (
+        preview_emails_from_sender,
+    )
+    from app.services.gmail.scan import (
+        get_scan_results,
+        get_scan_status,
+        scan_emails,
+    )
+    from app.services.gmail.unsubscribe import (
+        unsubscribe_single,
+    )
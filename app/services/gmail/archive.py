@@ -4,10 +4,13 @@ Gmail Archive Operations
 Functions for archiving emails (removing from inbox).
 """
 
-import time
-
 from app.core import state
 from app.services.auth import get_gmail_service
+from app.services.gmail.helpers import (
+    batch_list_message_ids,
+    batch_modify_messages,
+    listing_progress,
+)
 
 
 def archive_emails_background(senders: list[str]):
@@ -30,54 +33,52 @@ def archive_emails_background(senders: list[str]):
             state.archive_status["done"] = True
             return
 
+        # Find inbox emails from every sender (list calls share batch requests)
+        state.archive_status["message"] = "Finding emails to archive..."
+        queries = [f"from:{sender} in:inbox" for sender in senders]
+        listed = batch_list_message_ids(
+            service,
+            queries,
+            on_progress=listing_progress(state.archive_status, len(senders)),
+        )
+        message_ids = []
+        errors = []
+        for sender, query in zip(senders, queries):
+            if isinstance(listed[query], Exception):
+                # Keep going: one sender failing should not stop the others
+                errors.append(f"{sender}: {listed[query]!s}")
+            else:
+                message_ids.extend(listed[query])
+        # Overlapping senders (address and its domain) can match the same email
+        message_ids = list(dict.fromkeys(message_ids))
+
+        state.archive_status["current_sender"] = len(senders)
+        state.archive_status["progress"] = 40
+
+        # Archive all senders' emails together (remove INBOX label)
         total_archived = 0
-
-        for i, sender in enumerate(senders):
-            state.archive_status["current_sender"] = i + 1
-            state.archive_status["message"] = f"Archiving emails from {sender}..."
-            state.archive_status["progress"] = int((i / len(senders)) * 100)
-
-            # Find all emails from this sender in INBOX
-            query = f"from:{sender} in:inbox"
-            message_ids = []
-            page_token = None
-
-            while True:
-                result = (
-                    service.users()
-                    .messages()
-                    .list(userId="me", q=query, maxResults=500, pageToken=page_token)
-                    .execute()
-                )
-
-                messages = result.get("messages", [])
-                message_ids.extend([m["id"] for m in messages])
-
-                page_token = result.get("nextPageToken")
-                if not page_token:
-                    break
-
-            if not message_ids:
-                continue
-
-            # Archive in batches (remove INBOX label)
-            for j in range(0, len(message_ids), 100):
-                batch_ids = message_ids[j : j + 100]
-                service.users().messages().batchModify(
-                    userId="me", body={"ids": batch_ids, "removeLabelIds": ["INBOX"]}
-                ).execute()
-                total_archived += len(batch_ids)
-
-                # Throttle every 500 emails (check at 100, 600, 1100, etc.)
-                if (j + 100) % 500 == 0:
-                    time.sleep(0.5)
+        for total_archived in batch_modify_messages(
+            service, message_ids, remove_label_ids=["INBOX"]
+        ):
+            state.archive_status["progress"] = 40 + int(
+                (total_archived / len(message_ids)) * 60
+            )
+            state.archive_status["message"] = (
+                f"Archived {total_archived}/{len(message_ids)} emails..."
+            )
 
         state.archive_status["progress"] = 100
         state.archive_status["done"] = True
         state.archive_status["archived_count"] = total_archived
-        state.archive_status["message"] = (
-            f"Archived {total_archived} emails from {len(senders)} senders"
-        )
+        if errors:
+            state.archive_status["error"] = f"Some errors: {'; '.join(errors[:3])}"
+            state.archive_status["message"] = (
+                f"Archived {total_archived} emails with some errors"
+            )
+        else:
+            state.archive_status["message"] = (
+                f"Archived {total_archived} emails from {len(senders)} senders"
+            )
 
     except Exception as e:
         state.archive_status["error"] = f"{e!s}"
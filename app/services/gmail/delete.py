@@ -12,7 +12,15 @@ from typing import Optional
 
 from app.core import state
 from app.services.auth import get_gmail_service
-from app.services.gmail.helpers import build_gmail_query, get_sender_info, get_subject
+from app.services.gmail.helpers import (
+    batch_list_message_ids,
+    batch_modify_messages,
+    build_gmail_query,
+    get_sender_info,
+    get_subject,
+    listing_progress,
+    modify_messages,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -250,15 +258,7 @@ def delete_emails_by_sender(sender: str) -> dict:
 
         # Batch delete (move to trash)
         ids = [msg["id"] for msg in messages]
-        batch_size = 100
-        deleted = 0
-
-        for i in range(0, len(ids), batch_size):
-            batch = ids[i : i + batch_size]
-            service.users().messages().batchModify(
-                userId="me", body={"ids": batch, "addLabelIds": ["TRASH"]}
-            ).execute()
-            deleted += len(batch)
+        deleted = modify_messages(service, ids, add_label_ids=["TRASH"])
 
         # Remove sender from cached results
         state.delete_scan_results = [
@@ -346,44 +346,34 @@ def delete_emails_bulk_background(senders: list[str]) -> None:
         state.delete_bulk_status["error"] = error
         return
 
-    # Phase 1: Collect all message IDs from all senders
+    # Phase 1: Collect all message IDs from all senders. The per-sender list
+    # calls share batch HTTP requests instead of one round trip each.
     all_message_ids = []
     errors = []
+    queries = {sender: f"from:{sender}" for sender in senders}
 
-    for i, sender in enumerate(senders):
-        state.delete_bulk_status["current_sender"] = i + 1
-        state.delete_bulk_status["progress"] = int(
-            (i / total_senders) * 40
-        )  # 0-40% for collecting
-        state.delete_bulk_status["message"] = f"Finding emails from {sender}..."
-
-        try:
-            query = f"from:{sender}"
-            results = (
-                service.users()
-                .messages()
-                .list(userId="me", q=query, maxResults=500)
-                .execute()
-            )
-            messages = results.get("messages", [])
+    try:
+        listed = batch_list_message_ids(
+            service,
+            list(queries.values()),
+            on_progress=listing_progress(state.delete_bulk_status, total_senders),
+        )
+    except Exception as e:
+        state.delete_bulk_status["done"] = True
+        state.delete_bulk_status["error"] = str(e)
+        return
 
-            while "nextPageToken" in results:
-                results = (
-                    service.users()
-                    .messages()
-                    .list(
-                        userId="me",
-                        q=query,
-                        maxResults=500,
-                        pageToken=results["nextPageToken"],
-                    )
-                    .execute()
-                )
-                messages.extend(results.get("messages", []))
+    for sender, query in queries.items():
+        message_ids = listed[query]
+        if isinstance(message_ids, Exception):
+            errors.append(f"{sender}: {message_ids!s}")
+        else:
+            all_message_ids.extend(message_ids)
+    # Overlapping senders (address and its domain) can match the same email
+    all_message_ids = list(dict.fromkeys(all_message_ids))
 
-            all_message_ids.extend([msg["id"] for msg in messages])
-        except Exception as e:
-            errors.append(f"{sender}: {str(e)}")
+    state.delete_bulk_status["current_sender"] = total_senders
+    state.delete_bulk_status["progress"] = 40  # 0-40% for collecting
 
     if not all_message_ids:
         state.delete_bulk_status["progress"] = 100
@@ -395,16 +385,12 @@ def delete_emails_bulk_background(senders: list[str]) -> None:
     total_emails = len(all_message_ids)
     state.delete_bulk_status["message"] = f"Deleting {total_emails} emails..."
 
-    batch_size = 1000  # Gmail allows up to 1000 per batchModify
     deleted = 0
 
     try:
-        for i in range(0, total_emails, batch_size):
-            batch = all_message_ids[i : i + batch_size]
-            service.users().messages().batchModify(
-                userId="me", body={"ids": batch, "addLabelIds": ["TRASH"]}
-            ).execute()
-            deleted += len(batch)
+        for deleted in batch_modify_messages(
+            service, all_message_ids, add_label_ids=["TRASH"]
+        ):
             state.delete_bulk_status["deleted_count"] = deleted
             # Progress: 40-100% for deleting
             state.delete_bulk_status["progress"] = 40 + int(
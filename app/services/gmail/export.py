@@ -4,14 +4,75 @@ Gmail Thread Export Operations
 Functions for searching and exporting email threads to text files.
 """
 
-import base64
+from __future__ import annotations
+
+import io
 import logging
-from typing import Any
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable
+
+from app.services.auth import get_gmail_credentials, get_gmail_service
+
+try:
+    # SIMD-accelerated codec; same API as the stdlib function
+    from pybase64 import urlsafe_b64decode as _b64decode
+except ImportError:
+    from base64 import urlsafe_b64decode as _b64decode
 
-from app.services.auth import get_gmail_service
+if TYPE_CHECKING:
+    from google_auth_httplib2 import AuthorizedHttp
 
 logger = logging.getLogger(__name__)
 
+# Gmail Batch API accepts up to 100 requests per HTTP call
+_BATCH_SIZE = 100
+
+# Batch HTTP calls run on this pool so several can be in flight at once.
+# The pool is created on first use; shutdown_fetch_executor stops it.
+_FETCH_WORKERS = 4
+_fetch_executor: ThreadPoolExecutor | None = None
+_fetch_executor_lock = threading.Lock()
+
+# httplib2 connections are not thread-safe, so each fetch thread keeps its own
+# authorized HTTP object: (credentials, AuthorizedHttp)
+_fetch_local = threading.local()
+
+# Export text for the start of a thread and of each message in it
+_THREAD_TEMPLATE = (
+    f"\n{'=' * 80}\n"
+    "THREAD {index} of {total} (ID: {thread_id})\n"
+    "Messages in thread: {count}\n"
+    f"{'=' * 80}\n\n"
+)
+_MESSAGE_TEMPLATE = (
+    "--- Message {index} of {count} ---\n"
+    "From: {sender}\n"
+    "Date: {date}\n"
+    "Subject: {subject}\n\n"
+)
+
+# Lowercased forms of common header spellings, so _header_map can skip
+# str.lower() for them
+_HEADER_KEYS = {
+    name: name.lower()
+    for name in (
+        "From", "To", "Cc", "Date", "Subject", "Reply-To", "Message-ID",
+        "Received", "Return-Path", "Content-Type", "MIME-Version",
+        "DKIM-Signature", "ARC-Seal", "ARC-Message-Signature",
+        "ARC-Authentication-Results", "Authentication-Results",
+        "Received-SPF", "X-Received", "X-Google-Smtp-Source",
+        "List-Unsubscribe", "List-Unsubscribe-Post",
+    )
+}
+
+# Partial-response mask for preview thread fetches: snippet and headers only
+_PREVIEW_THREAD_FIELDS = "id,messages(snippet,payload/headers)"
+
+# Padding to append to base64 data, indexed by -len(data) & 3
+_B64_PADDING = ("", "=", "==", "===")
+
 
 def _decode_base64url(data: str) -> str:
     """Decode base64url encoded string.
@@ -25,11 +86,9 @@ def _decode_base64url(data: str) -> str:
     if not data:
         return ""
     try:
-        # Add padding if needed
-        padding = 4 - len(data) % 4
-        if padding != 4:
-            data += "=" * padding
-        decoded_bytes = base64.urlsafe_b64decode(data)
+        # Gmail strips the padding; only copy the data when some is missing
+        padding = _B64_PADDING[-len(data) & 3]
+        decoded_bytes = _b64decode(data + padding if padding else data)
         return decoded_bytes.decode("utf-8", errors="replace")
     except Exception as e:
         logger.warning(f"Failed to decode base64url data: {e}")
@@ -53,10 +112,31 @@ def _extract_header(headers: list[dict[str, str]], name: str) -> str:
     return ""
 
 
+def _header_map(headers: list[dict[str, str]]) -> dict[str, str]:
+    """Index a headers list by lowercased name.
+
+    Like _extract_header, the first header with a given name wins.
+
+    Args:
+        headers: List of header dictionaries with 'name' and 'value' keys
+
+    Returns:
+        Dict mapping lowercased header name to its value
+    """
+    header_map = {}
+    for header in reversed(headers):
+        name = header.get("name", "")
+        key = _HEADER_KEYS.get(name) or name.lower()
+        header_map[key] = header.get("value", "")
+    return header_map
+
+
 def _extract_body(payload: dict[str, Any]) -> str:
     """Extract email body from message payload.
 
-    Handles both simple and multipart messages. Prefers text/plain over text/html.
+    Handles both simple and multipart messages. The MIME tree is walked
+    depth-first and the first non-empty text/plain part is returned; text/html
+    is only decoded when the message has no plain text part.
 
     Args:
         payload: Message payload dictionary
@@ -68,51 +148,314 @@ def _extract_body(payload: dict[str, Any]) -> str:
     if "body" in payload and "data" in payload["body"]:
         return _decode_base64url(payload["body"]["data"])
 
-    # Check for parts (multipart message)
-    if "parts" in payload:
-        text_plain = None
-        text_html = None
+    html_data = None
+    stack = list(reversed(payload.get("parts", [])))
+    while stack:
+        part = stack.pop()
+        mime_type = part.get("mimeType", "")
+
+        # Handle nested multipart (children are visited in order)
+        if mime_type.startswith("multipart/"):
+            stack.extend(reversed(part.get("parts", [])))
+            continue
+
+        data = part.get("body", {}).get("data")
+        if not data:
+            continue
+        if mime_type == "text/plain":
+            text_plain = _decode_base64url(data)
+            if text_plain:
+                return text_plain
+        elif mime_type == "text/html" and html_data is None:
+            # Keep as fallback, decoded only if no text/plain turns up
+            html_data = data
+
+    return _decode_base64url(html_data) if html_data else ""
+
+
+def _thread_http(credentials) -> AuthorizedHttp:
+    """Return this thread's authorized HTTP object for `credentials`."""
+    entry = getattr(_fetch_local, "entry", None)
+    if entry is None or entry[0] is not credentials:
+        from google_auth_httplib2 import AuthorizedHttp
+        from googleapiclient.http import build_http
+
+        entry = (credentials, AuthorizedHttp(credentials, http=build_http()))
+        _fetch_local.entry = entry
+    return entry[1]
+
+
+def _get_fetch_executor() -> ThreadPoolExecutor:
+    """Return the fetch pool, creating it on first use."""
+    global _fetch_executor
+    executor = _fetch_executor
+    if executor is None:
+        with _fetch_executor_lock:
+            if _fetch_executor is None:
+                _fetch_executor = ThreadPoolExecutor(
+                    max_workers=_FETCH_WORKERS, thread_name_prefix="gmail-fetch"
+                )
+            executor = _fetch_executor
+    return executor
+
+
+def shutdown_fetch_executor() -> None:
+    """Stop the fetch pool's threads (at app shutdown); a later fetch starts a new pool."""
+    global _fetch_executor
+    with _fetch_executor_lock:
+        executor, _fetch_executor = _fetch_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _execute_batch(batch, credentials) -> None:
+    """Execute a batch request on the current (fetch pool) thread."""
+    batch.execute(http=_thread_http(credentials))
+
+
+def _submit_batch_get_threads(
+    service, thread_ids: list[str], *, credentials=None, **get_kwargs
+) -> Callable[[], dict[str, Any]]:
+    """Start fetching threads with the Gmail Batch API (100 requests per call).
+
+    With credentials, batches are executed concurrently on the fetch pool,
+    each over its own connection authorized with them.
 
-        for part in payload["parts"]:
-            mime_type = part.get("mimeType", "")
+    Args:
+        service: Authenticated Gmail API service
+        thread_ids: Thread IDs to fetch (duplicates are fetched once)
+        credentials: The service's credentials, or None to fetch in this thread
+        **get_kwargs: Extra parameters for threads().get (e.g. format)
 
-            # Handle nested multipart
-            if mime_type.startswith("multipart/"):
-                nested_body = _extract_body(part)
-                if nested_body:
-                    return nested_body
+    Returns:
+        Function that waits for all batches and returns a dict mapping thread
+        ID to the thread resource, or to the exception raised while fetching
+        that thread
+    """
+    results: dict[str, Any] = {}
+
+    def process_thread(request_id, response, exception) -> None:
+        results[request_id] = exception if exception else response
+
+    threads_api = service.users().threads()
+    unique_ids = list(dict.fromkeys(thread_ids))
+    batches = []
+    for i in range(0, len(unique_ids), _BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=process_thread)
+        for thread_id in unique_ids[i : i + _BATCH_SIZE]:
+            batch.add(
+                threads_api.get(userId="me", id=thread_id, **get_kwargs),
+                request_id=thread_id,
+            )
+        batches.append(batch)
+
+    if credentials is None:
+        # No credentials to open extra connections with: fetch in this thread
+        for batch in batches:
+            batch.execute()
+        return lambda: results
+
+    executor = _get_fetch_executor()
+    futures = [executor.submit(_execute_batch, batch, credentials) for batch in batches]
+
+    def wait() -> dict[str, Any]:
+        for future in futures:
+            future.result()
+        return results
+
+    return wait
+
+
+def _batch_get_threads(
+    service, thread_ids: list[str], *, credentials=None, **get_kwargs
+) -> dict[str, Any]:
+    """Fetch threads using the Gmail Batch API and wait for the results.
+
+    See _submit_batch_get_threads for the arguments and return value.
+    """
+    return _submit_batch_get_threads(
+        service, thread_ids, credentials=credentials, **get_kwargs
+    )()
 
-            # Extract text/plain
-            if mime_type == "text/plain" and "body" in part and "data" in part["body"]:
-                text_plain = _decode_base64url(part["body"]["data"])
 
-            # Extract text/html as fallback
-            elif mime_type == "text/html" and "body" in part and "data" in part["body"]:
-                text_html = _decode_base64url(part["body"]["data"])
+def _get_thread_result(results: dict[str, Any], thread_id: str) -> dict[str, Any]:
+    """Return a thread fetched by _batch_get_threads, re-raising its error if any."""
+    result = results.get(thread_id)
+    if isinstance(result, Exception):
+        raise result
+    if result is None:
+        raise ValueError("No response received from Gmail API")
+    return result
 
-        # Prefer text/plain over text/html
-        return text_plain or text_html or ""
 
-    return ""
+def _format_thread(
+    thread_idx: int, total: int, thread_id: str, thread_data: dict[str, Any]
+) -> str:
+    """Format a single thread (all of its messages) as export text.
 
+    Args:
+        thread_idx: 1-based position of the thread in the export
+        total: Total number of threads in the export
+        thread_id: Gmail thread ID
+        thread_data: Thread resource fetched with format="full"
 
-def export_threads_by_query(query: str, max_threads: int = 50) -> str:
-    """Search for email threads by query and export full content to text.
+    Returns:
+        Formatted thread text, ending with a newline
+    """
+    messages = thread_data.get("messages", [])
+    count = len(messages)
+
+    buf = io.StringIO()
+    write = buf.write
+    write(
+        _THREAD_TEMPLATE.format(
+            index=thread_idx, total=total, thread_id=thread_id, count=count
+        )
+    )
+
+    # Process each message in the thread
+    for msg_idx, message in enumerate(messages, 1):
+        payload = message.get("payload", {})
+        headers = _header_map(payload.get("headers", []))
+
+        write(
+            _MESSAGE_TEMPLATE.format(
+                index=msg_idx,
+                count=count,
+                sender=headers.get("from", ""),
+                date=headers.get("date", ""),
+                subject=headers.get("subject", ""),
+            )
+        )
+        # Bodies can be large; write them as-is rather than copying them
+        # into a formatted string first
+        write(_extract_body(payload))
+        write("\n\n---\n\n")
+
+    return buf.getvalue()
+
+
+def _iter_thread_export(service, credentials, thread_ids: list[str]) -> Iterator[str]:
+    """Fetch threads one batch at a time and yield their formatted text.
+
+    Args:
+        service: Authenticated Gmail API service
+        credentials: The service's credentials (see _submit_batch_get_threads)
+        thread_ids: Thread IDs to export, in output order
+
+    Yields:
+        Formatted text for each thread (or an inline error message)
+    """
+    total = len(thread_ids)
+    pending = _submit_batch_get_threads(
+        service, thread_ids[:_BATCH_SIZE], credentials=credentials, format="full"
+    )
+    for start in range(0, total, _BATCH_SIZE):
+        chunk = thread_ids[start : start + _BATCH_SIZE]
+        thread_results = pending()
+
+        # Fetch the next batch while this one is formatted and consumed
+        next_chunk = thread_ids[start + _BATCH_SIZE : start + 2 * _BATCH_SIZE]
+        if next_chunk:
+            pending = _submit_batch_get_threads(
+                service, next_chunk, credentials=credentials, format="full"
+            )
+
+        for thread_idx, thread_id in enumerate(chunk, start + 1):
+            try:
+                thread_data = _get_thread_result(thread_results, thread_id)
+                yield _format_thread(thread_idx, total, thread_id, thread_data)
+            except Exception as e:
+                logger.error(f"Error fetching thread {thread_id}: {e}")
+                yield f"\nError fetching thread {thread_id}: {e!s}\n\n"
+
+
+def _export_footer(total: int) -> str:
+    """Closing banner for a thread export."""
+    return f"\n{'=' * 80}\nEnd of Export - {total} thread(s)\n{'=' * 80}"
+
+
+def _start_thread_export(
+    service, credentials, header: str, thread_ids: list[str]
+) -> Iterator[str]:
+    """Fetch the first batch of an export and return an iterator over all of it.
+
+    An error fetching the first batch is raised here, while the caller can
+    still report it as a failed request. Later failures are written into the
+    export text, since part of it has been sent by then.
+
+    Args:
+        service: Authenticated Gmail API service
+        credentials: The service's credentials (see _submit_batch_get_threads)
+        header: Export banner to emit before the threads
+        thread_ids: Thread IDs to export, in output order (at least one)
+
+    Returns:
+        Iterator over the header, each formatted thread and the footer
+    """
+    threads = _iter_thread_export(service, credentials, thread_ids)
+    first = next(threads)
+    return _export_chunks(header, first, threads, len(thread_ids))
+
+
+def _export_chunks(
+    header: str, first: str, threads: Iterator[str], total: int
+) -> Iterator[str]:
+    """Yield a started export: header, first thread, the rest and the footer."""
+    yield header
+    yield first
+    try:
+        yield from threads
+        yield _export_footer(total)
+        logger.info("Export completed: %d thread(s)", total)
+    except Exception as e:
+        logger.exception("Error during thread export")
+        yield f"Error during export: {e!s}"
+
+
+def _collect_export(chunks: Iterator[str], out: BinaryIO | None) -> str:
+    """Join export chunks into one string, or write them to `out` as UTF-8.
+
+    Args:
+        chunks: Export text chunks
+        out: Binary file to stream the export into, or None
+
+    Returns:
+        The export text, or a short summary when it was written to `out`
+    """
+    if out is None:
+        return "".join(chunks)
+    written = 0
+    for chunk in chunks:
+        written += out.write(chunk.encode("utf-8"))
+    return f"Export written ({written} bytes)"
+
+
+def start_export_threads_by_query(
+    query: str, max_threads: int = 50
+) -> tuple[Iterator[str] | None, str | None]:
+    """Search for email threads by query and start exporting their full content.
+
+    Sign-in, the thread search and the first batch of threads are done before
+    returning; the remaining threads are fetched in batches of 100 as the
+    returned iterator is consumed, so callers can stream the export without
+    buffering it.
 
     Args:
         query: Gmail search query (e.g., "from:example.com", "subject:newsletter")
         max_threads: Maximum number of threads to export (default: 50)
 
     Returns:
-        Formatted text content of all matching threads, or error message
+        tuple: (chunks, error_message). chunks iterates over the formatted
+        export text, and is None when the export could not be started.
     """
     # Get Gmail service
     service, error = get_gmail_service()
     if error:
-        return f"Authentication error: {error}"
+        return None, f"Authentication error: {error}"
 
     if not query or not query.strip():
-        return "Error: Search query cannot be empty"
+        return None, "Error: Search query cannot be empty"
 
     # Validate max_threads
     if not isinstance(max_threads, int) or max_threads < 1:
@@ -126,85 +469,58 @@ def export_threads_by_query(query: str, max_threads: int = 50) -> str:
         results = service.users().threads().list(
             userId="me",
             q=query,
-            maxResults=max_threads
+            maxResults=max_threads,
+            fields="threads(id)",
         ).execute()
 
         threads = results.get("threads", [])
 
         if not threads:
-            return "No email threads found matching your query."
+            return iter(["No email threads found matching your query."]), None
 
         logger.info(f"Found {len(threads)} thread(s), fetching full content...")
 
-        # Build the export content
-        export_lines = []
-        export_lines.append(f"Gmail Thread Export")
-        export_lines.append(f"Search Query: {query}")
-        export_lines.append(f"Total Threads: {len(threads)}")
-        export_lines.append(f"{'=' * 80}\n")
-
-        # Process each thread
-        for thread_idx, thread in enumerate(threads, 1):
-            thread_id = thread["id"]
-
-            try:
-                # Fetch full thread content
-                thread_data = service.users().threads().get(
-                    userId="me",
-                    id=thread_id,
-                    format="full"
-                ).execute()
-
-                messages = thread_data.get("messages", [])
-
-                export_lines.append(f"\n{'=' * 80}")
-                export_lines.append(f"THREAD {thread_idx} of {len(threads)} (ID: {thread_id})")
-                export_lines.append(f"Messages in thread: {len(messages)}")
-                export_lines.append(f"{'=' * 80}\n")
-
-                # Process each message in the thread
-                for msg_idx, message in enumerate(messages, 1):
-                    headers = message.get("payload", {}).get("headers", [])
-
-                    # Extract key headers
-                    from_header = _extract_header(headers, "From")
-                    date_header = _extract_header(headers, "Date")
-                    subject_header = _extract_header(headers, "Subject")
-
-                    # Extract body
-                    body = _extract_body(message.get("payload", {}))
-
-                    # Format message
-                    export_lines.append(f"--- Message {msg_idx} of {len(messages)} ---")
-                    export_lines.append(f"From: {from_header}")
-                    export_lines.append(f"Date: {date_header}")
-                    export_lines.append(f"Subject: {subject_header}")
-                    export_lines.append(f"\n{body}\n")
-                    export_lines.append("---\n")
-
-            except Exception as e:
-                logger.error(f"Error fetching thread {thread_id}: {e}", exc_info=True)
-                export_lines.append(f"\nError fetching thread {thread_id}: {str(e)}\n")
+        header = (
+            f"Gmail Thread Export\n"
+            f"Search Query: {query}\n"
+            f"Total Threads: {len(threads)}\n"
+            f"{'=' * 80}\n\n"
+        )
+        thread_ids = [thread["id"] for thread in threads]
+        credentials = get_gmail_credentials()
+        return _start_thread_export(service, credentials, header, thread_ids), None
 
-        export_lines.append(f"\n{'=' * 80}")
-        export_lines.append(f"End of Export - {len(threads)} thread(s)")
-        export_lines.append(f"{'=' * 80}")
+    except Exception as e:
+        logger.exception("Error during thread export")
+        return None, f"Error during export: {e!s}"
 
-        full_export_content = "\n".join(export_lines)
 
-        logger.info(f"Export completed successfully: {len(threads)} threads, "
-                   f"{len(full_export_content)} characters")
+def export_threads_by_query(
+    query: str, max_threads: int = 50, out: BinaryIO | None = None
+) -> str:
+    """Search for email threads by query and export full content to text.
 
-        return full_export_content
+    Args:
+        query: Gmail search query (e.g., "from:example.com", "subject:newsletter")
+        max_threads: Maximum number of threads to export (default: 50)
+        out: Binary file to write the export to as it is fetched, instead of
+            building it in memory
 
-    except Exception as e:
-        logger.error(f"Error during thread export: {e}", exc_info=True)
-        return f"Error during export: {str(e)}"
+    Returns:
+        Formatted text content of all matching threads, or error message
+        (a short summary when `out` is given)
+    """
+    chunks, error = start_export_threads_by_query(query, max_threads)
+    return _collect_export(chunks or iter([error]), out)
 
 
 def search_thread_previews(query: str, max_results: int = 500) -> dict:
     """Search for threads and return lightweight previews (no body fetch).
 
+    Previews are built only from each message's snippet and From/Subject/Date
+    headers; the thread fetch is restricted to those fields, so message
+    bodies and MIME parts are never downloaded.
+
     Args:
         query: Gmail search query
         max_results: Maximum number of thread previews to return (default: 500, uses pagination)
@@ -226,19 +542,24 @@ def search_thread_previews(query: str, max_results: int = 500) -> dict:
         max_results = 2000  # Reasonable upper limit
 
     try:
-        # Collect all thread IDs using pagination
+        # Collect all thread IDs using pagination. Each page's previews are
+        # fetched on the fetch pool while the next page is being listed.
         thread_list = []
+        pending = []
         page_token = None
+        credentials = get_gmail_credentials()
+        threads_api = service.users().threads()
 
         while len(thread_list) < max_results:
             # Gmail API has a max of 100 per page, so we paginate
             page_size = min(100, max_results - len(thread_list))
 
-            results = service.users().threads().list(
+            results = threads_api.list(
                 userId="me",
                 q=query,
                 maxResults=page_size,
-                pageToken=page_token
+                pageToken=page_token,
+                fields="threads(id),nextPageToken",
             ).execute()
 
             threads_in_page = results.get("threads", [])
@@ -247,6 +568,19 @@ def search_thread_previews(query: str, max_results: int = 500) -> dict:
 
             thread_list.extend(threads_in_page)
 
+            # Fetch with metadata only (and only the headers shown in the
+            # preview) — much faster than format=full
+            pending.append(
+                _submit_batch_get_threads(
+                    service,
+                    [thread["id"] for thread in threads_in_page],
+                    credentials=credentials,
+                    format="metadata",
+                    metadataHeaders=["From", "Subject", "Date"],
+                    fields=_PREVIEW_THREAD_FIELDS,
+                )
+            )
+
             # Check if there are more pages
             page_token = results.get("nextPageToken")
             if not page_token:
@@ -257,23 +591,24 @@ def search_thread_previews(query: str, max_results: int = 500) -> dict:
 
         logger.info(f"Found {len(thread_list)} threads matching query: {query}")
 
+        thread_results = {}
+        for wait in pending:
+            thread_results.update(wait())
+
         previews = []
         for thread in thread_list:
             thread_id = thread["id"]
             try:
-                # Fetch with metadata only — much faster than format=full
-                thread_data = service.users().threads().get(
-                    userId="me", id=thread_id, format="metadata"
-                ).execute()
+                thread_data = _get_thread_result(thread_results, thread_id)
 
                 messages = thread_data.get("messages", [])
                 # Use the last message in the thread for preview (most recent)
                 if messages:
                     latest = messages[-1]
-                    headers = latest.get("payload", {}).get("headers", [])
-                    sender = _extract_header(headers, "From")
-                    subject = _extract_header(headers, "Subject")
-                    date = _extract_header(headers, "Date")
+                    headers = _header_map(latest.get("payload", {}).get("headers", []))
+                    sender = headers.get("from", "")
+                    subject = headers.get("subject", "")
+                    date = headers.get("date", "")
                     snippet = latest.get("snippet", "")
                 else:
                     sender = subject = date = snippet = ""
@@ -300,69 +635,58 @@ def search_thread_previews(query: str, max_results: int = 500) -> dict:
         return {"success": True, "threads": previews, "error": None}
 
     except Exception as e:
-        logger.error(f"Error searching threads: {e}", exc_info=True)
+        logger.exception("Error searching threads")
         return {"success": False, "threads": [], "error": str(e)}
 
 
-def export_threads_by_ids(thread_ids: list[str]) -> str:
-    """Export specific threads by their IDs (full content).
+def start_export_threads_by_ids(
+    thread_ids: list[str],
+) -> tuple[Iterator[str] | None, str | None]:
+    """Start exporting specific threads by their IDs (full content).
+
+    Like start_export_threads_by_query, sign-in and the first batch are done
+    before returning.
 
     Args:
         thread_ids: List of Gmail thread IDs to export
 
     Returns:
-        Formatted text content of the selected threads
+        tuple: (chunks, error_message). chunks iterates over the formatted
+        export text, and is None when the export could not be started.
     """
     service, error = get_gmail_service()
     if error:
-        return f"Authentication error: {error}"
+        return None, f"Authentication error: {error}"
 
     if not thread_ids:
-        return "Error: No threads selected for export"
+        return None, "Error: No threads selected for export"
 
+    header = (
+        "Gmail Thread Export (Selected)\n"
+        f"Total Threads: {len(thread_ids)}\n"
+        f"{'=' * 80}\n\n"
+    )
     try:
-        export_lines = []
-        export_lines.append("Gmail Thread Export (Selected)")
-        export_lines.append(f"Total Threads: {len(thread_ids)}")
-        export_lines.append(f"{'=' * 80}\n")
-
-        for thread_idx, thread_id in enumerate(thread_ids, 1):
-            try:
-                thread_data = service.users().threads().get(
-                    userId="me", id=thread_id, format="full"
-                ).execute()
-
-                messages = thread_data.get("messages", [])
-
-                export_lines.append(f"\n{'=' * 80}")
-                export_lines.append(f"THREAD {thread_idx} of {len(thread_ids)} (ID: {thread_id})")
-                export_lines.append(f"Messages in thread: {len(messages)}")
-                export_lines.append(f"{'=' * 80}\n")
-
-                for msg_idx, message in enumerate(messages, 1):
-                    headers = message.get("payload", {}).get("headers", [])
-                    from_header = _extract_header(headers, "From")
-                    date_header = _extract_header(headers, "Date")
-                    subject_header = _extract_header(headers, "Subject")
-                    body = _extract_body(message.get("payload", {}))
-
-                    export_lines.append(f"--- Message {msg_idx} of {len(messages)} ---")
-                    export_lines.append(f"From: {from_header}")
-                    export_lines.append(f"Date: {date_header}")
-                    export_lines.append(f"Subject: {subject_header}")
-                    export_lines.append(f"\n{body}\n")
-                    export_lines.append("---\n")
+        credentials = get_gmail_credentials()
+        return _start_thread_export(service, credentials, header, thread_ids), None
+    except Exception as e:
+        logger.exception("Error during thread export by IDs")
+        return None, f"Error during export: {e!s}"
 
-            except Exception as e:
-                logger.error(f"Error fetching thread {thread_id}: {e}")
-                export_lines.append(f"\nError fetching thread {thread_id}: {str(e)}\n")
 
-        export_lines.append(f"\n{'=' * 80}")
-        export_lines.append(f"End of Export - {len(thread_ids)} thread(s)")
-        export_lines.append(f"{'=' * 80}")
+def export_threads_by_ids(
+    thread_ids: list[str], out: BinaryIO | None = None
+) -> str:
+    """Export specific threads by their IDs (full content).
 
-        return "\n".join(export_lines)
+    Args:
+        thread_ids: List of Gmail thread IDs to export
+        out: Binary file to write the export to as it is fetched, instead of
+            building it in memory
 
-    except Exception as e:
-        logger.error(f"Error during thread export by IDs: {e}", exc_info=True)
-        return f"Error during export: {str(e)}"
+    Returns:
+        Formatted text content of the selected threads (a short summary
+        when `out` is given)
+    """
+    chunks, error = start_export_threads_by_ids(thread_ids)
+    return _collect_export(chunks or iter([error]), out)
@@ -4,11 +4,25 @@ Gmail Service Helpers
 Shared utility functions: security, filters, and email parsing.
 """
 
+from __future__ import annotations
+
+import ipaddress
 import re
 import socket
-import ipaddress
+import time
+from collections.abc import Iterator
+from typing import Any, Callable
 from urllib.parse import urlparse
-from typing import Optional, Union, Any
+
+# Gmail accepts up to 1000 message IDs per messages.batchModify call
+BATCH_MODIFY_LIMIT = 1000
+
+# messages.list pages rejected for rate limiting (429, or 403 with one of
+# these reasons) are retried up to _LIST_MAX_RETRIES times, waiting
+# _LIST_BACKOFF_SECONDS * 2**(attempt - 1) between rounds
+_RATE_LIMIT_REASONS = frozenset({"rateLimitExceeded", "userRateLimitExceeded"})
+_LIST_MAX_RETRIES = 5
+_LIST_BACKOFF_SECONDS = 1.0
 
 
 def validate_unsafe_url(url: str) -> str:
@@ -89,7 +103,7 @@ def validate_unsafe_url(url: str) -> str:
     return url
 
 
-def build_gmail_query(filters: Optional[Union[dict, Any]] = None) -> str:
+def build_gmail_query(filters: dict | Any | None = None) -> str:
     """Build Gmail search query from filter parameters.
 
     Args:
@@ -108,8 +122,8 @@ def build_gmail_query(filters: Optional[Union[dict, Any]] = None) -> str:
         return ""
 
     # Handle both dict and Pydantic model
-    if hasattr(filters, "model_dump"):
-        filters = filters.model_dump(exclude_none=True)
+    if hasattr(filters, "as_dict"):
+        filters = filters.as_dict
 
     query_parts = []
 
@@ -140,7 +154,176 @@ def build_gmail_query(filters: Optional[Union[dict, Any]] = None) -> str:
     return " ".join(query_parts)
 
 
-def get_unsubscribe_from_headers(headers: list) -> tuple[Optional[str], Optional[str]]:
+def _is_rate_limited(exception: Exception) -> bool:
+    """Whether a Gmail API error is a 429 or a 403 rate-limit rejection."""
+    status = getattr(getattr(exception, "resp", None), "status", None)
+    if status == 429:
+        return True
+    if status == 403:
+        details = getattr(exception, "error_details", None) or []
+        return any(
+            isinstance(detail, dict) and detail.get("reason") in _RATE_LIMIT_REASONS
+            for detail in details
+        )
+    return False
+
+
+def batch_list_message_ids(
+    service,
+    queries: list[str],
+    batch_size: int = 50,
+    on_progress: Callable[[int], None] | None = None,
+) -> dict[str, list[str] | Exception]:
+    """List message IDs for several search queries over shared batch HTTP calls.
+
+    Each round sends one messages.list page per unfinished query, up to
+    batch_size per HTTP request, and follows nextPageToken until every query
+    is exhausted. Pages rejected for rate limiting are retried in a later
+    round after an exponential backoff.
+
+    Args:
+        service: Authenticated Gmail API service
+        queries: Gmail search queries (duplicates are listed once)
+        batch_size: Max list requests per batch HTTP call (Gmail recommends
+            no more than 50)
+        on_progress: Called after each batch HTTP call with the number of
+            queries finished so far (fully listed or failed)
+
+    Returns:
+        Dict mapping each query to its message IDs, or to the exception
+        that stopped its listing
+    """
+    results: dict[str, list[str] | Exception] = {
+        query: [] for query in dict.fromkeys(queries)
+    }
+    page_tokens: dict[str, str | None] = dict.fromkeys(results)
+    retries: dict[str, int] = dict.fromkeys(results, 0)
+    messages_api = service.users().messages()
+    finished = 0
+
+    while page_tokens:
+        pending = list(page_tokens.items())
+        page_tokens.clear()
+        rate_limited = False
+
+        for i in range(0, len(pending), batch_size):
+            chunk = pending[i : i + batch_size]
+
+            def process_page(request_id, response, exception, chunk=chunk) -> None:
+                nonlocal finished, rate_limited
+                query, page_token = chunk[int(request_id)]
+                if exception is not None:
+                    if _is_rate_limited(exception) and retries[query] < _LIST_MAX_RETRIES:
+                        retries[query] += 1
+                        page_tokens[query] = page_token
+                        rate_limited = True
+                    else:
+                        results[query] = exception
+                        finished += 1
+                    return
+                results[query].extend(m["id"] for m in response.get("messages", []))
+                if next_token := response.get("nextPageToken"):
+                    page_tokens[query] = next_token
+                else:
+                    finished += 1
+
+            batch = service.new_batch_http_request(callback=process_page)
+            for j, (query, page_token) in enumerate(chunk):
+                batch.add(
+                    messages_api.list(
+                        userId="me",
+                        q=query,
+                        maxResults=500,
+                        pageToken=page_token,
+                        fields="messages/id,nextPageToken",
+                    ),
+                    request_id=str(j),
+                )
+            batch.execute()
+            if on_progress is not None:
+                on_progress(finished)
+
+        if rate_limited:
+            attempt = max(retries[query] for query in page_tokens)
+            time.sleep(_LIST_BACKOFF_SECONDS * 2 ** (attempt - 1))
+
+    return results
+
+
+def listing_progress(status: dict, total_senders: int) -> Callable[[int], None]:
+    """Build an on_progress callback for batch_list_message_ids.
+
+    Background jobs spend 0-40% of their progress bar collecting message IDs;
+    the callback moves `current_sender` and `progress` in `status` through
+    that range as senders finish listing.
+    """
+
+    def update(finished: int) -> None:
+        status["current_sender"] = finished
+        status["progress"] = int(finished / total_senders * 40)
+
+    return update
+
+
+def batch_modify_messages(
+    service,
+    message_ids: list[str],
+    *,
+    add_label_ids: list[str] | None = None,
+    remove_label_ids: list[str] | None = None,
+) -> Iterator[int]:
+    """Change labels on messages with as few batchModify calls as possible.
+
+    Args:
+        service: Authenticated Gmail API service
+        message_ids: IDs of the messages to modify
+        add_label_ids: Label IDs to add to every message
+        remove_label_ids: Label IDs to remove from every message
+
+    Yields:
+        Number of messages modified so far, after each batchModify call
+    """
+    body: dict[str, Any] = {}
+    if add_label_ids:
+        body["addLabelIds"] = add_label_ids
+    if remove_label_ids:
+        body["removeLabelIds"] = remove_label_ids
+    modified = 0
+    for i in range(0, len(message_ids), BATCH_MODIFY_LIMIT):
+        chunk = message_ids[i : i + BATCH_MODIFY_LIMIT]
+        service.users().messages().batchModify(
+            userId="me", body={**body, "ids": chunk}
+        ).execute()
+        modified += len(chunk)
+        yield modified
+
+
+def modify_messages(
+    service,
+    message_ids: list[str],
+    *,
+    add_label_ids: list[str] | None = None,
+    remove_label_ids: list[str] | None = None,
+) -> int:
+    """Change labels on messages, for callers that do not report progress.
+
+    Runs batch_modify_messages to completion.
+
+    Returns:
+        Number of messages modified
+    """
+    modified = 0
+    for modified in batch_modify_messages(
+        service,
+        message_ids,
+        add_label_ids=add_label_ids,
+        remove_label_ids=remove_label_ids,
+    ):
+        pass
+    return modified
+
+
+def get_unsubscribe_from_headers(headers: list) -> tuple[str | None, str | None]:
     """Extract unsubscribe link from email headers."""
     for header in headers:
         if header["name"].lower() == "list-unsubscribe":
@@ -4,10 +4,13 @@ Gmail Mark Important Operations
 Functions for marking/unmarking emails as important.
 """
 
-import time
-
 from app.core import state
 from app.services.auth import get_gmail_service
+from app.services.gmail.helpers import (
+    batch_list_message_ids,
+    batch_modify_messages,
+    listing_progress,
+)
 
 
 def mark_important_background(senders: list[str], *, important: bool = True) -> None:
@@ -31,57 +34,52 @@ def mark_important_background(senders: list[str], *, important: bool = True) ->
             state.important_status["done"] = True
             return
 
-        total_affected = 0
-
-        for i, sender in enumerate(senders):
-            state.important_status["current_sender"] = i + 1
-            state.important_status["message"] = f"{action} emails from {sender}..."
-            state.important_status["progress"] = int((i / len(senders)) * 100)
-
-            # Find all emails from this sender
-            query = f"from:{sender}"
-            message_ids = []
-            page_token = None
-
-            while True:
-                result = (
-                    service.users()
-                    .messages()
-                    .list(userId="me", q=query, maxResults=500, pageToken=page_token)
-                    .execute()
-                )
+        # Find emails from every sender (list calls share batch requests)
+        queries = [f"from:{sender}" for sender in senders]
+        listed = batch_list_message_ids(
+            service,
+            queries,
+            on_progress=listing_progress(state.important_status, len(senders)),
+        )
+        message_ids = []
+        errors = []
+        for sender, query in zip(senders, queries):
+            if isinstance(listed[query], Exception):
+                # Keep going: one sender failing should not stop the others
+                errors.append(f"{sender}: {listed[query]!s}")
+            else:
+                message_ids.extend(listed[query])
+        # Overlapping senders (address and its domain) can match the same email
+        message_ids = list(dict.fromkeys(message_ids))
+
+        state.important_status["current_sender"] = len(senders)
+        state.important_status["progress"] = 40
 
-                messages = result.get("messages", [])
-                message_ids.extend([m["id"] for m in messages])
-
-                page_token = result.get("nextPageToken")
-                if not page_token:
-                    break
-
-            if not message_ids:
-                continue
-
-            # Mark in batches
-            for j in range(0, len(message_ids), 100):
-                batch_ids = message_ids[j : j + 100]
-                # Gmail API requires explicit parameter names (addLabelIds or removeLabelIds)
-                body = (
-                    {"ids": batch_ids, "addLabelIds": ["IMPORTANT"]}
-                    if important
-                    else {"ids": batch_ids, "removeLabelIds": ["IMPORTANT"]}
-                )
-                service.users().messages().batchModify(userId="me", body=body).execute()
-                total_affected += len(batch_ids)
-
-                # Throttle every 500 emails (use cumulative count across all senders)
-                if total_affected > 0 and total_affected % 500 == 0:
-                    time.sleep(0.5)
+        total_affected = 0
+        for total_affected in batch_modify_messages(
+            service,
+            message_ids,
+            add_label_ids=["IMPORTANT"] if important else None,
+            remove_label_ids=None if important else ["IMPORTANT"],
+        ):
+            state.important_status["progress"] = 40 + int(
+                (total_affected / len(message_ids)) * 60
+            )
+            state.important_status["message"] = (
+                f"{action} {total_affected}/{len(message_ids)} emails..."
+            )
 
         state.important_status["progress"] = 100
         state.important_status["done"] = True
         state.important_status["affected_count"] = total_affected
         action_done = "marked as important" if important else "unmarked as important"
-        state.important_status["message"] = f"{total_affected} emails {action_done}"
+        if errors:
+            state.important_status["error"] = f"Some errors: {'; '.join(errors[:3])}"
+            state.important_status["message"] = (
+                f"{total_affected} emails {action_done} with some errors"
+            )
+        else:
+            state.important_status["message"] = f"{total_affected} emails {action_done}"
 
     except Exception as e:
         state.important_status["error"] = f"{e!s}"
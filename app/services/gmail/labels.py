@@ -6,6 +6,11 @@ Functions for managing Gmail labels.
 
 from app.core import state
 from app.services.auth import get_gmail_service
+from app.services.gmail.helpers import (
+    batch_list_message_ids,
+    batch_modify_messages,
+    listing_progress,
+)
 
 
 def get_labels() -> dict:
@@ -176,43 +181,37 @@ def _apply_label_operation_background(
             state.label_operation_status["error"] = f"Failed to fetch label: {str(e)}"
             return
 
-    for i, sender in enumerate(senders):
-        state.label_operation_status["current_sender"] = i + 1
-        state.label_operation_status["progress"] = int((i / total_senders) * 40)
-        state.label_operation_status["message"] = f"Finding emails from {sender}..."
+    # Build query: for remove, include label filter; for add, just sender.
+    # The per-sender list calls share batch HTTP requests.
+    if add_label:
+        queries = {sender: f"from:{sender}" for sender in senders}
+    else:
+        queries = {sender: f"from:{sender} label:{label_name}" for sender in senders}
 
-        try:
-            # Build query: for remove, include label filter; for add, just sender
-            if add_label:
-                query = f"from:{sender}"
-            else:
-                query = f"from:{sender} label:{label_name}"
+    try:
+        listed = batch_list_message_ids(
+            service,
+            list(queries.values()),
+            on_progress=listing_progress(
+                state.label_operation_status, total_senders
+            ),
+        )
+    except Exception as e:
+        state.label_operation_status["done"] = True
+        state.label_operation_status["error"] = str(e)
+        return
 
-            results = (
-                service.users()
-                .messages()
-                .list(userId="me", q=query, maxResults=500)
-                .execute()
-            )
-            messages = results.get("messages", [])
-
-            while "nextPageToken" in results:
-                results = (
-                    service.users()
-                    .messages()
-                    .list(
-                        userId="me",
-                        q=query,
-                        maxResults=500,
-                        pageToken=results["nextPageToken"],
-                    )
-                    .execute()
-                )
-                messages.extend(results.get("messages", []))
-
-            all_message_ids.extend([msg["id"] for msg in messages])
-        except Exception as e:
-            errors.append(f"{sender}: {str(e)}")
+    for sender, query in queries.items():
+        message_ids = listed[query]
+        if isinstance(message_ids, Exception):
+            errors.append(f"{sender}: {message_ids!s}")
+        else:
+            all_message_ids.extend(message_ids)
+    # Overlapping senders (address and its domain) can match the same email
+    all_message_ids = list(dict.fromkeys(all_message_ids))
+
+    state.label_operation_status["current_sender"] = total_senders
+    state.label_operation_status["progress"] = 40
 
     if not all_message_ids:
         state.label_operation_status["progress"] = 100
@@ -226,21 +225,15 @@ def _apply_label_operation_background(
         count=total_emails
     )
 
-    batch_size = 1000
     affected = 0
 
-    # Build batch modify body
-    if add_label:
-        body_template = {"ids": None, "addLabelIds": [label_id]}
-    else:
-        body_template = {"ids": None, "removeLabelIds": [label_id]}
-
     try:
-        for i in range(0, total_emails, batch_size):
-            batch = all_message_ids[i : i + batch_size]
-            body = {**body_template, "ids": batch}
-            service.users().messages().batchModify(userId="me", body=body).execute()
-            affected += len(batch)
+        for affected in batch_modify_messages(
+            service,
+            all_message_ids,
+            add_label_ids=[label_id] if add_label else None,
+            remove_label_ids=None if add_label else [label_id],
+        ):
             state.label_operation_status["affected_count"] = affected
             state.label_operation_status["progress"] = 40 + int(
                 (affected / total_emails) * 60
@@ -8,7 +8,7 @@ from typing import Optional
 
 from app.core import state
 from app.services.auth import get_gmail_service
-from app.services.gmail.helpers import build_gmail_query
+from app.services.gmail.helpers import batch_modify_messages, build_gmail_query
 
 
 def get_unread_count() -> dict:
@@ -66,7 +66,6 @@ def mark_emails_as_read(count: int = 100, filters: Optional[dict] = None):
         # count=0 means "all" - no limit
         mark_all = count == 0
         page_size = 500
-        batch_size = 100
         marked = 0
         remaining = count  # Only used when not mark_all
         page_token = None
@@ -95,18 +94,16 @@ def mark_emails_as_read(count: int = 100, filters: Optional[dict] = None):
                 messages = messages[:remaining]
                 remaining -= len(messages)
 
-            # Mark this page in batches of 100
-            for i in range(0, len(messages), batch_size):
-                batch = messages[i : i + batch_size]
-                ids = [msg["id"] for msg in batch]
-
-                service.users().messages().batchModify(
-                    userId="me", body={"ids": ids, "removeLabelIds": ["UNREAD"]}
-                ).execute()
-
-                marked += len(ids)
-                state.mark_read_status["message"] = f"Marked {marked} as read..."
-                state.mark_read_status["marked_count"] = marked
+            # Mark the whole page with a single batchModify call
+            ids = [msg["id"] for msg in messages]
+            for page_marked in batch_modify_messages(
+                service, ids, remove_label_ids=["UNREAD"]
+            ):
+                state.mark_read_status["message"] = (
+                    f"Marked {marked + page_marked} as read..."
+                )
+                state.mark_read_status["marked_count"] = marked + page_marked
+            marked += len(ids)
 
             # Stop if we've marked enough (when not marking all)
             if not mark_all and remaining <= 0:
@@ -44,7 +44,8 @@ def preview_emails_from_sender(sender: str, limit: int = 10) -> dict:
     try:
         # Find emails from sender
         query = f"from:{sender}"
-        results = service.users().messages().list(
+        messages_api = service.users().messages()
+        results = messages_api.list(
             userId="me",
             q=query,
             maxResults=limit
@@ -95,7 +96,7 @@ def preview_emails_from_sender(sender: str, limit: int = 10) -> dict:
             
             for msg_data in batch_ids:
                 batch.add(
-                    service.users().messages().get(
+                    messages_api.get(
                         userId="me",
                         id=msg_data["id"],
                         format="metadata",
@@ -4,20 +4,199 @@ Gmail Unsubscribe Operations
 Functions for unsubscribing from email senders.
 """
 
+from __future__ import annotations
+
 import logging
-import re
-import urllib.error
-import urllib.request
-from typing import Any
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable
+from urllib.parse import urljoin, urlparse
 
+from app.core import state
 from app.services.auth import get_gmail_service
-from app.services.gmail.helpers import validate_unsafe_url
+from app.services.gmail.helpers import batch_modify_messages, validate_unsafe_url
+
+if TYPE_CHECKING:
+    import requests
 
 logger = logging.getLogger(__name__)
 
+# One session for all unsubscribe requests: most newsletters go through a few
+# mailing providers, so pooled keep-alive connections skip repeated TLS
+# handshakes. Requests never follow redirects on their own (see
+# _get_unsubscribe), so every host contacted is one that passed
+# validate_unsafe_url. Created on first use (see _get_session) so requests is
+# only imported once an unsubscribe link is actually visited.
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+# One-click (RFC 8058) endpoints answer the POST directly, so it gets a shorter
+# timeout than the GET fallback
+_ONE_CLICK_TIMEOUT = 5
+_GET_TIMEOUT = 10
+_ONE_CLICK_BODY = b"List-Unsubscribe=One-Click"
+
+# Response bodies up to this size are read and discarded so the keep-alive
+# connection goes back to the session's pool; the connection behind a larger
+# body is closed rather than downloading a page nobody reads
+_DRAIN_LIMIT = 64 * 1024
+_DRAIN_CHUNK_SIZE = 16 * 1024
+
+# Redirects are followed by hand so each target can be checked with
+# validate_unsafe_url first. Click-tracking links usually take one hop.
+_MAX_REDIRECTS = 5
+_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+
+# Gmail Batch API accepts up to 100 requests per HTTP call
+_BATCH_SIZE = 100
+
+# Unsubscribe links visited at the same time by process_unsubscribe_label.
+# The pool is shared across runs; threads are created on first use.
+_UNSUBSCRIBE_WORKERS = 10
+_unsubscribe_executor = ThreadPoolExecutor(
+    max_workers=_UNSUBSCRIBE_WORKERS, thread_name_prefix="unsubscribe"
+)
+
+# Hard failures (connection errors, 5xx) after which a host is skipped for the
+# rest of a process_unsubscribe_label run
+_HOST_FAILURE_LIMIT = 3
+
+# Headers fetched for each labelled message. Gmail returns header names as
+# the sender wrote them, which is almost always this canonical case, so
+# lookups go through this table before falling back to str.lower().
+_METADATA_HEADERS = ["List-Unsubscribe", "List-Unsubscribe-Post", "From"]
+_HEADER_KEYS = {name: name.lower() for name in _METADATA_HEADERS}
+
+# (account, lowercased label name) -> label ID, so repeated runs skip the
+# labels.list call. Label IDs never change while the label exists.
+_label_ids: dict[tuple[str | None, str], str] = {}
+_label_ids_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Return the shared unsubscribe session, creating it on first use."""
+    global _session
+    if _session is not None:
+        return _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            session.headers["User-Agent"] = (
+                "Mozilla/5.0 (compatible; GmailUnsubscribe/1.0)"
+            )
+            adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def _release(response: requests.Response) -> None:
+    """Finish with a streamed response, keeping its connection when cheap.
+
+    Up to _DRAIN_LIMIT bytes of body are read and dropped; once the body is
+    consumed, close() returns the connection to the pool. A larger body (by
+    Content-Length, or found while reading) is left unread and close() drops
+    the connection instead.
+    """
+    try:
+        length = response.headers.get("Content-Length")
+        if length is None or (length.isdigit() and int(length) <= _DRAIN_LIMIT):
+            drained = 0
+            for chunk in response.iter_content(_DRAIN_CHUNK_SIZE):
+                drained += len(chunk)
+                if drained > _DRAIN_LIMIT:
+                    break
+    except OSError as e:
+        # requests.RequestException is an OSError; the status is already known
+        logger.debug("Failed to drain unsubscribe response: %s", e)
+    finally:
+        response.close()
+
+
+def _status_only(response: requests.Response) -> int:
+    """Return a streamed response's status code and release its connection.
+
+    Unsubscribe endpoints often answer with an HTML confirmation page we never
+    look at; see _release for how much of it is read.
+    """
+    try:
+        return response.status_code
+    finally:
+        _release(response)
+
+
+def _post_one_click(link: str) -> int:
+    """Send an RFC 8058 one-click unsubscribe POST to a validated URL.
+
+    Returns:
+        HTTP status code of the response
+    """
+    return _status_only(
+        _get_session().post(
+            link,
+            data=_ONE_CLICK_BODY,
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            timeout=_ONE_CLICK_TIMEOUT,
+            allow_redirects=False,
+            stream=True,
+        )
+    )
+
+
+def _get_unsubscribe(link: str, validate: Callable[[str], Any]) -> int:
+    """Send a GET to a validated unsubscribe URL, following redirects.
+
+    Up to _MAX_REDIRECTS redirects are followed. Each Location is passed to
+    `validate` before it is requested, so every host contacted is checked.
+
+    Args:
+        link: Unsubscribe URL that already passed validation
+        validate: Raises ValueError for a URL that must not be requested
+
+    Returns:
+        HTTP status code of the last response (a 3xx if the redirect limit
+        was reached or the redirect had no Location)
+
+    Raises:
+        ValueError: If a redirect target fails validation
+    """
+    for _ in range(_MAX_REDIRECTS + 1):
+        response = _get_session().get(
+            link, timeout=_GET_TIMEOUT, allow_redirects=False, stream=True
+        )
+        try:
+            status = response.status_code
+            location = (
+                response.headers.get("Location")
+                if status in _REDIRECT_STATUSES
+                else None
+            )
+        finally:
+            _release(response)
+        if not location:
+            return status
+        link = urljoin(link, location)
+        validate(link)
+    return status
+
+
+def unsubscribe_single(domain: str, link: str, one_click: bool = True) -> dict:
+    """Attempt to unsubscribe from a single sender.
+
+    Args:
+        domain: Sender domain, echoed back in the result
+        link: Unsubscribe URL
+        one_click: Whether the sender supports one-click unsubscribe
+            (List-Unsubscribe-Post); when False the POST is skipped and only
+            GET is tried
+    """
+    import requests
 
-def unsubscribe_single(domain: str, link: str) -> dict:
-    """Attempt to unsubscribe from a single sender."""
     if not link:
         return {"success": False, "message": "No unsubscribe link provided"}
 
@@ -34,66 +213,280 @@ def unsubscribe_single(domain: str, link: str) -> dict:
         try:
             link = validate_unsafe_url(link)
         except ValueError as e:
-            return {"success": False, "message": f"Security Error: {str(e)}"}
-
-        # Create Default SSL context (Verifies certs by default)
-        # We removed the custom context that disabled verification.
+            return {"success": False, "message": f"Security Error: {e!s}"}
 
         # Try POST first (one-click), then GET
-        req = urllib.request.Request(
-            link,
-            data=b"List-Unsubscribe=One-Click",
-            headers={
-                "User-Agent": "Mozilla/5.0 (compatible; GmailUnsubscribe/1.0)",
-                "Content-Type": "application/x-www-form-urlencoded",
-            },
-            method="POST",
-        )
-
-        try:
-            with urllib.request.urlopen(req, timeout=10) as response:  # nosec B310
-                if response.status in [200, 201, 202, 204]:
+        if one_click:
+            try:
+                status = _post_one_click(link)
+                if status in [200, 201, 202, 204]:
                     return {
                         "success": True,
                         "message": "Unsubscribed successfully",
                         "domain": domain,
                     }
-        except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError) as e:
-            # POST failed - log and fall back to GET
-            logger.debug(
-                f"POST unsubscribe failed for {domain}, falling back to GET: {e}"
-            )
-        except Exception as e:
-            # Unexpected error - log it
-            logger.warning(
-                f"Unexpected error during POST unsubscribe for {domain}: {e}"
-            )
+            except requests.RequestException as e:
+                # POST failed - log and fall back to GET
+                logger.debug(
+                    f"POST unsubscribe failed for {domain}, falling back to GET: {e}"
+                )
+            except Exception as e:
+                # Unexpected error - log it
+                logger.warning(
+                    f"Unexpected error during POST unsubscribe for {domain}: {e}"
+                )
 
         # Fallback to GET
-        req = urllib.request.Request(
-            link,
-            headers={"User-Agent": "Mozilla/5.0 (compatible; GmailUnsubscribe/1.0)"},
-        )
-
         try:
-            with urllib.request.urlopen(req, timeout=10) as response:  # nosec B310
-                if response.status in [200, 201, 202, 204, 301, 302]:
-                    return {
-                        "success": True,
-                        "message": "Unsubscribed (confirmation may be needed)",
-                        "domain": domain,
-                    }
-                return {
-                    "success": False,
-                    "message": f"Server returned status {response.status}",
-                }
-        except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError) as e:
+            status = _get_unsubscribe(link, validate_unsafe_url)
+        except ValueError as e:
+            return {"success": False, "message": f"Security Error: {e!s}"}
+        except requests.RequestException as e:
             return {"success": False, "message": f"Failed to unsubscribe: {e}"}
 
+        if status in [200, 201, 202, 204]:
+            return {
+                "success": True,
+                "message": "Unsubscribed (confirmation may be needed)",
+                "domain": domain,
+            }
+        return {
+            "success": False,
+            "message": f"Server returned status {status}",
+        }
+
     except Exception as e:
         return {"success": False, "message": str(e)[:100]}
 
 
+def _extract_http_url(header: str) -> str | None:
+    """Return the first <http(s)://...> URL in a List-Unsubscribe header.
+
+    Equivalent to re.search(r"<(https?://[^>]+)>", header) but a plain
+    find() scan, since the header format (<url>, <url>) is fixed.
+
+    Args:
+        header: List-Unsubscribe header value, e.g. "<mailto:...>, <https://...>"
+
+    Returns:
+        The URL without angle brackets, or None if there is no HTTP(S) URL
+    """
+    start = header.find("<http")
+    while start != -1:
+        end = header.find(">", start + 1)
+        if end == -1:
+            return None
+        url = header[start + 1 : end]
+        if (url.startswith("http://") and len(url) > 7) or (
+            url.startswith("https://") and len(url) > 8
+        ):
+            return url
+        start = header.find("<http", start + 1)
+    return None
+
+
+class _UnsubscribeRun:
+    """Visits unsubscribe URLs for one process_unsubscribe_label run.
+
+    Labelled newsletters tend to share a few tracking hosts, so within a run
+    each (scheme, host) pair is checked with validate_unsafe_url (a DNS
+    lookup) only once, and a host that keeps failing hard (connection errors, 5xx) is given up
+    on after _HOST_FAILURE_LIMIT attempts. Safe to call from several threads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # (scheme, host) -> validation error, or None if it passed. These are
+        # the only parts of a URL that validate_unsafe_url looks at.
+        self._validated: dict[tuple[str, str | None], ValueError | None] = {}
+        self._failures: Counter[str] = Counter()
+
+    def _validate(self, url: str) -> None:
+        """Run validate_unsafe_url for the first URL seen per scheme and host."""
+        parsed = urlparse(url)
+        key = (parsed.scheme, parsed.hostname)
+        with self._lock:
+            known = key in self._validated
+            error = self._validated.get(key)
+        if not known:
+            try:
+                validate_unsafe_url(url)
+            except ValueError as e:
+                error = e
+            with self._lock:
+                self._validated[key] = error
+        if error is not None:
+            raise error
+
+    def _record_failure(self, host: str) -> None:
+        with self._lock:
+            self._failures[host] += 1
+
+    def visit(
+        self, unsubscribe_url: str, from_header: str | None, one_click: bool = False
+    ) -> bool:
+        """Validate and request an unsubscribe URL.
+
+        Args:
+            unsubscribe_url: HTTP(S) URL taken from a List-Unsubscribe header
+            from_header: Sender of the message, for logging
+            one_click: Whether the message has a List-Unsubscribe-Post header;
+                if so a one-click POST is tried before falling back to GET
+
+        Returns:
+            True if the server accepted the request
+        """
+        import requests
+
+        host = urlparse(unsubscribe_url).hostname or ""
+        with self._lock:
+            given_up = self._failures[host] >= _HOST_FAILURE_LIMIT
+        if given_up:
+            logger.warning(
+                "Skipping unsubscribe URL for %s: %s failed %d times",
+                from_header, host, _HOST_FAILURE_LIMIT,
+            )
+            return False
+
+        try:
+            # Validate URL for security
+            self._validate(unsubscribe_url)
+
+            if one_click:
+                try:
+                    status = _post_one_click(unsubscribe_url)
+                    if status in [200, 201, 202, 204]:
+                        logger.info(
+                            "One-click unsubscribed %s: HTTP %s", from_header, status
+                        )
+                        return True
+                except requests.RequestException as e:
+                    logger.debug(
+                        "One-click POST failed for %s, falling back to GET: %s",
+                        from_header, e,
+                    )
+
+            # Try GET request to unsubscribe URL
+            status = _get_unsubscribe(unsubscribe_url, self._validate)
+        except ValueError as e:
+            logger.warning("Failed to visit unsubscribe URL for %s: %s", from_header, e)
+            return False
+        except requests.RequestException as e:
+            logger.warning("Failed to visit unsubscribe URL for %s: %s", from_header, e)
+            self._record_failure(host)
+            return False
+        except Exception:
+            logger.exception(
+                "Unexpected error visiting unsubscribe URL for %s", from_header
+            )
+            return False
+
+        if status in [200, 201, 202, 204]:
+            logger.info(
+                "Successfully visited unsubscribe URL for %s: HTTP %s",
+                from_header, status,
+            )
+            return True
+        logger.warning("Unsubscribe URL returned HTTP %s for %s", status, from_header)
+        if status >= 500:
+            self._record_failure(host)
+        return False
+
+
+def _batch_get_unsubscribe_headers(service, message_ids: list[str]) -> dict[str, Any]:
+    """Fetch List-Unsubscribe(-Post)/From metadata using the Gmail Batch API.
+
+    Args:
+        service: Authenticated Gmail API service
+        message_ids: IDs of the messages to fetch
+
+    Returns:
+        Dict mapping message ID to the message resource, or to the exception
+        raised while fetching that message
+    """
+    results: dict[str, Any] = {}
+
+    def process_message(request_id, response, exception) -> None:
+        results[request_id] = exception if exception else response
+
+    messages_api = service.users().messages()
+    for i in range(0, len(message_ids), _BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=process_message)
+        for msg_id in message_ids[i : i + _BATCH_SIZE]:
+            batch.add(
+                messages_api.get(
+                    userId="me",
+                    id=msg_id,
+                    format="metadata",
+                    metadataHeaders=_METADATA_HEADERS,
+                    fields="payload/headers",
+                ),
+                request_id=msg_id,
+            )
+        batch.execute()
+
+    return results
+
+
+def _resolve_label_id(service, label_name: str, refresh: bool = False) -> str | None:
+    """Find a label's ID by name (case-insensitive) for the active account.
+
+    Args:
+        service: Authenticated Gmail API service
+        label_name: Name of the label
+        refresh: Ignore any cached ID and list the labels again
+
+    Returns:
+        The label ID, or None if the account has no such label
+    """
+    key = (state.active_account, label_name.lower())
+    if not refresh:
+        with _label_ids_lock:
+            if (label_id := _label_ids.get(key)) is not None:
+                return label_id
+
+    logger.info(f"Searching for label: {label_name}")
+    labels_result = service.users().labels().list(
+        userId="me", fields="labels(id,name)"
+    ).execute()
+
+    label_id = None
+    for label in labels_result.get("labels", []):
+        if label.get("name", "").lower() == key[1]:
+            label_id = label.get("id")
+            break
+
+    with _label_ids_lock:
+        if label_id:
+            _label_ids[key] = label_id
+        else:
+            _label_ids.pop(key, None)
+    return label_id
+
+
+def _list_label_message_ids(service, label_id: str) -> list[str]:
+    """List the IDs of every message with a label, following nextPageToken.
+
+    Each page token comes from the previous response, so pages are fetched
+    one after another; the field mask keeps each page down to the IDs.
+    """
+    messages_api = service.users().messages()
+    message_ids: list[str] = []
+    page_token = None
+    while True:
+        page = messages_api.list(
+            userId="me",
+            labelIds=[label_id],
+            maxResults=500,
+            pageToken=page_token,
+            fields="messages/id,nextPageToken",
+        ).execute()
+        message_ids.extend(msg["id"] for msg in page.get("messages", []))
+        page_token = page.get("nextPageToken")
+        if not page_token:
+            return message_ids
+
+
 def process_unsubscribe_label(label_name: str = "Unsubscribe") -> str:
     """Process all emails with a specific label and automatically unsubscribe.
 
@@ -113,146 +506,112 @@ def process_unsubscribe_label(label_name: str = "Unsubscribe") -> str:
 
     try:
         # Find the label ID by name
-        logger.info(f"Searching for label: {label_name}")
-        labels_result = service.users().labels().list(userId="me").execute()
-        labels = labels_result.get("labels", [])
-
-        label_id = None
-        for label in labels:
-            if label.get("name", "").lower() == label_name.lower():
-                label_id = label.get("id")
-                break
-
+        label_id = _resolve_label_id(service, label_name)
         if not label_id:
             return f"Error: Label '{label_name}' not found. Please create the label first."
 
         logger.info(f"Found label '{label_name}' with ID: {label_id}")
 
         # List all messages with this label
-        messages_result = service.users().messages().list(
-            userId="me",
-            labelIds=[label_id]
-        ).execute()
-
-        messages = messages_result.get("messages", [])
-
-        if not messages:
+        try:
+            message_ids = _list_label_message_ids(service, label_id)
+        except Exception:
+            # A cached ID goes stale when the label is deleted (and maybe
+            # recreated); look it up again once before giving up
+            fresh_label_id = _resolve_label_id(service, label_name, refresh=True)
+            if fresh_label_id == label_id:
+                raise
+            if not fresh_label_id:
+                return (
+                    f"Error: Label '{label_name}' not found. "
+                    "Please create the label first."
+                )
+            label_id = fresh_label_id
+            message_ids = _list_label_message_ids(service, label_id)
+
+        if not message_ids:
             return f"No emails found with label '{label_name}'."
 
-        logger.info(f"Found {len(messages)} message(s) with label '{label_name}'")
+        logger.info(f"Found {len(message_ids)} message(s) with label '{label_name}'")
 
-        processed_count = 0
         success_count = 0
         error_count = 0
 
-        # Process each message
-        for msg in messages:
-            msg_id = msg["id"]
-
-            try:
-                # Fetch message headers
-                message = service.users().messages().get(
-                    userId="me",
-                    id=msg_id,
-                    format="metadata",
-                    metadataHeaders=["List-Unsubscribe", "From"]
-                ).execute()
-
-                headers = message.get("payload", {}).get("headers", [])
-
-                # Extract List-Unsubscribe header
-                unsubscribe_header = None
-                from_header = None
-
-                for header in headers:
-                    if header.get("name", "").lower() == "list-unsubscribe":
-                        unsubscribe_header = header.get("value", "")
-                    if header.get("name", "").lower() == "from":
-                        from_header = header.get("value", "")
-
-                if not unsubscribe_header:
-                    logger.warning(f"No List-Unsubscribe header found in message {msg_id}")
-                    error_count += 1
-                    # Still remove the label even if no unsubscribe link
-                    service.users().messages().modify(
-                        userId="me",
-                        id=msg_id,
-                        body={"removeLabelIds": [label_id]}
-                    ).execute()
-                    continue
-
-                # Parse unsubscribe URL from header
-                # List-Unsubscribe format: <http://example.com/unsub>, <mailto:unsub@example.com>
-                url_match = re.search(r"<(https?://[^>]+)>", unsubscribe_header)
-
-                if not url_match:
-                    logger.warning(
-                        f"No HTTP unsubscribe URL found in message {msg_id} "
-                        f"(header: {unsubscribe_header})"
-                    )
-                    error_count += 1
-                    # Remove label
-                    service.users().messages().modify(
-                        userId="me",
-                        id=msg_id,
-                        body={"removeLabelIds": [label_id]}
-                    ).execute()
-                    continue
-
-                unsubscribe_url = url_match.group(1)
-                logger.info(f"Found unsubscribe URL for {from_header}: {unsubscribe_url}")
-
-                # Visit the unsubscribe link
-                try:
-                    # Validate URL for security
-                    validated_url = validate_unsafe_url(unsubscribe_url)
-
-                    # Try GET request to unsubscribe URL
-                    req = urllib.request.Request(
-                        validated_url,
-                        headers={
-                            "User-Agent": "Mozilla/5.0 (compatible; GmailUnsubscribe/1.0)"
-                        },
-                    )
-
-                    with urllib.request.urlopen(req, timeout=10) as response:  # nosec B310
-                        if response.status in [200, 201, 202, 204, 301, 302]:
-                            logger.info(
-                                f"Successfully visited unsubscribe URL for {from_header}: "
-                                f"HTTP {response.status}"
-                            )
-                            success_count += 1
-                        else:
-                            logger.warning(
-                                f"Unsubscribe URL returned HTTP {response.status} "
-                                f"for {from_header}"
-                            )
-                            error_count += 1
-
-                except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError, ValueError) as e:
-                    logger.warning(
-                        f"Failed to visit unsubscribe URL for {from_header}: {e}"
-                    )
-                    error_count += 1
-                except Exception as e:
-                    logger.error(
-                        f"Unexpected error visiting unsubscribe URL for {from_header}: {e}",
-                        exc_info=True
-                    )
-                    error_count += 1
-
-                # Remove the label from the message after processing
-                service.users().messages().modify(
-                    userId="me",
-                    id=msg_id,
-                    body={"removeLabelIds": [label_id]}
-                ).execute()
-
-                processed_count += 1
-
-            except Exception as e:
-                logger.error(f"Error processing message {msg_id}: {e}", exc_info=True)
+        # Read each message's headers; unsubscribe URLs are visited afterwards
+        # in parallel. Messages without a usable link only get the label removed.
+        header_results = _batch_get_unsubscribe_headers(service, message_ids)
+
+        # msg_id -> (unsubscribe URL, From header, supports one-click)
+        to_visit: dict[str, tuple[str, str | None, bool]] = {}
+        # Messages without a List-Unsubscribe header, and with one that has
+        # no HTTP(S) link (mailto-only); these only get the label removed
+        no_header_ids: list[str] = []
+        no_http_ids: list[str] = []
+        for msg_id in message_ids:
+            message = header_results.get(msg_id)
+            if message is None or isinstance(message, Exception):
+                logger.error(
+                    "Error processing message %s: %s",
+                    msg_id, message or "No response received from Gmail API",
+                )
                 error_count += 1
+                continue
+
+            headers = {}
+            for header in message.get("payload", {}).get("headers", []):
+                name = header.get("name", "")
+                headers[_HEADER_KEYS.get(name) or name.lower()] = header.get("value", "")
+
+            # Extract List-Unsubscribe header
+            unsubscribe_header = headers.get("list-unsubscribe")
+            from_header = headers.get("from")
+
+            if not unsubscribe_header:
+                logger.warning("No List-Unsubscribe header found in message %s", msg_id)
+                no_header_ids.append(msg_id)
+                continue
+
+            # Parse unsubscribe URL from header
+            # List-Unsubscribe format: <http://example.com/unsub>, <mailto:unsub@example.com>
+            unsubscribe_url = _extract_http_url(unsubscribe_header)
+
+            if not unsubscribe_url:
+                logger.warning(
+                    "No HTTP unsubscribe URL found in message %s (header: %s)",
+                    msg_id, unsubscribe_header,
+                )
+                no_http_ids.append(msg_id)
+                continue
+
+            logger.info("Found unsubscribe URL for %s: %s", from_header, unsubscribe_url)
+            one_click = headers.get("list-unsubscribe-post", "").strip() == (
+                _ONE_CLICK_BODY.decode()
+            )
+            to_visit[msg_id] = (unsubscribe_url, from_header, one_click)
+
+        # Visit the unsubscribe links concurrently (each call is blocked on a
+        # third-party server for up to the 10s timeout)
+        run = _UnsubscribeRun()
+        visited = list(
+            _unsubscribe_executor.map(lambda visit: run.visit(*visit), to_visit.values())
+        )
+        success_count += visited.count(True)
+        error_count += visited.count(False) + len(no_header_ids) + len(no_http_ids)
+
+        # Remove the label from every handled message (1000 per API call).
+        # Messages whose link was visited go first: those count as processed.
+        visited_ids = list(to_visit)
+        label_removal_ids = visited_ids + no_header_ids + no_http_ids
+        removed = 0
+        try:
+            for removed in batch_modify_messages(
+                service, label_removal_ids, remove_label_ids=[label_id]
+            ):
+                pass
+        except Exception:
+            logger.exception("Error removing label '%s'", label_name)
+            error_count += len(label_removal_ids) - removed
+        processed_count = min(removed, len(visited_ids))
 
         summary = (
             f"Processed {processed_count} email(s) with the '{label_name}' label. "
@@ -263,5 +622,5 @@ def process_unsubscribe_label(label_name: str = "Unsubscribe") -> str:
         return summary
 
     except Exception as e:
-        logger.error(f"Error processing unsubscribe label: {e}", exc_info=True)
-        return f"Error: {str(e)}"
+        logger.exception("Error processing unsubscribe label")
+        return f"Error: {e!s}"
@@ -0,0 +1,27 @@
+"""
+Gmail API Response Model
+------------------------
+googleapiclient model that parses API responses with orjson.
+"""
+
+import orjson
+from googleapiclient.model import JsonModel
+
+
+class OrjsonModel(JsonModel):
+    """JsonModel that decodes response bodies with orjson.
+
+    Threads fetched with format="full" are often hundreds of KB of JSON, and
+    orjson parses them several times faster than the stdlib json module.
+    Requests are still serialized by JsonModel.
+    """
+
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Not JSON: let JsonModel return the raw text
+            return super().deserialize(content)
+        if self._data_wrapper and isinstance(body, dict) and "data" in body:
+            body = body["data"]
+        return body
@@ -4,10 +4,22 @@ Create icon files for Gmail Cleaner app
 Generates .icns for macOS and .ico for Windows
 """
 
+import io
 import subprocess
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Optional: rasterize the SVG once in-process and resize with Pillow instead
+# of running qlmanage/sips for every icon size
+try:
+    import cairosvg
+    from PIL import Image
+except ImportError:
+    cairosvg = None
+
+MASTER_SIZE = 1024
+
 def create_png_from_svg(svg_path, png_path, size):
     """Convert SVG to PNG using sips (macOS built-in tool)"""
     # First convert to a temporary large PNG
@@ -37,6 +49,26 @@ def create_png_from_svg(svg_path, png_path, size):
     except:
         return False
 
+def render_master(svg_path):
+    """Rasterize the SVG once at MASTER_SIZE with CairoSVG, or None if unavailable"""
+    if cairosvg is None:
+        return None
+    try:
+        png_bytes = cairosvg.svg2png(
+            url=svg_path, output_width=MASTER_SIZE, output_height=MASTER_SIZE
+        )
+        return Image.open(io.BytesIO(png_bytes)).convert("RGBA")
+    except (OSError, ValueError, SyntaxError) as e:
+        # SyntaxError covers malformed SVG XML (xml.etree ParseError)
+        print(f"  CairoSVG failed ({e}), falling back to qlmanage/sips")
+        return None
+
+def resize_master(master, size, outputs):
+    """Resize the master image once and save it under every filename for that size"""
+    image = master.resize((size, size), Image.Resampling.LANCZOS)
+    for output in outputs:
+        image.save(output, format="PNG", optimize=True)
+
 def create_iconset():
     """Create macOS iconset and .icns file"""
     project_dir = Path(__file__).parent
@@ -61,20 +93,37 @@ def create_iconset():
     ]
 
     print("Creating PNG icons from SVG...")
-    for size, filename in sizes:
-        output = iconset_dir / filename
-        print(f"  Creating {filename} ({size}x{size})...")
-        create_png_from_svg(str(svg_path), str(output), size)
+    master = render_master(str(svg_path))
+    if master is not None:
+        # Several iconset entries share a size (e.g. 32x32 and 16x16@2x);
+        # resize each size once. Pillow releases the GIL while resizing and
+        # encoding PNGs, so threads run the sizes in parallel.
+        outputs_by_size = {}
+        for size, filename in sizes:
+            print(f"  Creating {filename} ({size}x{size})...")
+            outputs_by_size.setdefault(size, []).append(iconset_dir / filename)
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            list(executor.map(
+                lambda item: resize_master(master, *item), outputs_by_size.items()
+            ))
+    else:
+        for size, filename in sizes:
+            output = iconset_dir / filename
+            print(f"  Creating {filename} ({size}x{size})...")
+            create_png_from_svg(str(svg_path), str(output), size)
 
-    # Convert iconset to .icns using iconutil
+    # Convert iconset to .icns (Pillow writes it directly; otherwise iconutil)
     print("\nCreating .icns file...")
     icns_path = project_dir / "gmail-cleaner.icns"
     try:
-        subprocess.run([
-            "iconutil", "-c", "icns", str(iconset_dir), "-o", str(icns_path)
-        ], check=True)
+        if master is not None:
+            master.save(icns_path, format="ICNS")
+        else:
+            subprocess.run([
+                "iconutil", "-c", "icns", str(iconset_dir), "-o", str(icns_path)
+            ], check=True)
         print(f"✓ Created {icns_path}")
-    except Exception as e:
+    except (OSError, ValueError, subprocess.CalledProcessError) as e:
         print(f"✗ Failed to create .icns: {e}")
 
     # Create Windows .ico file (256x256 PNG should work)
@@ -82,7 +131,10 @@ def create_iconset():
     ico_path = project_dir / "gmail-cleaner.ico"
     png_256 = iconset_dir / "icon_256x256.png"
 
-    if png_256.exists():
+    if master is not None:
+        master.save(ico_path, format="ICO", sizes=[(16, 16), (32, 32), (48, 48), (256, 256)])
+        print(f"✓ Created {ico_path}")
+    elif png_256.exists():
         try:
             # Use sips to convert PNG to ico format
             subprocess.run([
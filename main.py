@@ -55,8 +55,9 @@ def main():
             1.0, lambda: webbrowser.open(f"http://localhost:{port}")
         ).start()
 
-    # Start FastAPI with Uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=port, log_level="warning")
+    # Start FastAPI with Uvicorn ("auto" runs on uvloop where it is installed;
+    # it is not available on Windows, which falls back to asyncio)
+    uvicorn.run(app, host="0.0.0.0", port=port, log_level="warning", loop="auto")
 
 
 if __name__ == "__main__":
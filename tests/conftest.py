@@ -2,18 +2,44 @@
 Pytest Configuration and Fixtures
 """
 
+import asyncio
 import os
 import pytest
 from fastapi.testclient import TestClient
 
 from app.main import create_app
+from app.services.auth import (
+    _credentials_path_cache,
+    _creds_cache,
+    _invalidate_accounts_cache,
+    _registry_cache,
+)
+
+
+async def _drain_background_work(app) -> None:
+    """Wait for queued jobs and in-flight sign-in tasks to finish."""
+    await app.state.job_queue.join()
+    await asyncio.gather(*app.state.oauth_tasks, return_exceptions=True)
 
 
 @pytest.fixture
 def client():
-    """FastAPI test client."""
+    """FastAPI test client (runs the app lifespan so the job queue is started)."""
     app = create_app()
-    return TestClient(app)
+    with TestClient(app) as test_client:
+        yield test_client
+        # Let background work finish before the app shuts down
+        test_client.portal.call(_drain_background_work, app)
+
+
+@pytest.fixture
+def wait_for_jobs(client):
+    """Return a callable that blocks until all background work has run."""
+
+    def wait():
+        client.portal.call(_drain_background_work, client.app)
+
+    return wait
 
 
 @pytest.fixture
@@ -54,3 +80,18 @@ def mock_gmail_auth(monkeypatch):
         return original_exists(path)
 
     monkeypatch.setattr("os.path.exists", mock_exists)
+
+
+@pytest.fixture(autouse=True)
+def reset_accounts_cache():
+    """Start every test with empty get_accounts(), registry and credentials caches."""
+
+    def reset():
+        _invalidate_accounts_cache()
+        _registry_cache["entry"] = None
+        _creds_cache.clear()
+        _credentials_path_cache["entry"] = None
+
+    reset()
+    yield
+    reset()
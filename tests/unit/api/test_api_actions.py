@@ -4,6 +4,8 @@ Tests for Actions API Endpoints
 Tests for POST action endpoints.
 """
 
+import asyncio
+import threading
 from unittest.mock import patch
 
 # client fixture is provided by conftest.py
@@ -15,14 +17,14 @@ class TestScanEndpoint:
     def test_scan_with_default_params(self, client):
         """POST /api/scan with default params should start scan."""
         response = client.post("/api/scan", json={})
-        assert response.status_code == 200
+        assert response.status_code == 202
         data = response.json()
         assert data["status"] == "started"
 
     def test_scan_with_custom_limit(self, client):
         """POST /api/scan with custom limit should accept it."""
         response = client.post("/api/scan", json={"limit": 100})
-        assert response.status_code == 200
+        assert response.status_code == 202
         data = response.json()
         assert data["status"] == "started"
 
@@ -39,7 +41,7 @@ class TestScanEndpoint:
                 },
             },
         )
-        assert response.status_code == 200
+        assert response.status_code == 202
         data = response.json()
         assert data["status"] == "started"
 
@@ -57,7 +59,7 @@ class TestScanEndpoint:
 class TestAuthEndpoints:
     """Tests for auth-related endpoints."""
 
-    @patch("app.api.actions.get_gmail_service")
+    @patch("app.services.get_gmail_service")
     def test_sign_in(self, mock_get_service, client):
         """POST /api/sign-in should trigger sign-in flow."""
         # Mock to prevent actual OAuth flow and browser opening
@@ -67,7 +69,18 @@ class TestAuthEndpoints:
         data = response.json()
         assert data["status"] == "signing_in"
 
-    @patch("app.api.actions.sign_out")
+    @patch("app.services.get_gmail_service")
+    def test_sign_in_bypasses_job_queue(self, mock_get_service, client, wait_for_jobs):
+        """Sign-in should run on the OAuth executor, not as a queued job."""
+        mock_get_service.return_value = (None, "Not authenticated")
+        with patch.object(client.app.state.job_queue, "submit") as mock_submit:
+            response = client.post("/api/accounts/add")
+            wait_for_jobs()
+        assert response.status_code == 200
+        mock_submit.assert_not_called()
+        mock_get_service.assert_called_once_with()
+
+    @patch("app.services.sign_out")
     def test_sign_out(self, mock_sign_out, client):
         """POST /api/sign-out should sign out user."""
         mock_sign_out.return_value = {"success": True}
@@ -79,7 +92,7 @@ class TestAuthEndpoints:
 class TestUnsubscribeEndpoint:
     """Tests for POST /api/unsubscribe endpoint."""
 
-    @patch("app.api.actions.unsubscribe_single")
+    @patch("app.services.unsubscribe_single")
     def test_unsubscribe_with_link(self, mock_unsubscribe, client):
         """POST /api/unsubscribe with link should process it."""
         mock_unsubscribe.return_value = {"success": True}
@@ -94,7 +107,7 @@ class TestUnsubscribeEndpoint:
 
     def test_unsubscribe_with_empty_params(self, client):
         """POST /api/unsubscribe with empty params should accept defaults."""
-        with patch("app.api.actions.unsubscribe_single") as mock:
+        with patch("app.services.unsubscribe_single") as mock:
             mock.return_value = {"success": False, "error": "No link provided"}
             response = client.post("/api/unsubscribe", json={})
             assert response.status_code == 200
@@ -106,14 +119,14 @@ class TestMarkReadEndpoint:
     def test_mark_read_with_default_params(self, client):
         """POST /api/mark-read with default params should start."""
         response = client.post("/api/mark-read", json={})
-        assert response.status_code == 200
+        assert response.status_code == 202
         data = response.json()
         assert data["status"] == "started"
 
     def test_mark_read_with_custom_count(self, client):
         """POST /api/mark-read with custom count should accept it."""
         response = client.post("/api/mark-read", json={"count": 500})
-        assert response.status_code == 200
+        assert response.status_code == 202
         data = response.json()
         assert data["status"] == "started"
 
@@ -123,7 +136,7 @@ class TestMarkReadEndpoint:
             "/api/mark-read",
             json={"count": 1000, "filters": {"category": "promotions"}},
         )
-        assert response.status_code == 200
+        assert response.status_code == 202
 
     def test_mark_read_exceeds_max_count(self, client):
         """POST /api/mark-read with count > 100000 should fail."""
@@ -137,7 +150,7 @@ class TestDeleteScanEndpoint:
     def test_delete_scan_with_default_params(self, client):
         """POST /api/delete-scan should start scan."""
         response = client.post("/api/delete-scan", json={})
-        assert response.status_code == 200
+        assert response.status_code == 202
         data = response.json()
         assert data["status"] == "started"
 
@@ -146,13 +159,13 @@ class TestDeleteScanEndpoint:
         response = client.post(
             "/api/delete-scan", json={"limit": 1000, "filters": {"older_than": "90d"}}
         )
-        assert response.status_code == 200
+        assert response.status_code == 202
 
 
 class TestDeleteEmailsEndpoint:
     """Tests for POST /api/delete-emails endpoint."""
 
-    @patch("app.api.actions.delete_emails_by_sender")
+    @patch("app.services.delete_emails_by_sender")
     def test_delete_emails_by_sender(self, mock_delete, client):
         """POST /api/delete-emails should delete by sender."""
         mock_delete.return_value = {"success": True, "deleted": 10}
@@ -166,38 +179,157 @@ class TestDeleteEmailsEndpoint:
 class TestDeleteBulkEndpoint:
     """Tests for POST /api/delete-emails-bulk endpoint."""
 
-    @patch("app.api.actions.delete_emails_bulk_background")
-    def test_delete_bulk_with_valid_senders(self, mock_delete, client):
+    @patch("app.services.delete_emails_bulk_background")
+    def test_delete_bulk_with_valid_senders(self, mock_delete, client, wait_for_jobs):
         """POST /api/delete-emails-bulk with valid senders should start background task."""
         senders = ["sender1@example.com", "sender2@example.com"]
         response = client.post("/api/delete-emails-bulk", json={"senders": senders})
-        assert response.status_code == 200
-        assert response.json() == {"status": "started"}
+        assert response.status_code == 202
+        assert response.json()["status"] == "started"
+        wait_for_jobs()
         mock_delete.assert_called_once_with(senders)
 
     def test_delete_bulk_large_senders_list(self, client):
         """POST /api/delete-emails-bulk with many senders should succeed (no limit)."""
         senders = [f"sender{i}@example.com" for i in range(500)]
         response = client.post("/api/delete-emails-bulk", json={"senders": senders})
-        assert response.status_code == 200
-        assert response.json() == {"status": "started"}
+        assert response.status_code == 202
+        assert response.json()["status"] == "started"
 
-    @patch("app.api.actions.delete_emails_bulk_background")
-    def test_delete_bulk_with_empty_list(self, mock_delete, client):
+    @patch("app.services.delete_emails_bulk_background")
+    def test_delete_bulk_with_empty_list(self, mock_delete, client, wait_for_jobs):
         """POST /api/delete-emails-bulk with empty list should start background task."""
         response = client.post("/api/delete-emails-bulk", json={"senders": []})
-        assert response.status_code == 200
-        assert response.json() == {"status": "started"}
+        assert response.status_code == 202
+        assert response.json()["status"] == "started"
+        wait_for_jobs()
         mock_delete.assert_called_once_with([])
 
 
+class TestJobQueue:
+    """Tests for background job dispatch."""
+
+    @patch("app.services.scan_emails")
+    def test_scan_runs_on_job_queue(self, mock_scan, client, wait_for_jobs):
+        """POST /api/scan should run scan_emails on the background job queue."""
+        response = client.post("/api/scan", json={"limit": 100})
+        assert response.status_code == 202
+        wait_for_jobs()
+        mock_scan.assert_called_once_with(100, None)
+
+    @patch("app.services.mark_important_background")
+    def test_mark_important_passes_keyword(self, mock_important, client, wait_for_jobs):
+        """POST /api/mark-important should pass `important` as a keyword argument."""
+        response = client.post(
+            "/api/mark-important",
+            json={"senders": ["a@example.com"], "important": False},
+        )
+        assert response.status_code == 202
+        wait_for_jobs()
+        mock_important.assert_called_once_with(["a@example.com"], important=False)
+
+    @patch("app.services.scan_emails")
+    def test_accepted_response_links_job(self, mock_scan, client, wait_for_jobs):
+        """Queued operations should return 202 with a Location for the job."""
+        response = client.post("/api/scan", json={})
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        assert response.headers["location"] == f"/api/jobs/{job_id}"
+
+        wait_for_jobs()
+        job = client.get(response.headers["location"]).json()
+        assert job["id"] == job_id
+        assert job["state"] == "done"
+
+    @patch("app.services.scan_emails")
+    def test_failed_job_reports_error(self, mock_scan, client, wait_for_jobs):
+        """A job that raises should be reported as failed with its error."""
+        mock_scan.side_effect = RuntimeError("boom")
+        response = client.post("/api/scan", json={})
+        wait_for_jobs()
+        job = client.get(f"/api/jobs/{response.json()['job_id']}").json()
+        assert job["state"] == "failed"
+        assert job["error"] == "boom"
+
+    def test_duplicate_scan_returns_running_job(self, client):
+        """An identical scan while one is in flight should not start another."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_scan(limit, filters):
+            started.set()
+            release.wait(5)
+
+        with patch("app.services.scan_emails", side_effect=slow_scan) as mock_scan:
+            first = client.post("/api/scan", json={"limit": 50})
+            assert started.wait(5)
+            second = client.post("/api/scan", json={"limit": 50})
+            other = client.post("/api/scan", json={"limit": 60})
+            release.set()
+            client.portal.call(client.app.state.job_queue.join)
+
+        assert first.status_code == 202
+        assert second.status_code == 200
+        assert second.json() == {
+            "status": "already_running",
+            "job_id": first.json()["job_id"],
+        }
+        assert other.status_code == 202
+        assert mock_scan.call_count == 2
+
+    def test_unknown_job_returns_404(self, client):
+        """GET /api/jobs/{id} for an unknown job should return 404."""
+        response = client.get("/api/jobs/does-not-exist")
+        assert response.status_code == 404
+
+    @patch("app.services.scan_emails")
+    def test_full_queue_returns_503(self, mock_scan, client):
+        """Requests should be rejected with 503 when the job queue is full."""
+        with patch.object(
+            client.app.state.job_queue, "submit", side_effect=asyncio.QueueFull
+        ):
+            response = client.post("/api/scan", json={})
+        assert response.status_code == 503
+        mock_scan.assert_not_called()
+
+
+class TestAccountsEndpoint:
+    """Tests for GET /api/accounts."""
+
+    @patch("app.services.get_accounts")
+    def test_returns_accounts_with_etag(self, mock_accounts, client):
+        """Response should carry the accounts and an ETag."""
+        mock_accounts.return_value = [{"email": "a@example.com", "active": True}]
+        response = client.get("/api/accounts")
+        assert response.status_code == 200
+        assert response.json() == {
+            "accounts": [{"email": "a@example.com", "active": True}]
+        }
+        assert response.headers["etag"]
+
+    @patch("app.services.get_accounts")
+    def test_matching_etag_returns_304(self, mock_accounts, client):
+        """A matching If-None-Match should get an empty 304."""
+        mock_accounts.return_value = [{"email": "a@example.com", "active": True}]
+        etag = client.get("/api/accounts").headers["etag"]
+
+        response = client.get("/api/accounts", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+        mock_accounts.return_value = []
+        response = client.get("/api/accounts", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+
 class TestRequestValidation:
     """Tests for request validation across endpoints."""
 
     def test_scan_missing_body(self, client):
         """POST /api/scan without body should use defaults."""
         response = client.post("/api/scan", json={})
-        assert response.status_code == 200
+        assert response.status_code == 202
 
     def test_invalid_json(self, client):
         """POST with invalid JSON should return 422."""
@@ -215,7 +347,103 @@ class TestRequestValidation:
         )
         assert response.status_code == 422
 
+    def test_unknown_filter_rejected(self, client):
+        """Misspelled filter keys should fail validation instead of being ignored."""
+        response = client.post("/api/scan", json={"filters": {"older": "30d"}})
+        assert response.status_code == 422
+
     def test_invalid_older_than_format(self, client):
         """Invalid older_than format should fail validation."""
         response = client.post("/api/scan", json={"filters": {"older_than": "30days"}})
         assert response.status_code == 422
+
+    @patch("app.services.delete_emails_by_sender")
+    def test_delete_emails_blank_sender(self, mock_delete, client):
+        """Blank sender should be rejected before reaching the service."""
+        response = client.post("/api/delete-emails", json={"sender": "   "})
+        assert response.status_code == 422
+        mock_delete.assert_not_called()
+
+    @patch("app.services.delete_label")
+    def test_delete_label_blank_id(self, mock_delete_label, client):
+        """Whitespace-only label ID should be rejected."""
+        response = client.delete("/api/labels/%20")
+        assert response.status_code == 422
+        mock_delete_label.assert_not_called()
+
+    def test_apply_label_blank_label_id(self, client):
+        """Blank label_id should fail validation."""
+        response = client.post(
+            "/api/apply-label", json={"label_id": " ", "senders": ["a@example.com"]}
+        )
+        assert response.status_code == 422
+
+    def test_remove_label_empty_senders(self, client):
+        """Empty sender list should fail validation."""
+        response = client.post(
+            "/api/remove-label", json={"label_id": "Label_1", "senders": []}
+        )
+        assert response.status_code == 422
+
+    def test_archive_empty_senders(self, client):
+        """Empty sender list should fail validation."""
+        response = client.post("/api/archive", json={"senders": []})
+        assert response.status_code == 422
+
+    def test_mark_important_missing_senders(self, client):
+        """Missing sender list should fail validation."""
+        response = client.post("/api/mark-important", json={"important": True})
+        assert response.status_code == 422
+
+
+class TestExportEndpoints:
+    """Tests for thread export endpoints."""
+
+    @patch("app.api.actions.start_export_threads_by_ids")
+    def test_export_selected_streams_chunks(self, mock_export, client):
+        """POST /api/export-selected should stream the export as a text attachment."""
+        mock_export.return_value = (iter(["Header\n", "Thread 1\n", "Footer"]), None)
+        response = client.post("/api/export-selected", json={"thread_ids": ["t1"]})
+        assert response.status_code == 200
+        assert response.text == "Header\nThread 1\nFooter"
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "attachment" in response.headers["content-disposition"]
+        mock_export.assert_called_once_with(thread_ids=["t1"])
+
+    @patch("app.api.actions.start_export_threads_by_ids")
+    def test_export_selected_gzip_encoded(self, mock_export, client):
+        """Large exports should be gzip-compressed when the client accepts it."""
+        body = ["Thread line\n"] * 500
+        mock_export.return_value = (iter(body), None)
+        response = client.post(
+            "/api/export-selected",
+            json={"thread_ids": ["t1"]},
+            headers={"Accept-Encoding": "gzip"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.text == "".join(body)
+
+    @patch("app.api.actions.start_export_threads_by_ids")
+    def test_export_selected_error_status_when_not_started(self, mock_export, client):
+        """An export that cannot start should fail instead of returning the error text."""
+        mock_export.return_value = (None, "Authentication error: Not signed in")
+        response = client.post("/api/export-selected", json={"thread_ids": ["t1"]})
+        assert response.status_code == 500
+        assert response.json()["detail"] == "Authentication error: Not signed in"
+
+    @patch("app.api.actions.start_export_threads_by_query")
+    def test_export_threads_error_status_when_not_started(self, mock_export, client):
+        """Search failures should be reported with an error status."""
+        mock_export.return_value = (None, "Error during export: quota exceeded")
+        response = client.post(
+            "/api/export-threads", json={"query": "from:x", "max_threads": 5}
+        )
+        assert response.status_code == 500
+        assert "quota exceeded" in response.json()["detail"]
+        mock_export.assert_called_once_with(query="from:x", max_threads=5)
+
+    def test_export_selected_requires_thread_ids(self, client):
+        """POST /api/export-selected with no thread IDs should fail validation."""
+        response = client.post("/api/export-selected", json={"thread_ids": []})
+        assert response.status_code == 422
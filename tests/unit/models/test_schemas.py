@@ -123,6 +123,23 @@ class TestFiltersModel:
         assert filters.category == "promotions"
 
 
+    def test_as_dict_excludes_none(self):
+        """as_dict should contain only the filters that were set."""
+        filters = FiltersModel(older_than="30d", category="Social")
+        assert filters.as_dict == {"older_than": "30d", "category": "social"}
+
+    def test_as_dict_is_cached(self):
+        """as_dict should be built once per instance."""
+        filters = FiltersModel(older_than="30d")
+        assert filters.as_dict is filters.as_dict
+
+    def test_filters_are_immutable(self):
+        """Filters should be frozen so the cached dict cannot go stale."""
+        filters = FiltersModel(older_than="30d")
+        with pytest.raises(ValidationError):
+            filters.older_than = "7d"
+
+
 class TestScanRequest:
     """Tests for ScanRequest model."""
 
@@ -130,7 +147,14 @@ class TestScanRequest:
         """Default values should be set correctly."""
         request = ScanRequest()
         assert request.limit == 500
-        assert request.filters is None
+        assert request.filters == FiltersModel()
+        assert request.filters_payload is None
+
+    def test_null_filters_use_default(self):
+        """Explicit null filters should fall back to empty filters."""
+        request = ScanRequest.model_validate({"filters": None})
+        assert request.filters == FiltersModel()
+        assert request.filters_payload is None
 
     def test_valid_limit_range(self):
         """Limit within valid range should pass."""
@@ -163,6 +187,18 @@ class TestScanRequest:
         request = ScanRequest(limit=100, filters=filters)
         assert request.limit == 100
         assert request.filters.older_than == "30d"
+        assert request.filters_payload == {"older_than": "30d"}
+
+    def test_unknown_field_rejected(self):
+        """Unknown fields should fail validation."""
+        with pytest.raises(ValidationError):
+            ScanRequest(limit=100, limt=200)
+
+    def test_request_is_frozen(self):
+        """Request models should be immutable once parsed."""
+        request = ScanRequest()
+        with pytest.raises(ValidationError):
+            request.limit = 10
 
 
 class TestMarkReadRequest:
@@ -172,7 +208,8 @@ class TestMarkReadRequest:
         """Default values should be set correctly."""
         request = MarkReadRequest()
         assert request.count == 100
-        assert request.filters is None
+        assert request.filters == FiltersModel()
+        assert request.filters_payload is None
 
     def test_count_maximum(self):
         """Maximum count should be 100000."""
@@ -211,6 +248,13 @@ class TestDeleteBulkRequest:
         request = DeleteBulkRequest(senders=senders)
         assert len(request.senders) == 1000
 
+    def test_duplicate_senders_removed(self):
+        """Repeated senders should be collapsed, keeping first-seen order."""
+        request = DeleteBulkRequest(
+            senders=["b@example.com", "a@example.com", "B@example.com"]
+        )
+        assert request.senders == ["b@example.com", "a@example.com"]
+
 
 class TestUnsubscribeRequest:
     """Tests for UnsubscribeRequest model."""
@@ -233,10 +277,20 @@ class TestUnsubscribeRequest:
 class TestDeleteEmailsRequest:
     """Tests for DeleteEmailsRequest model."""
 
-    def test_default_values(self):
-        """Default sender should be empty string."""
-        request = DeleteEmailsRequest()
-        assert request.sender == ""
+    def test_sender_required(self):
+        """Sender is required."""
+        with pytest.raises(ValidationError):
+            DeleteEmailsRequest()
+
+    def test_blank_sender_rejected(self):
+        """Whitespace-only sender should be rejected."""
+        with pytest.raises(ValidationError):
+            DeleteEmailsRequest(sender="   ")
+
+    def test_sender_whitespace_stripped(self):
+        """Surrounding whitespace should be stripped."""
+        request = DeleteEmailsRequest(sender="  newsletter@example.com ")
+        assert request.sender == "newsletter@example.com"
 
     def test_with_sender(self):
         """Should accept sender email."""
@@ -0,0 +1,17 @@
+"""
+Auth Test Fixtures
+"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cwd(request, tmp_path, monkeypatch):
+    """Run each test in an empty directory so token and registry files
+    written by one test are never seen by another.
+
+    Tests using the app client stay in the project root, which the app
+    needs for its static and template directories.
+    """
+    if "client" not in request.fixturenames:
+        monkeypatch.chdir(tmp_path)
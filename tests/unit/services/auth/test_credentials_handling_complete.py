@@ -346,3 +346,30 @@ class TestCredentialsTypeMismatch:
         # Should work with desktop credentials in local mode
         assert service is None
         assert "Sign-in started" in error
+
+
+class TestCredentialsPathCache:
+    """Tests for skipping re-validation of an unchanged credentials file"""
+
+    @patch("app.services.auth.settings")
+    def test_unchanged_file_validated_once(self, mock_settings, tmp_path):
+        """A second lookup should not re-read an unchanged credentials file."""
+        (tmp_path / "client_secret.json").write_text('{"installed": {}}')
+        mock_settings.credentials_file = "client_secret.json"
+
+        assert auth._get_credentials_path() == "client_secret.json"
+        with patch("builtins.open") as mock_file:
+            assert auth._get_credentials_path() == "client_secret.json"
+        mock_file.assert_not_called()
+
+    @patch("app.services.auth.settings")
+    def test_changed_file_revalidated(self, mock_settings, tmp_path):
+        """A credentials file that changed to invalid JSON should be rejected."""
+        path = tmp_path / "client_secret.json"
+        path.write_text('{"installed": {}}')
+        mock_settings.credentials_file = "client_secret.json"
+        auth._get_credentials_path()
+
+        path.write_text("not json at all")
+
+        assert auth._get_credentials_path() is None
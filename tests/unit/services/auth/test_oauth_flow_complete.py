@@ -4,6 +4,8 @@ Tests for Complete OAuth Flow Scenarios
 Tests for successful OAuth flows and edge cases not covered in existing tests.
 """
 
+from __future__ import annotations
+
 from unittest.mock import Mock, patch, mock_open
 
 
@@ -336,3 +338,57 @@ class TestOAuthFlowErrors:
         # Note: This tests the structure, actual reset happens in background thread
         assert service is None
         assert error is not None
+
+
+class TestOAuthCallbackHandler:
+    """Tests for the OAuth callback HTTP handler"""
+
+    @staticmethod
+    def _callback(query: str, expected_state: str | None = "xyz"):
+        """Serve one callback request and return (status, recorded results)."""
+        import threading
+        import urllib.error
+        import urllib.request
+        from functools import partial
+        from http.server import HTTPServer
+
+        from app.core.state import AppState
+        from app.services.auth_handlers import OAuthCallbackHandler
+
+        # Private state, so OAuth threads left over from other tests can't clear it
+        app_state = AppState()
+        app_state.oauth_state["state"] = expected_state
+        event = threading.Event()
+        result: list = []
+        server = HTTPServer(
+            ("localhost", 0), partial(OAuthCallbackHandler, event, result)
+        )
+        thread = threading.Thread(target=server.handle_request)
+        thread.start()
+        try:
+            url = f"http://localhost:{server.server_address[1]}/?{query}"
+            with patch("app.services.auth_handlers.state", app_state):
+                try:
+                    status = urllib.request.urlopen(url).status
+                except urllib.error.HTTPError as e:
+                    status = e.code
+        finally:
+            thread.join()
+            server.server_close()
+        return status, result, event.is_set()
+
+    def test_code_recorded_and_event_set(self):
+        """A valid callback should record the code and wake the flow."""
+        status, result, is_set = self._callback("code=abc&state=xyz")
+
+        assert status == 200
+        assert result == [("abc", None)]
+        assert is_set
+
+    def test_state_mismatch_recorded_as_error(self):
+        """A callback with the wrong state should record an error."""
+        status, result, is_set = self._callback("code=abc&state=other")
+
+        assert status == 403
+        assert result == [(None, "OAuth state mismatch - possible CSRF attack")]
+        assert is_set
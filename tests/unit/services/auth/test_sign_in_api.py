@@ -4,16 +4,16 @@ Tests for Sign-In API Endpoints
 Tests for sign-in/sign-out API endpoints and authentication state management.
 """
 
+from typing import ClassVar
 from unittest.mock import Mock, patch
 
-
 from app.core import state
 
 
 class TestSignInAPIEndpoint:
     """Tests for POST /api/sign-in endpoint"""
 
-    @patch("app.api.actions.get_gmail_service")
+    @patch("app.services.get_gmail_service")
     def test_sign_in_endpoint_triggers_oauth(self, mock_get_service, client):
         """POST /api/sign-in should trigger OAuth flow in background."""
         # Mock to return "signing in" message
@@ -30,7 +30,7 @@ class TestSignInAPIEndpoint:
         # Verify get_gmail_service was called (in background task)
         # Note: Background task execution is async, so we verify the endpoint response
 
-    @patch("app.api.actions.get_gmail_service")
+    @patch("app.services.get_gmail_service")
     def test_sign_in_endpoint_non_blocking(self, mock_get_service, client):
         """POST /api/sign-in should not block the request."""
         mock_get_service.return_value = (
@@ -44,7 +44,7 @@ class TestSignInAPIEndpoint:
         assert response.status_code == 200
         assert response.json()["status"] == "signing_in"
 
-    @patch("app.api.actions.get_gmail_service")
+    @patch("app.services.get_gmail_service")
     def test_sign_in_when_already_in_progress(self, mock_get_service, client):
         """POST /api/sign-in when auth already in progress should return immediately."""
         mock_get_service.return_value = (
@@ -61,7 +61,7 @@ class TestSignInAPIEndpoint:
 class TestSignOutAPIEndpoint:
     """Tests for POST /api/sign-out endpoint"""
 
-    @patch("app.api.actions.sign_out")
+    @patch("app.services.sign_out")
     def test_sign_out_endpoint_success(self, mock_sign_out, client):
         """POST /api/sign-out should sign out successfully."""
         mock_sign_out.return_value = {
@@ -79,7 +79,7 @@ class TestSignOutAPIEndpoint:
         assert data["results_cleared"] is True
         mock_sign_out.assert_called_once()
 
-    @patch("app.api.actions.sign_out")
+    @patch("app.services.sign_out")
     def test_sign_out_endpoint_error_handling(self, mock_sign_out, client):
         """POST /api/sign-out should handle errors gracefully."""
         # Simulate sign_out raising an exception
@@ -93,7 +93,7 @@ class TestSignOutAPIEndpoint:
         assert "Failed to sign out" in data["detail"]
         mock_sign_out.assert_called_once()
 
-    @patch("app.api.actions.sign_out")
+    @patch("app.services.sign_out")
     def test_sign_out_when_not_logged_in(self, mock_sign_out, client):
         """POST /api/sign-out when not logged in should still succeed."""
         mock_sign_out.return_value = {
@@ -111,7 +111,7 @@ class TestSignOutAPIEndpoint:
 class TestAuthStatusAPIEndpoint:
     """Tests for GET /api/auth-status endpoint"""
 
-    @patch("app.api.status.check_login_status")
+    @patch("app.services.check_login_status")
     def test_auth_status_when_logged_in(self, mock_check_status, client):
         """GET /api/auth-status when logged in should return user info."""
         mock_check_status.return_value = {
@@ -127,7 +127,7 @@ class TestAuthStatusAPIEndpoint:
         assert data["email"] == "test@example.com"
         mock_check_status.assert_called_once()
 
-    @patch("app.api.status.check_login_status")
+    @patch("app.services.check_login_status")
     def test_auth_status_when_logged_out(self, mock_check_status, client):
         """GET /api/auth-status when logged out should return logged_out state."""
         mock_check_status.return_value = {
@@ -142,7 +142,7 @@ class TestAuthStatusAPIEndpoint:
         assert data["logged_in"] is False
         assert data["email"] is None
 
-    @patch("app.api.status.check_login_status")
+    @patch("app.services.check_login_status")
     def test_auth_status_updates_state(self, mock_check_status, client):
         """GET /api/auth-status should update current_user state."""
         # Reset state
@@ -163,7 +163,7 @@ class TestAuthStatusAPIEndpoint:
 class TestWebAuthStatusAPIEndpoint:
     """Tests for GET /api/web-auth-status endpoint"""
 
-    @patch("app.api.status.get_web_auth_status")
+    @patch("app.services.get_web_auth_status")
     def test_web_auth_status_with_credentials(self, mock_get_status, client):
         """GET /api/web-auth-status with credentials should return status."""
         mock_get_status.return_value = {
@@ -181,7 +181,7 @@ class TestWebAuthStatusAPIEndpoint:
         assert data["web_auth_mode"] is True
         assert data["needs_setup"] is False
 
-    @patch("app.api.status.get_web_auth_status")
+    @patch("app.services.get_web_auth_status")
     def test_web_auth_status_without_credentials(self, mock_get_status, client):
         """GET /api/web-auth-status without credentials should indicate setup needed."""
         mock_get_status.return_value = {
@@ -198,7 +198,7 @@ class TestWebAuthStatusAPIEndpoint:
         assert data["has_credentials"] is False
         assert data["needs_setup"] is True
 
-    @patch("app.api.status.get_web_auth_status")
+    @patch("app.services.get_web_auth_status")
     def test_web_auth_status_with_pending_url(self, mock_get_status, client):
         """GET /api/web-auth-status with pending auth URL should return it."""
         mock_get_status.return_value = {
@@ -214,7 +214,7 @@ class TestWebAuthStatusAPIEndpoint:
         data = response.json()
         assert data["pending_auth_url"] == "https://oauth.example.com/auth"
 
-    @patch("app.api.status.get_web_auth_status")
+    @patch("app.services.get_web_auth_status")
     def test_web_auth_status_web_auth_mode_missing_credentials(
         self, mock_get_status, client
     ):
@@ -309,3 +309,267 @@ class TestAuthenticationStatePersistence:
         # Should detect expired token and return logged out
         assert result["logged_in"] is False
         assert result["email"] is None
+
+
+class TestAccountsCache:
+    """Tests for the short-lived get_accounts() cache."""
+
+    @patch("app.services.auth._load_accounts_registry")
+    def test_repeat_calls_reuse_cached_accounts(self, mock_load):
+        """Back-to-back calls should read the registry once."""
+        from app.services.auth import get_accounts
+
+        mock_load.return_value = (
+            [{"email": "a@example.com", "token_file": "token_a.json"}],
+            "a@example.com",
+        )
+
+        assert get_accounts() == [{"email": "a@example.com", "active": True}]
+        assert get_accounts() == [{"email": "a@example.com", "active": True}]
+        assert mock_load.call_count == 1
+
+    @patch("app.services.auth._load_accounts_registry")
+    def test_registry_save_invalidates_cache(self, mock_load):
+        """Saving the registry should make the next call re-read it."""
+        from app.services.auth import _save_accounts_registry, get_accounts
+
+        mock_load.return_value = ([], None)
+        assert get_accounts() == []
+
+        mock_load.return_value = (
+            [{"email": "b@example.com", "token_file": "token_b.json"}],
+            "b@example.com",
+        )
+        _save_accounts_registry(mock_load.return_value[0], "b@example.com")
+
+        assert get_accounts() == [{"email": "b@example.com", "active": True}]
+        assert mock_load.call_count == 2
+
+
+    @patch("app.services.auth._load_accounts_registry")
+    def test_list_built_during_registry_write_not_cached(self, mock_load):
+        """A registry write that races a get_accounts() call must not be masked."""
+        from app.services.auth import _invalidate_accounts_cache, get_accounts
+
+        def load_then_switch():
+            # Another request switches accounts while this one is reading
+            _invalidate_accounts_cache()
+            return (
+                [{"email": "a@example.com", "token_file": "token_a.json"}],
+                "a@example.com",
+            )
+
+        mock_load.side_effect = load_then_switch
+
+        get_accounts()
+        get_accounts()
+
+        assert mock_load.call_count == 2
+
+
+class TestAccountsRegistryCache:
+    """Tests for the mtime-keyed accounts.json cache."""
+
+    @staticmethod
+    def _write_registry(tmp_path, emails):
+        from app.services.auth import _save_accounts_registry
+
+        accounts = []
+        for email in emails:
+            token_file = f"token_{email}.json"
+            (tmp_path / token_file).write_text('{"token": "x"}')
+            accounts.append({"email": email, "token_file": token_file})
+        _save_accounts_registry(accounts, emails[0])
+
+    def test_unchanged_registry_is_not_reparsed(self, tmp_path, monkeypatch):
+        """Repeat loads of an unchanged file should reuse the parsed data."""
+        from app.services import auth
+
+        monkeypatch.chdir(tmp_path)
+        self._write_registry(tmp_path, ["a@example.com"])
+
+        with patch("app.services.auth.orjson.loads", wraps=auth.orjson.loads) as loads:
+            first = auth._load_accounts_registry()
+            second = auth._load_accounts_registry()
+
+        assert first == second == (
+            [{"email": "a@example.com", "token_file": "token_a@example.com.json"}],
+            "a@example.com",
+        )
+        assert loads.call_count == 1
+
+    def test_saved_registry_is_reloaded(self, tmp_path, monkeypatch):
+        """Writing the registry should make the next load see the new accounts."""
+        from app.services import auth
+
+        monkeypatch.chdir(tmp_path)
+        self._write_registry(tmp_path, ["a@example.com"])
+        auth._load_accounts_registry()
+
+        self._write_registry(tmp_path, ["b@example.com", "a@example.com"])
+        accounts, active = auth._load_accounts_registry()
+
+        assert [a["email"] for a in accounts] == ["b@example.com", "a@example.com"]
+        assert active == "b@example.com"
+
+    def test_missing_token_file_filtered_despite_cache(self, tmp_path, monkeypatch):
+        """Accounts whose token file was deleted should drop out on the next load."""
+        from app.services import auth
+
+        monkeypatch.chdir(tmp_path)
+        self._write_registry(tmp_path, ["a@example.com", "b@example.com"])
+        auth._load_accounts_registry()
+
+        (tmp_path / "token_b@example.com.json").unlink()
+        accounts, _ = auth._load_accounts_registry()
+
+        assert [a["email"] for a in accounts] == ["a@example.com"]
+
+
+class TestSyncStateCoalescing:
+    """Tests for the single-flight _sync_state()."""
+
+    @patch("app.services.auth._load_accounts_registry")
+    def test_concurrent_syncs_read_registry_once(self, mock_load):
+        """Threads syncing at the same time should share one registry read."""
+        import threading
+
+        from app.services.auth import _sync_state
+
+        mock_load.return_value = (
+            [{"email": "a@example.com", "token_file": "token_a.json"}],
+            "a@example.com",
+        )
+        threads = [threading.Thread(target=_sync_state) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert mock_load.call_count == 1
+        assert state.active_account == "a@example.com"
+
+    @patch("app.services.auth._load_accounts_registry")
+    def test_registry_save_forces_resync(self, mock_load):
+        """A registry write should be visible to the very next sync."""
+        from app.services.auth import _save_accounts_registry, _sync_state
+
+        mock_load.return_value = ([], None)
+        _sync_state()
+
+        mock_load.return_value = (
+            [{"email": "b@example.com", "token_file": "token_b.json"}],
+            "b@example.com",
+        )
+        _save_accounts_registry(mock_load.return_value[0], "b@example.com")
+        _sync_state()
+
+        assert mock_load.call_count == 2
+        assert state.active_account == "b@example.com"
+
+
+class TestLoadAccountsRegistry:
+    """Tests for filtering registry entries by token file."""
+
+    def test_accounts_without_usable_token_skipped(self, tmp_path):
+        """Entries with no, missing or empty token files should be dropped."""
+        from app.services.auth import _load_accounts_registry, _save_accounts_registry
+
+        (tmp_path / "token_ok.json").write_text('{"token": "x"}')
+        (tmp_path / "token_empty.json").write_text("")
+        _save_accounts_registry(
+            [
+                {"email": "ok@example.com", "token_file": "token_ok.json"},
+                {"email": "empty@example.com", "token_file": "token_empty.json"},
+                {"email": "missing@example.com", "token_file": "token_missing.json"},
+                {"email": "none@example.com"},
+            ],
+            "ok@example.com",
+        )
+
+        accounts, active = _load_accounts_registry()
+
+        assert [a["email"] for a in accounts] == ["ok@example.com"]
+        assert active == "ok@example.com"
+
+    def test_token_file_outside_working_directory(self, tmp_path):
+        """Token files given with a directory should still be checked."""
+        from app.services.auth import _load_accounts_registry, _save_accounts_registry
+
+        (tmp_path / "tokens").mkdir()
+        (tmp_path / "tokens" / "token_a.json").write_text('{"token": "x"}')
+        _save_accounts_registry(
+            [{"email": "a@example.com", "token_file": "tokens/token_a.json"}],
+            "a@example.com",
+        )
+
+        accounts, _ = _load_accounts_registry()
+
+        assert [a["email"] for a in accounts] == ["a@example.com"]
+
+
+class TestSaveAccountsRegistry:
+    """Tests for writing accounts.json."""
+
+    def test_identical_save_skips_write(self, tmp_path):
+        """Saving the same registry again should not rewrite the file."""
+        from app.services.auth import _save_accounts_registry
+
+        accounts = [{"email": "a@example.com", "token_file": "token_a.json"}]
+        _save_accounts_registry(accounts, "a@example.com")
+        with patch("app.services.auth.os.replace") as mock_replace:
+            _save_accounts_registry(accounts, "a@example.com")
+
+        mock_replace.assert_not_called()
+
+    def test_changed_save_replaces_file(self, tmp_path):
+        """A different registry should replace the file and leave no temp files."""
+        import json
+
+        from app.services.auth import _save_accounts_registry
+
+        accounts = [{"email": "a@example.com", "token_file": "token_a.json"}]
+        _save_accounts_registry(accounts, "a@example.com")
+        _save_accounts_registry(accounts, None)
+
+        assert json.loads((tmp_path / "accounts.json").read_text())["active"] is None
+        assert [p.name for p in tmp_path.iterdir()] == ["accounts.json"]
+
+
+class TestAccountMutations:
+    """Tests for switching and removing accounts without re-reading the registry."""
+
+    ACCOUNTS: ClassVar[list[dict]] = [
+        {"email": "a@example.com", "token_file": "token_a.json"},
+        {"email": "b@example.com", "token_file": "token_b.json"},
+    ]
+
+    @patch("app.services.auth._save_accounts_registry")
+    @patch("app.services.auth._load_accounts_registry")
+    def test_switch_account_reads_registry_once(self, mock_load, mock_save):
+        """switch_account should update state in memory after saving."""
+        from app.services.auth import switch_account
+
+        mock_load.return_value = (list(self.ACCOUNTS), "a@example.com")
+
+        result = switch_account("b@example.com")
+
+        assert result == {"success": True, "active": "b@example.com"}
+        assert state.active_account == "b@example.com"
+        assert state.current_user == {"email": "b@example.com", "logged_in": True}
+        mock_save.assert_called_once_with(self.ACCOUNTS, "b@example.com")
+        assert mock_load.call_count == 1
+
+    @patch("app.services.auth._save_accounts_registry")
+    @patch("app.services.auth._load_accounts_registry")
+    def test_remove_account_reads_registry_once(self, mock_load, mock_save):
+        """remove_account should drop the account from state without a re-sync."""
+        from app.services.auth import remove_account
+
+        mock_load.return_value = (list(self.ACCOUNTS), "a@example.com")
+
+        result = remove_account("a@example.com")
+
+        assert result == {"success": True, "active": "b@example.com"}
+        assert [a["email"] for a in state.accounts] == ["b@example.com"]
+        assert mock_load.call_count == 1
@@ -417,3 +417,144 @@ class TestTokenSecurity:
         result = auth.needs_auth_setup()
 
         assert result is True
+
+
+class TestIsFileEmpty:
+    """Tests for the stat-based _is_file_empty helper"""
+
+    def test_zero_byte_file_is_empty(self, tmp_path):
+        """A zero-byte file should be reported as empty."""
+        path = tmp_path / "token.json"
+        path.write_text("")
+
+        assert auth._is_file_empty(str(path)) is True
+
+    def test_file_with_content_is_not_empty(self, tmp_path):
+        """A file with content should not be reported as empty."""
+        path = tmp_path / "token.json"
+        path.write_text('{"token": "x"}')
+
+        assert auth._is_file_empty(str(path)) is False
+
+    def test_missing_file_is_not_empty(self, tmp_path):
+        """A missing file should not be reported as empty."""
+        assert auth._is_file_empty(str(tmp_path / "missing.json")) is False
+
+
+class TestCredentialsCache:
+    """Tests for reusing parsed credentials while the token file is unchanged"""
+
+    @patch("app.services.auth.Credentials")
+    def test_unchanged_token_file_parsed_once(self, mock_creds_class, tmp_path):
+        """Repeat loads of the same token file should reuse the Credentials object."""
+        token_file = tmp_path / "token_a.json"
+        token_file.write_text('{"token": "a"}')
+
+        first = auth._load_credentials(str(token_file))
+        second = auth._load_credentials(str(token_file))
+
+        assert first is second
+        assert mock_creds_class.from_authorized_user_file.call_count == 1
+
+    @patch("app.services.auth.Credentials")
+    def test_rewritten_token_file_reparsed(self, mock_creds_class, tmp_path):
+        """A token file whose contents changed should be parsed again."""
+        token_file = tmp_path / "token_a.json"
+        token_file.write_text('{"token": "a"}')
+        auth._load_credentials(str(token_file))
+
+        token_file.write_text('{"token": "refreshed"}')
+        auth._load_credentials(str(token_file))
+
+        assert mock_creds_class.from_authorized_user_file.call_count == 2
+
+
+class TestServiceCache:
+    """Tests for reusing built Gmail services"""
+
+    @staticmethod
+    def _sign_in(tmp_path):
+        (tmp_path / "token_a.json").write_text('{"token": "a"}')
+        auth._save_accounts_registry(
+            [{"email": "a@example.com", "token_file": "token_a.json"}], "a@example.com"
+        )
+
+    @patch("app.services.auth.build")
+    @patch("app.services.auth.Credentials")
+    def test_service_reused_for_same_credentials(
+        self, mock_creds_class, mock_build, tmp_path
+    ):
+        """Repeat calls with unchanged credentials should build the service once."""
+        self._sign_in(tmp_path)
+        mock_creds_class.from_authorized_user_file.return_value = Mock(valid=True)
+
+        first, _ = auth.get_gmail_service()
+        second, _ = auth.get_gmail_service()
+
+        assert first is second
+        assert mock_build.call_count == 1
+
+    @patch("app.services.auth.build")
+    @patch("app.services.auth.Credentials")
+    def test_service_rebuilt_for_new_credentials(
+        self, mock_creds_class, mock_build, tmp_path
+    ):
+        """A rewritten token file should yield a freshly built service."""
+        self._sign_in(tmp_path)
+        mock_creds_class.from_authorized_user_file.side_effect = [
+            Mock(valid=True),
+            Mock(valid=True),
+        ]
+        auth.get_gmail_service()
+
+        (tmp_path / "token_a.json").write_text('{"token": "refreshed"}')
+        auth.get_gmail_service()
+
+        assert mock_build.call_count == 2
+
+
+class TestLoginStatusCache:
+    """Tests for short-circuiting repeat check_login_status calls"""
+
+    @staticmethod
+    def _sign_in(tmp_path, email="a@example.com"):
+        token_file = f"token_{email}.json"
+        (tmp_path / token_file).write_text('{"token": "a"}')
+        auth._save_accounts_registry([{"email": email, "token_file": token_file}], email)
+
+    @patch("app.services.auth._load_credentials")
+    def test_recent_validation_reused(self, mock_load_creds, tmp_path):
+        """A second check right after a successful one should skip credential checks."""
+        self._sign_in(tmp_path)
+        mock_load_creds.return_value = Mock(valid=True)
+
+        assert auth.check_login_status() == {"email": "a@example.com", "logged_in": True}
+        assert auth.check_login_status() == {"email": "a@example.com", "logged_in": True}
+        assert mock_load_creds.call_count == 1
+
+    @patch("app.services.auth._load_credentials")
+    def test_registry_change_revalidates(self, mock_load_creds, tmp_path):
+        """Switching accounts should not reuse the previous account's status."""
+        self._sign_in(tmp_path)
+        mock_load_creds.return_value = Mock(valid=True)
+        auth.check_login_status()
+
+        self._sign_in(tmp_path, "b@example.com")
+        assert auth.check_login_status()["email"] == "b@example.com"
+        assert mock_load_creds.call_count == 2
+
+
+class TestRefreshUpdatesCredentialsCache:
+    """Tests for keeping refreshed credentials cached"""
+
+    @patch("app.services.auth.Request")
+    @patch("app.services.auth.Credentials")
+    def test_refreshed_token_not_reparsed(self, mock_creds_class, mock_request, tmp_path):
+        """The next load after a refresh should reuse the refreshed object."""
+        token_file = str(tmp_path / "token_a.json")
+        creds = Mock()
+        creds.to_json.return_value = '{"token": "refreshed"}'
+
+        assert auth._try_refresh_creds(creds, token_file) is creds
+        assert auth._load_credentials(token_file) is creds
+        mock_creds_class.from_authorized_user_file.assert_not_called()
@@ -0,0 +1,354 @@
+"""
+Tests for Gmail Thread Export
+-----------------------------
+Tests for thread search/export using the Gmail Batch API.
+"""
+
+import io
+import threading
+from typing import ClassVar
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.services.gmail import export
+
+
+@pytest.fixture(autouse=True)
+def no_credentials():
+    """Fetch in the test thread unless a test passes credentials itself."""
+    with patch.object(export, "get_gmail_credentials", return_value=None):
+        yield
+
+
+class FakeBatch:
+    """Minimal stand-in for googleapiclient's BatchHttpRequest."""
+
+    def __init__(self, threads: dict, callback):
+        self.threads = threads
+        self.callback = callback
+        self.request_ids: list[str] = []
+        self.http = None
+        self.thread_name = None
+
+    def add(self, request, request_id=None):
+        self.request_ids.append(request_id)
+
+    def execute(self, http=None):
+        self.http = http
+        self.thread_name = threading.current_thread().name
+        for request_id in self.request_ids:
+            thread = self.threads.get(request_id)
+            if thread is None:
+                self.callback(request_id, None, Exception("Not Found"))
+            else:
+                self.callback(request_id, thread, None)
+
+
+def make_service(threads: dict) -> Mock:
+    """Build a mock Gmail service that serves threads through FakeBatch."""
+    service = Mock()
+    service.batches = []
+
+    def new_batch_http_request(callback=None):
+        batch = FakeBatch(threads, callback)
+        service.batches.append(batch)
+        return batch
+
+    service.new_batch_http_request.side_effect = new_batch_http_request
+    return service
+
+
+def make_thread(thread_id: str, subject: str) -> dict:
+    """Build a thread resource with a single plain-text message."""
+    return {
+        "id": thread_id,
+        "messages": [
+            {
+                "snippet": f"snippet {thread_id}",
+                "payload": {
+                    "headers": [
+                        {"name": "From", "value": "sender@example.com"},
+                        {"name": "Subject", "value": subject},
+                        {"name": "Date", "value": "Mon, 1 Jan 2024 10:00:00 +0000"},
+                    ],
+                    "body": {"data": "SGVsbG8gd29ybGQ"},
+                },
+            }
+        ],
+    }
+
+
+class TestDecodeBase64url:
+    """Tests for _decode_base64url."""
+
+    def test_decodes_unpadded_urlsafe_data(self):
+        """Gmail strips padding and uses the URL-safe alphabet."""
+        assert export._decode_base64url("SGVsbG8gd29ybGQ") == "Hello world"
+        assert export._decode_base64url("Pz8_") == "???"
+
+    def test_invalid_data_returns_empty_string(self):
+        """Undecodable data should not raise."""
+        assert export._decode_base64url("!") == ""
+        assert export._decode_base64url("") == ""
+
+
+class TestHeaderMap:
+    """Tests for _header_map."""
+
+    def test_names_lowercased_and_first_occurrence_wins(self):
+        """Lookups should match _extract_header for repeated headers."""
+        headers = [
+            {"name": "Received", "value": "first"},
+            {"name": "SUBJECT", "value": "Hi"},
+            {"name": "received", "value": "second"},
+        ]
+
+        header_map = export._header_map(headers)
+
+        assert header_map["subject"] == "Hi"
+        assert header_map["received"] == export._extract_header(headers, "Received")
+
+
+class TestExtractBody:
+    """Tests for _extract_body."""
+
+    PLAIN: ClassVar[dict] = {"mimeType": "text/plain", "body": {"data": "SGVsbG8gd29ybGQ"}}
+    HTML: ClassVar[dict] = {"mimeType": "text/html", "body": {"data": "PGI-SGk8L2I-"}}
+
+    def test_prefers_nested_plain_text_over_html(self):
+        """Plain text anywhere in the tree should win over an earlier HTML part."""
+        payload = {
+            "mimeType": "multipart/mixed",
+            "parts": [
+                self.HTML,
+                {"mimeType": "multipart/alternative", "parts": [self.PLAIN]},
+            ],
+        }
+
+        with patch.object(
+            export, "_decode_base64url", wraps=export._decode_base64url
+        ) as decode:
+            assert export._extract_body(payload) == "Hello world"
+
+        decode.assert_called_once_with(self.PLAIN["body"]["data"])
+
+    def test_falls_back_to_html(self):
+        """HTML should be used when there is no plain text part."""
+        payload = {"mimeType": "multipart/alternative", "parts": [self.HTML]}
+
+        assert export._extract_body(payload) == "<b>Hi</b>"
+
+    def test_single_part_body(self):
+        """Body data on the payload itself should be returned directly."""
+        assert export._extract_body(self.PLAIN) == "Hello world"
+
+
+class TestBatchGetThreads:
+    """Tests for _batch_get_threads helper."""
+
+    def test_chunks_requests_into_batches_of_100(self):
+        """250 threads should be fetched with 3 batch HTTP calls."""
+        ids = [f"t{i}" for i in range(250)]
+        service = make_service({tid: make_thread(tid, tid) for tid in ids})
+
+        results = export._batch_get_threads(service, ids, format="full")
+
+        assert [len(b.request_ids) for b in service.batches] == [100, 100, 50]
+        assert set(results) == set(ids)
+
+    def test_duplicate_ids_fetched_once(self):
+        """Duplicate thread IDs should not be added to a batch twice."""
+        service = make_service({"a": make_thread("a", "A")})
+
+        export._batch_get_threads(service, ["a", "a"], format="full")
+
+        assert service.batches[0].request_ids == ["a"]
+
+    def test_errors_recorded_per_thread(self):
+        """A failed thread should map to its exception."""
+        service = make_service({"a": make_thread("a", "A")})
+
+        results = export._batch_get_threads(service, ["a", "missing"])
+
+        assert results["a"]["id"] == "a"
+        assert isinstance(results["missing"], Exception)
+
+    def test_batches_run_on_fetch_pool_with_own_http(self):
+        """Batches should execute on fetch threads over a per-thread connection."""
+        ids = [f"t{i}" for i in range(150)]
+        service = make_service({tid: make_thread(tid, tid) for tid in ids})
+        credentials = Mock()
+
+        export._batch_get_threads(service, ids, credentials=credentials, format="full")
+
+        for batch in service.batches:
+            assert batch.thread_name.startswith("gmail-fetch")
+            assert batch.http.credentials is credentials
+
+    def test_without_credentials_batches_run_inline(self):
+        """Without credentials, batches should be fetched in the caller."""
+        service = make_service({"a": make_thread("a", "A")})
+
+        results = export._batch_get_threads(service, ["a"])
+
+        assert results["a"]["id"] == "a"
+        assert service.batches[0].thread_name == threading.current_thread().name
+
+
+class TestFetchExecutor:
+    """Tests for the lazily created fetch pool."""
+
+    def test_pool_created_on_first_use_and_shut_down(self):
+        """The pool should not exist until needed, and shutdown should clear it."""
+        export.shutdown_fetch_executor()
+        assert export._fetch_executor is None
+
+        executor = export._get_fetch_executor()
+        assert export._get_fetch_executor() is executor
+
+        export.shutdown_fetch_executor()
+        assert export._fetch_executor is None
+        assert executor._shutdown
+
+
+class TestExportThreadsByIds:
+    """Tests for export_threads_by_ids."""
+
+    @patch("app.services.gmail.export.get_gmail_service")
+    def test_export_preserves_requested_order(self, mock_get_service):
+        """Threads should be rendered in the order they were requested."""
+        service = make_service(
+            {"a": make_thread("a", "First"), "b": make_thread("b", "Second")}
+        )
+        mock_get_service.return_value = (service, None)
+
+        content = export.export_threads_by_ids(["b", "a"])
+
+        assert content.index("Subject: Second") < content.index("Subject: First")
+        assert "Hello world" in content
+
+    @patch("app.services.gmail.export.get_gmail_service")
+    def test_export_reports_failed_threads(self, mock_get_service):
+        """A thread that fails to fetch should be reported inline."""
+        service = make_service({"a": make_thread("a", "First")})
+        mock_get_service.return_value = (service, None)
+
+        content = export.export_threads_by_ids(["a", "missing"])
+
+        assert "Subject: First" in content
+        assert "Error fetching thread missing" in content
+
+    @patch("app.services.gmail.export.get_gmail_service")
+    def test_export_streams_to_file(self, mock_get_service):
+        """With `out`, the export should be written as UTF-8 and not returned."""
+        service = make_service({"a": make_thread("a", "Caf\u00e9")})
+        mock_get_service.return_value = (service, None)
+        out = io.BytesIO()
+
+        summary = export.export_threads_by_ids(["a"], out=out)
+
+        written = out.getvalue()
+        assert written.decode("utf-8") == export.export_threads_by_ids(["a"])
+        assert "Subject: Caf\u00e9".encode("utf-8") in written
+        assert str(len(written)) in summary
+
+
+class TestStartExport:
+    """Tests for the start_export_threads_by_* functions."""
+
+    @patch("app.services.gmail.export.get_gmail_service")
+    def test_auth_error_returned_before_streaming(self, mock_get_service):
+        """Sign-in failures should come back as an error, not as export text."""
+        mock_get_service.return_value = (None, "Not signed in")
+
+        chunks, error = export.start_export_threads_by_ids(["a"])
+
+        assert chunks is None
+        assert error == "Authentication error: Not signed in"
+
+    @patch("app.services.gmail.export.get_gmail_service")
+    def test_first_batch_failure_returned_as_error(self, mock_get_service):
+        """A failed first batch should be reported before any text is produced."""
+        service = make_service({})
+        service.new_batch_http_request.side_effect = None
+        service.new_batch_http_request.return_value.execute.side_effect = (
+            RuntimeError("batch failed")
+        )
+        mock_get_service.return_value = (service, None)
+
+        chunks, error = export.start_export_threads_by_ids(["a"])
+
+        assert chunks is None
+        assert error == "Error during export: batch failed"
+
+    @patch("app.services.gmail.export.get_gmail_service")
+    def test_first_batch_fetched_before_returning(self, mock_get_service):
+        """The first batch should already be fetched when chunks are returned."""
+        service = make_service({"a": make_thread("a", "First")})
+        mock_get_service.return_value = (service, None)
+
+        chunks, error = export.start_export_threads_by_ids(["a"])
+
+        assert error is None
+        assert service.batches[0].request_ids == ["a"]
+        assert service.batches[0].thread_name is not None
+        assert "Subject: First" in "".join(chunks)
+
+
+class TestSearchThreadPreviews:
+    """Tests for search_thread_previews."""
+
+    @patch("app.services.gmail.export.get_gmail_service")
+    def test_previews_use_latest_message(self, mock_get_service):
+        """Previews should be built from batched metadata responses."""
+        service = make_service({"a": make_thread("a", "Hello")})
+        service.users().threads().list().execute.return_value = {
+            "threads": [{"id": "a"}]
+        }
+        mock_get_service.return_value = (service, None)
+
+        result = export.search_thread_previews("from:example.com", max_results=10)
+
+        assert result["success"] is True
+        assert result["threads"][0]["subject"] == "Hello"
+        assert result["threads"][0]["snippet"] == "snippet a"
+
+    @patch("app.services.gmail.export.get_gmail_service")
+    def test_previews_request_only_displayed_headers(self, mock_get_service):
+        """Thread gets should ask for From/Subject/Date metadata and no bodies."""
+        service = make_service({"a": make_thread("a", "Hello")})
+        service.users().threads().list().execute.return_value = {
+            "threads": [{"id": "a"}]
+        }
+        mock_get_service.return_value = (service, None)
+
+        export.search_thread_previews("from:example.com", max_results=10)
+
+        service.users().threads().get.assert_called_with(
+            userId="me",
+            id="a",
+            format="metadata",
+            metadataHeaders=["From", "Subject", "Date"],
+            fields="id,messages(snippet,payload/headers)",
+        )
+
+    @patch("app.services.gmail.export.get_gmail_service")
+    def test_previews_cover_every_page(self, mock_get_service):
+        """Each listed page should be fetched, and list responses projected."""
+        service = make_service(
+            {"a": make_thread("a", "First"), "b": make_thread("b", "Second")}
+        )
+        service.users().threads().list().execute.side_effect = [
+            {"threads": [{"id": "a"}], "nextPageToken": "page2"},
+            {"threads": [{"id": "b"}]},
+        ]
+        mock_get_service.return_value = (service, None)
+
+        result = export.search_thread_previews("label:inbox", max_results=10)
+
+        assert [t["subject"] for t in result["threads"]] == ["First", "Second"]
+        assert len(service.batches) == 2
+        _, kwargs = service.users().threads().list.call_args
+        assert kwargs["pageToken"] == "page2"
+        assert kwargs["fields"] == "threads(id),nextPageToken"
@@ -1,11 +1,19 @@
 """
 Tests for Gmail Service Functions
 ---------------------------------
-Tests for query building and email parsing helpers.
+Tests for query building, message listing and email parsing helpers.
 """
 
+from unittest.mock import Mock, patch
+
+from app.core import state
 from app.services.gmail import (
+    archive_emails_background,
+    batch_list_message_ids,
+    batch_modify_messages,
     build_gmail_query,
+    delete_emails_bulk_background,
+    modify_messages,
     _get_unsubscribe_from_headers,
     _get_sender_info,
     _get_subject,
@@ -218,3 +226,253 @@ class TestGetSubject:
             {"name": "Subject", "value": "🎉 Special Offer! 50% Off 🎁"},
         ]
         assert _get_subject(headers) == "🎉 Special Offer! 50% Off 🎁"
+
+
+class FakeListBatch:
+    """Batch stand-in that answers messages.list calls from a page table."""
+
+    def __init__(self, pages: dict, callback):
+        self.pages = pages
+        self.callback = callback
+        self.requests: list[tuple[str, tuple]] = []
+
+    def add(self, request, request_id=None):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, key in self.requests:
+            page = self.pages.get(key)
+            if isinstance(page, list):
+                page = page.pop(0)
+            if page is None:
+                self.callback(request_id, None, Exception("Bad query"))
+            elif isinstance(page, Exception):
+                self.callback(request_id, None, page)
+            else:
+                self.callback(request_id, page, None)
+
+
+def make_list_service(pages: dict) -> Mock:
+    """Mock service whose messages.list returns (q, pageToken) as the request.
+
+    A page may be an exception (returned as the item's error) or a list of
+    pages/exceptions served one per request.
+    """
+    service = Mock()
+    service.batches = []
+
+    def new_batch_http_request(callback=None):
+        batch = FakeListBatch(pages, callback)
+        service.batches.append(batch)
+        return batch
+
+    service.new_batch_http_request.side_effect = new_batch_http_request
+    service.users().messages().list.side_effect = (
+        lambda userId, q, maxResults, pageToken, fields: (q, pageToken)
+    )
+    return service
+
+
+class TestBatchListMessageIds:
+    """Tests for batch_list_message_ids function."""
+
+    def test_lists_queries_in_one_batch(self):
+        """First pages for all queries should share a single batch call."""
+        service = make_list_service(
+            {
+                ("from:a", None): {"messages": [{"id": "1"}, {"id": "2"}]},
+                ("from:b", None): {"messages": [{"id": "3"}]},
+            }
+        )
+        result = batch_list_message_ids(service, ["from:a", "from:b"])
+        assert result == {"from:a": ["1", "2"], "from:b": ["3"]}
+        assert len(service.batches) == 1
+
+    def test_follows_page_tokens(self):
+        """Queries with more pages should be listed again in a later round."""
+        service = make_list_service(
+            {
+                ("from:a", None): {"messages": [{"id": "1"}], "nextPageToken": "p2"},
+                ("from:a", "p2"): {"messages": [{"id": "2"}]},
+                ("from:b", None): {},
+            }
+        )
+        result = batch_list_message_ids(service, ["from:a", "from:b"])
+        assert result == {"from:a": ["1", "2"], "from:b": []}
+        assert [len(b.requests) for b in service.batches] == [2, 1]
+
+    def test_chunks_and_records_errors(self):
+        """Queries beyond batch_size go to another call; failures map to errors."""
+        service = make_list_service({("from:a", None): {}, ("from:b", None): {}})
+        result = batch_list_message_ids(
+            service, ["from:a", "from:b", "from:bad"], batch_size=2
+        )
+        assert [len(b.requests) for b in service.batches] == [2, 1]
+        assert isinstance(result["from:bad"], Exception)
+
+    def test_reports_finished_queries_after_each_batch(self):
+        """on_progress should count queries whose listing is complete."""
+        service = make_list_service(
+            {
+                ("from:a", None): {"messages": [{"id": "1"}], "nextPageToken": "p2"},
+                ("from:a", "p2"): {},
+                ("from:b", None): {},
+                ("from:c", None): {},
+            }
+        )
+        progress = []
+
+        batch_list_message_ids(
+            service, ["from:a", "from:b", "from:c"], batch_size=2,
+            on_progress=progress.append,
+        )
+
+        assert progress == [1, 2, 3]
+
+    def test_requests_only_ids(self):
+        """List pages should be trimmed to message IDs and the next page token."""
+        service = make_list_service({("from:a", None): {}})
+        batch_list_message_ids(service, ["from:a"])
+        _, kwargs = service.users().messages().list.call_args
+        assert kwargs["fields"] == "messages/id,nextPageToken"
+
+    def test_default_batch_size_is_50(self):
+        """Large sender sets should be split into batches of 50 list calls."""
+        queries = [f"from:{i}" for i in range(120)]
+        service = make_list_service({(q, None): {} for q in queries})
+        batch_list_message_ids(service, queries)
+        assert [len(b.requests) for b in service.batches] == [50, 50, 20]
+
+    @patch("app.services.gmail.helpers.time.sleep")
+    def test_rate_limited_pages_retried_with_backoff(self, mock_sleep):
+        """429 and 403 rateLimitExceeded items should be retried, not failed."""
+        too_many = Exception("Too Many Requests")
+        too_many.resp = Mock(status=429)
+        rate_limited = Exception("Rate Limit Exceeded")
+        rate_limited.resp = Mock(status=403)
+        rate_limited.error_details = [{"reason": "rateLimitExceeded"}]
+        service = make_list_service(
+            {
+                ("from:a", None): [too_many, rate_limited, {"messages": [{"id": "1"}]}],
+                ("from:b", None): {"messages": [{"id": "2"}]},
+            }
+        )
+
+        result = batch_list_message_ids(service, ["from:a", "from:b"])
+
+        assert result == {"from:a": ["1"], "from:b": ["2"]}
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [1.0, 2.0]
+
+    @patch("app.services.gmail.helpers.time.sleep")
+    def test_other_403_not_retried(self, mock_sleep):
+        """Permission errors should be recorded without retrying."""
+        forbidden = Exception("Forbidden")
+        forbidden.resp = Mock(status=403)
+        forbidden.error_details = [{"reason": "forbidden"}]
+        service = make_list_service({("from:a", None): forbidden})
+
+        result = batch_list_message_ids(service, ["from:a"])
+
+        assert result["from:a"] is forbidden
+        mock_sleep.assert_not_called()
+
+
+class TestBatchModifyMessages:
+    """Tests for batch_modify_messages function."""
+
+    def test_chunks_ids_by_gmail_limit(self):
+        """IDs should be sent in batchModify calls of up to 1000."""
+        service = Mock()
+        ids = [str(i) for i in range(2500)]
+
+        progress = list(
+            batch_modify_messages(service, ids, remove_label_ids=["INBOX"])
+        )
+
+        assert progress == [1000, 2000, 2500]
+        bodies = [
+            c.kwargs["body"]
+            for c in service.users().messages().batchModify.call_args_list
+        ]
+        assert [len(b["ids"]) for b in bodies] == [1000, 1000, 500]
+        assert all(b["removeLabelIds"] == ["INBOX"] for b in bodies)
+        assert all("addLabelIds" not in b for b in bodies)
+
+
+    def test_modify_messages_returns_count(self):
+        """The non-generator form should make the same calls and return the total."""
+        service = Mock()
+        ids = [str(i) for i in range(1500)]
+
+        assert modify_messages(service, ids, add_label_ids=["TRASH"]) == 1500
+
+        bodies = [
+            c.kwargs["body"]
+            for c in service.users().messages().batchModify.call_args_list
+        ]
+        assert [len(b["ids"]) for b in bodies] == [1000, 500]
+        assert all(b["addLabelIds"] == ["TRASH"] for b in bodies)
+
+
+class TestArchiveEmailsBackground:
+    """Tests for archive_emails_background."""
+
+    @patch("app.services.gmail.archive.get_gmail_service")
+    def test_archives_all_senders_in_one_modify(self, mock_get_service):
+        """Emails from every sender should be archived with one batchModify."""
+        service = make_list_service(
+            {
+                ("from:a@example.com in:inbox", None): {"messages": [{"id": "1"}]},
+                ("from:example.com in:inbox", None): {
+                    "messages": [{"id": "1"}, {"id": "2"}]
+                },
+            }
+        )
+        mock_get_service.return_value = (service, None)
+
+        archive_emails_background(["a@example.com", "example.com"])
+
+        batch_modify = service.users().messages().batchModify
+        batch_modify.assert_called_once_with(
+            userId="me", body={"removeLabelIds": ["INBOX"], "ids": ["1", "2"]}
+        )
+        assert state.archive_status["done"] is True
+        assert state.archive_status["archived_count"] == 2
+
+    @patch("app.services.gmail.archive.get_gmail_service")
+    def test_failed_sender_does_not_stop_others(self, mock_get_service):
+        """A sender whose listing fails should be reported, not abort the job."""
+        service = make_list_service(
+            {("from:a@example.com in:inbox", None): {"messages": [{"id": "1"}]}}
+        )
+        mock_get_service.return_value = (service, None)
+
+        archive_emails_background(["a@example.com", "bad.example"])
+
+        service.users().messages().batchModify.assert_called_once_with(
+            userId="me", body={"removeLabelIds": ["INBOX"], "ids": ["1"]}
+        )
+        assert state.archive_status["archived_count"] == 1
+        assert state.archive_status["error"].startswith("Some errors: bad.example:")
+
+
+class TestDeleteEmailsBulkBackground:
+    """Tests for delete_emails_bulk_background."""
+
+    @patch("app.services.gmail.delete.get_gmail_service")
+    def test_overlapping_senders_counted_once(self, mock_get_service):
+        """An email matched by an address and its domain should be trashed once."""
+        service = make_list_service(
+            {
+                ("from:a@example.com", None): {"messages": [{"id": "1"}]},
+                ("from:example.com", None): {"messages": [{"id": "1"}, {"id": "2"}]},
+            }
+        )
+        mock_get_service.return_value = (service, None)
+
+        delete_emails_bulk_background(["a@example.com", "example.com"])
+
+        service.users().messages().batchModify.assert_called_once_with(
+            userId="me", body={"addLabelIds": ["TRASH"], "ids": ["1", "2"]}
+        )
+        assert state.delete_bulk_status["deleted_count"] == 2
@@ -0,0 +1,432 @@
+"""
+Tests for Gmail Unsubscribe Operations
+--------------------------------------
+Tests for one-click/GET unsubscribe requests.
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from app.services.gmail import unsubscribe
+
+
+def _response(status_code, headers=None, chunks=()):
+    """Fake streamed response with the given status, headers and body chunks."""
+    response = Mock(status_code=status_code, headers=headers or {})
+    response.iter_content.return_value = iter(chunks)
+    return response
+
+
+@pytest.fixture
+def mock_session():
+    """Replace the shared HTTP session and skip DNS-based URL validation."""
+    with patch.object(unsubscribe, "_session") as session, patch.object(
+        unsubscribe, "validate_unsafe_url", side_effect=lambda url: url
+    ):
+        yield session
+
+
+@pytest.fixture(autouse=True)
+def clear_label_ids():
+    """Start every test without cached label IDs."""
+    unsubscribe._label_ids.clear()
+    yield
+    unsubscribe._label_ids.clear()
+
+
+class TestExtractHttpUrl:
+    """Tests for _extract_http_url."""
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            ("<https://example.com/u?id=1>", "https://example.com/u?id=1"),
+            ("<mailto:u@example.com>, <http://example.com/u>", "http://example.com/u"),
+            ("<mailto:u@example.com>", None),
+            ("<https://>", None),
+            ("<http<https://example.com/u>", "https://example.com/u"),
+            ("<https://example.com/u", None),
+        ],
+    )
+    def test_matches_first_http_url(self, header, expected):
+        """Should behave like re.search(r"<(https?://[^>]+)>", header)."""
+        assert unsubscribe._extract_http_url(header) == expected
+
+
+class TestUnsubscribeSingle:
+    """Tests for unsubscribe_single."""
+
+    def test_one_click_post_success(self, mock_session):
+        """A 2xx answer to the one-click POST should not fall back to GET."""
+        mock_session.post.return_value = _response(status_code=200)
+
+        result = unsubscribe.unsubscribe_single("example.com", "https://example.com/u")
+
+        assert result["success"] is True
+        assert result["message"] == "Unsubscribed successfully"
+        _, kwargs = mock_session.post.call_args
+        assert kwargs["data"] == b"List-Unsubscribe=One-Click"
+        assert kwargs["allow_redirects"] is False
+        mock_session.get.assert_not_called()
+
+    def test_falls_back_to_get_when_post_fails(self, mock_session):
+        """A failed POST should be retried as a GET without automatic redirects."""
+        mock_session.post.side_effect = requests.ConnectionError("refused")
+        mock_session.get.return_value = _response(status_code=200)
+
+        result = unsubscribe.unsubscribe_single("example.com", "https://example.com/u")
+
+        assert result["success"] is True
+        mock_session.get.assert_called_once_with(
+            "https://example.com/u", timeout=10, allow_redirects=False, stream=True
+        )
+
+    def test_redirects_followed_and_validated(self, mock_session):
+        """A tracking redirect should be validated and followed to the endpoint."""
+        mock_session.get.side_effect = [
+            _response(status_code=302, headers={"Location": "https://real.example/unsub"}),
+            _response(status_code=200),
+        ]
+
+        result = unsubscribe.unsubscribe_single(
+            "example.com", "https://track.example/c", one_click=False
+        )
+
+        assert result["success"] is True
+        assert mock_session.get.call_args.args == ("https://real.example/unsub",)
+        unsubscribe.validate_unsafe_url.assert_called_with("https://real.example/unsub")
+
+    def test_unfollowed_redirect_is_not_success(self, mock_session):
+        """A redirect that never reaches a 2xx should not count as unsubscribed."""
+        mock_session.get.return_value = _response(
+            status_code=302, headers={"Location": "/again"}
+        )
+
+        result = unsubscribe.unsubscribe_single(
+            "example.com", "https://example.com/u", one_click=False
+        )
+
+        assert result == {"success": False, "message": "Server returned status 302"}
+        assert mock_session.get.call_count == unsubscribe._MAX_REDIRECTS + 1
+
+    def test_redirect_to_blocked_host_not_requested(self, mock_session):
+        """A redirect target that fails validation should not be requested."""
+        mock_session.get.return_value = _response(
+            status_code=302, headers={"Location": "http://10.0.0.1/"}
+        )
+        unsubscribe.validate_unsafe_url.side_effect = [
+            "https://example.com/u",
+            ValueError("private IP"),
+        ]
+
+        result = unsubscribe.unsubscribe_single(
+            "example.com", "https://example.com/u", one_click=False
+        )
+
+        assert result == {"success": False, "message": "Security Error: private IP"}
+        mock_session.get.assert_called_once()
+
+    def test_small_bodies_drained_before_close(self, mock_session):
+        """Short bodies should be read off so the connection can be reused."""
+        post_response = _response(405, chunks=[b"method not allowed"])
+        get_response = _response(200, chunks=[b"<html>", b"done</html>"])
+        mock_session.post.return_value = post_response
+        mock_session.get.return_value = get_response
+
+        unsubscribe.unsubscribe_single("example.com", "https://example.com/u")
+
+        assert mock_session.post.call_args.kwargs["stream"] is True
+        for response in (post_response, get_response):
+            response.iter_content.assert_called_once()
+            response.close.assert_called_once()
+
+    def test_large_body_not_downloaded(self, mock_session):
+        """A body over the drain limit should not be read; the connection is closed."""
+        response = _response(
+            200, headers={"Content-Length": str(unsubscribe._DRAIN_LIMIT + 1)}
+        )
+        mock_session.get.return_value = response
+
+        unsubscribe.unsubscribe_single(
+            "example.com", "https://example.com/u", one_click=False
+        )
+
+        response.iter_content.assert_not_called()
+        response.close.assert_called_once()
+
+    def test_drain_stops_at_limit(self):
+        """An unsized body should only be read up to the drain limit."""
+        chunk = b"x" * unsubscribe._DRAIN_CHUNK_SIZE
+        chunks = iter([chunk] * (unsubscribe._DRAIN_LIMIT // len(chunk) + 5))
+        response = _response(200, chunks=chunks)
+
+        unsubscribe._release(response)
+
+        assert len(list(chunks)) == 4
+        response.close.assert_called_once()
+
+    def test_get_error_status_reported(self, mock_session):
+        """A non-success GET status should be reported."""
+        mock_session.post.return_value = _response(status_code=405)
+        mock_session.get.return_value = _response(status_code=404)
+
+        result = unsubscribe.unsubscribe_single("example.com", "https://example.com/u")
+
+        assert result == {"success": False, "message": "Server returned status 404"}
+
+    def test_without_one_click_skips_post(self, mock_session):
+        """Senders without one-click support should only get the GET."""
+        mock_session.get.return_value = _response(status_code=200)
+
+        result = unsubscribe.unsubscribe_single(
+            "example.com", "https://example.com/u", one_click=False
+        )
+
+        assert result["success"] is True
+        mock_session.post.assert_not_called()
+
+    def test_mailto_link_not_requested(self, mock_session):
+        """mailto: links should be handed back to the user's email client."""
+        result = unsubscribe.unsubscribe_single("example.com", "mailto:u@example.com")
+
+        assert result["type"] == "mailto"
+        mock_session.post.assert_not_called()
+
+
+def make_label_service(headers_by_id: dict) -> Mock:
+    """Build a mock Gmail service with an "Unsubscribe" label on the given messages."""
+    service = Mock()
+    service.users().labels().list().execute.return_value = {
+        "labels": [{"id": "Label_1", "name": "Unsubscribe"}]
+    }
+    messages_api = service.users().messages()
+    messages_api.list().execute.return_value = {
+        "messages": [{"id": msg_id} for msg_id in headers_by_id]
+    }
+
+    messages_api.get.side_effect = lambda userId, id, **kwargs: id
+
+    def new_batch_http_request(callback=None):
+        batch = Mock()
+        added = []
+        batch.add.side_effect = lambda msg_id, request_id=None: added.append(msg_id)
+
+        def execute():
+            for msg_id in added:
+                if msg_id in headers_by_id:
+                    message = {"payload": {"headers": headers_by_id[msg_id]}}
+                    callback(msg_id, message, None)
+                else:
+                    callback(msg_id, None, Exception("Not Found"))
+
+        batch.execute.side_effect = execute
+        return batch
+
+    service.new_batch_http_request.side_effect = new_batch_http_request
+    return service
+
+
+class TestProcessUnsubscribeLabel:
+    """Tests for process_unsubscribe_label."""
+
+    @patch("app.services.gmail.unsubscribe.get_gmail_service")
+    def test_visits_links_and_clears_label(self, mock_get_service, mock_session):
+        """Every message should lose the label; only link visits count as processed."""
+        service = make_label_service(
+            {
+                "ok": [{"name": "List-Unsubscribe", "value": "<https://a.example/u>"}],
+                "bad": [{"name": "List-Unsubscribe", "value": "<https://b.example/u>"}],
+                "none": [{"name": "From", "value": "x@example.com"}],
+            }
+        )
+        mock_get_service.return_value = (service, None)
+        mock_session.get.side_effect = lambda url, **kwargs: _response(
+            status_code=200 if url.startswith("https://a.") else 500
+        )
+
+        summary = unsubscribe.process_unsubscribe_label()
+
+        assert summary == (
+            "Processed 2 email(s) with the 'Unsubscribe' label. "
+            "Successfully unsubscribed from 1, 2 errors/skipped."
+        )
+        service.users().messages().batchModify.assert_called_once_with(
+            userId="me",
+            body={"removeLabelIds": ["Label_1"], "ids": ["ok", "bad", "none"]},
+        )
+        service.users().messages().modify.assert_not_called()
+
+    @patch("app.services.gmail.unsubscribe.get_gmail_service")
+    def test_mailto_only_headers_not_visited(self, mock_get_service, mock_session):
+        """mailto-only messages should just lose the label, with no HTTP call."""
+        service = make_label_service(
+            {"m": [{"name": "List-Unsubscribe", "value": "<mailto:u@example.com>"}]}
+        )
+        mock_get_service.return_value = (service, None)
+
+        summary = unsubscribe.process_unsubscribe_label()
+
+        assert summary.endswith("Successfully unsubscribed from 0, 1 errors/skipped.")
+        mock_session.get.assert_not_called()
+        mock_session.post.assert_not_called()
+        service.users().messages().batchModify.assert_called_once_with(
+            userId="me", body={"removeLabelIds": ["Label_1"], "ids": ["m"]}
+        )
+
+    @patch("app.services.gmail.unsubscribe.get_gmail_service")
+    def test_header_names_matched_case_insensitively(
+        self, mock_get_service, mock_session
+    ):
+        """Non-canonical header case should still be recognised."""
+        service = make_label_service(
+            {"a": [{"name": "LIST-UNSUBSCRIBE", "value": "<https://a.example/u>"}]}
+        )
+        mock_get_service.return_value = (service, None)
+        mock_session.get.return_value = _response(status_code=200)
+
+        summary = unsubscribe.process_unsubscribe_label()
+
+        assert "Successfully unsubscribed from 1," in summary
+
+    @patch("app.services.gmail.unsubscribe.get_gmail_service")
+    def test_fetches_only_needed_headers(self, mock_get_service, mock_session):
+        """Header fetches should be limited to the needed headers and nothing else."""
+        service = make_label_service({"a": []})
+        mock_get_service.return_value = (service, None)
+
+        unsubscribe.process_unsubscribe_label()
+
+        service.users().messages().get.assert_called_once_with(
+            userId="me",
+            id="a",
+            format="metadata",
+            metadataHeaders=["List-Unsubscribe", "List-Unsubscribe-Post", "From"],
+            fields="payload/headers",
+        )
+
+    @patch("app.services.gmail.unsubscribe.get_gmail_service")
+    def test_lists_every_page_of_the_label(self, mock_get_service, mock_session):
+        """Messages beyond the first list page should be processed too."""
+        link = [{"name": "List-Unsubscribe", "value": "<https://a.example/u>"}]
+        service = make_label_service({"a": link, "b": link})
+        service.users().messages().list().execute.side_effect = [
+            {"messages": [{"id": "a"}], "nextPageToken": "page2"},
+            {"messages": [{"id": "b"}]},
+        ]
+        mock_get_service.return_value = (service, None)
+        mock_session.get.return_value = _response(status_code=200)
+
+        summary = unsubscribe.process_unsubscribe_label()
+
+        assert summary.startswith("Processed 2 email(s)")
+        _, kwargs = service.users().messages().list.call_args
+        assert kwargs["pageToken"] == "page2"
+        assert kwargs["fields"] == "messages/id,nextPageToken"
+
+    @patch("app.services.gmail.unsubscribe.get_gmail_service")
+    def test_label_id_cached_between_runs(self, mock_get_service, mock_session):
+        """A second run should not list the labels again."""
+        service = make_label_service({})
+        mock_get_service.return_value = (service, None)
+
+        unsubscribe.process_unsubscribe_label()
+        unsubscribe.process_unsubscribe_label()
+
+        labels_list = service.users().labels().list
+        labels_list.assert_called_with(userId="me", fields="labels(id,name)")
+        assert labels_list.return_value.execute.call_count == 1
+
+    @patch("app.services.gmail.unsubscribe.get_gmail_service")
+    def test_stale_label_id_looked_up_again(self, mock_get_service, mock_session):
+        """If listing with a cached ID fails, the label should be resolved again."""
+        unsubscribe._label_ids[(None, "unsubscribe")] = "Label_old"
+        service = make_label_service({})
+        messages_list = service.users().messages().list
+        messages_list.return_value.execute.side_effect = [
+            Exception("Invalid label"),
+            {"messages": []},
+        ]
+        mock_get_service.return_value = (service, None)
+
+        with patch.object(unsubscribe.state, "active_account", None):
+            summary = unsubscribe.process_unsubscribe_label()
+
+        assert summary == "No emails found with label 'Unsubscribe'."
+        assert messages_list.call_args.kwargs["labelIds"] == ["Label_1"]
+        assert unsubscribe._label_ids[(None, "unsubscribe")] == "Label_1"
+
+
+class TestUnsubscribeRun:
+    """Tests for the per-run host memo used by process_unsubscribe_label."""
+
+    def test_host_validated_once_per_run(self, mock_session):
+        """URLs on the same host should share one validate_unsafe_url call."""
+        mock_session.get.return_value = _response(status_code=200)
+        run = unsubscribe._UnsubscribeRun()
+
+        assert run.visit("https://t.example/u/1", "a@example.com") is True
+        assert run.visit("https://t.example/u/2", "b@example.com") is True
+
+        unsubscribe.validate_unsafe_url.assert_called_once_with(
+            "https://t.example/u/1"
+        )
+
+    def test_scheme_change_on_known_host_revalidated(self, mock_session):
+        """A redirect to another scheme on a validated host should be checked again."""
+        mock_session.get.return_value = _response(
+            status_code=302, headers={"Location": "ftp://t.example/u"}
+        )
+        unsubscribe.validate_unsafe_url.side_effect = [
+            "https://t.example/u/1",
+            ValueError("Invalid URL scheme"),
+        ]
+        run = unsubscribe._UnsubscribeRun()
+
+        assert run.visit("https://t.example/u/1", None) is False
+
+        assert unsubscribe.validate_unsafe_url.call_count == 2
+        mock_session.get.assert_called_once()
+
+    def test_blocked_host_not_requested(self, mock_session):
+        """A host that fails validation should never be requested."""
+        unsubscribe.validate_unsafe_url.side_effect = ValueError("private IP")
+        run = unsubscribe._UnsubscribeRun()
+
+        assert run.visit("https://10.example/u/1", None) is False
+        assert run.visit("https://10.example/u/2", None) is False
+
+        unsubscribe.validate_unsafe_url.assert_called_once()
+        mock_session.get.assert_not_called()
+
+    def test_failing_host_skipped_after_limit(self, mock_session):
+        """Repeated hard failures should stop further requests to that host."""
+        mock_session.get.side_effect = requests.ConnectionError("refused")
+        run = unsubscribe._UnsubscribeRun()
+
+        for i in range(unsubscribe._HOST_FAILURE_LIMIT + 2):
+            assert run.visit(f"https://down.example/u/{i}", None) is False
+
+        assert mock_session.get.call_count == unsubscribe._HOST_FAILURE_LIMIT
+
+    def test_one_click_posts_before_get(self, mock_session):
+        """Messages with List-Unsubscribe-Post should be unsubscribed by POST."""
+        mock_session.post.return_value = _response(status_code=202)
+        run = unsubscribe._UnsubscribeRun()
+
+        assert run.visit("https://t.example/u", None, one_click=True) is True
+
+        _, kwargs = mock_session.post.call_args
+        assert kwargs["timeout"] == unsubscribe._ONE_CLICK_TIMEOUT
+        mock_session.get.assert_not_called()
+
+    def test_client_errors_do_not_count_as_host_failures(self, mock_session):
+        """A 4xx is link-specific and should not block the host."""
+        mock_session.get.return_value = _response(status_code=404)
+        run = unsubscribe._UnsubscribeRun()
+
+        for i in range(unsubscribe._HOST_FAILURE_LIMIT + 1):
+            run.visit(f"https://t.example/u/{i}", None)
+
+        assert mock_session.get.call_count == unsubscribe._HOST_FAILURE_LIMIT + 1
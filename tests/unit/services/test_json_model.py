@@ -0,0 +1,28 @@
+"""
+Tests for the orjson Gmail API Response Model
+---------------------------------------------
+"""
+
+from googleapiclient.model import JsonModel
+
+from app.services.json_model import OrjsonModel
+
+
+class TestOrjsonModel:
+    """OrjsonModel should deserialize exactly like JsonModel."""
+
+    def test_parses_bytes_like_json_model(self):
+        """UTF-8 JSON bytes should give the same result as JsonModel."""
+        content = '{"id": "t1", "messages": [{"snippet": "café"}]}'.encode()
+
+        assert OrjsonModel().deserialize(content) == JsonModel().deserialize(content)
+
+    def test_data_wrapper_unwrapped(self):
+        """A "data" envelope should be stripped when data_wrapper is set."""
+        content = b'{"data": {"id": "t1"}}'
+
+        assert OrjsonModel(data_wrapper=True).deserialize(content) == {"id": "t1"}
+
+    def test_non_json_returned_as_text(self):
+        """Non-JSON bodies should be returned as decoded text."""
+        assert OrjsonModel().deserialize(b"Not Found") == "Not Found"
@@ -0,0 +1,113 @@
+"""
+Tests for Lazy Service Exports
+------------------------------
+Tests that app.services resolves its exports on first access.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app import services
+
+
+class TestLazyExports:
+    """Tests for PEP 562 lazy loading in app.services."""
+
+    def test_package_import_does_not_load_gmail_client(self):
+        """Importing app.services alone should not import the Google client."""
+        code = (
+            "import sys, app.services; "
+            "assert 'googleapiclient.discovery' not in sys.modules; "
+            "assert 'app.services.auth' not in sys.modules"
+        )
+        repo_root = Path(__file__).resolve().parents[3]
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=repo_root)
+
+    def test_api_import_does_not_load_service_modules(self):
+        """Importing the API routers should leave the service submodules unloaded."""
+        code = (
+            "import sys, app.api; "
+            "assert 'app.services.gmail.scan' not in sys.modules; "
+            "assert 'app.services.gmail.delete' not in sys.modules; "
+            "assert 'app.services.gmail.labels' not in sys.modules"
+        )
+        repo_root = Path(__file__).resolve().parents[3]
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=repo_root)
+
+    def test_auth_import_does_not_load_client_libraries(self):
+        """Importing the auth service should defer the discovery client and OAuth flow."""
+        code = (
+            "import sys, app.services.auth as auth; "
+            "assert 'googleapiclient.discovery' not in sys.modules; "
+            "assert 'google_auth_oauthlib.flow' not in sys.modules; "
+            "assert 'google.oauth2.credentials' not in sys.modules; "
+            "auth.build; "
+            "assert 'googleapiclient.discovery' in sys.modules"
+        )
+        repo_root = Path(__file__).resolve().parents[3]
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=repo_root)
+
+    def test_app_import_does_not_load_client_libraries(self):
+        """Starting the app should not import the Google client or HTTP libraries."""
+        code = (
+            "import sys, app.main; "
+            "loaded = [m for m in ('googleapiclient', 'google.oauth2.credentials', "
+            "'google_auth_oauthlib', 'httplib2', 'requests') if m in sys.modules]; "
+            "assert not loaded, loaded"
+        )
+        repo_root = Path(__file__).resolve().parents[3]
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=repo_root)
+
+    def test_exports_resolve_to_defining_functions(self):
+        """Every exported name should resolve to the service function."""
+        from app.services.gmail import delete
+
+        assert services.delete_emails_bulk_background is (
+            delete.delete_emails_bulk_background
+        )
+        for name in services.__all__:
+            assert callable(getattr(services, name))
+
+    def test_unknown_attribute_raises(self):
+        """Unknown names should raise AttributeError."""
+        with pytest.raises(AttributeError):
+            _ = services.not_a_service
+
+
+class TestGmailLazyExports:
+    """Tests for PEP 562 lazy loading in app.services.gmail."""
+
+    def test_package_import_does_not_load_submodules(self):
+        """Importing app.services.gmail should load only the submodule that is used."""
+        code = (
+            "import sys, app.services.gmail as gmail; "
+            "assert not [m for m in sys.modules if m.startswith('app.services.gmail.')]; "
+            "gmail.scan_emails; "
+            "assert 'app.services.gmail.scan' in sys.modules; "
+            "assert 'app.services.gmail.download' not in sys.modules"
+        )
+        repo_root = Path(__file__).resolve().parents[3]
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=repo_root)
+
+    def test_export_and_unsubscribe_defer_http_libraries(self):
+        """The export and unsubscribe modules should import their HTTP clients on use."""
+        code = (
+            "import sys, app.services.gmail.export, app.services.gmail.unsubscribe; "
+            "assert 'googleapiclient' not in sys.modules; "
+            "assert 'httplib2' not in sys.modules; "
+            "assert 'requests' not in sys.modules"
+        )
+        repo_root = Path(__file__).resolve().parents[3]
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=repo_root)
+
+    def test_underscore_aliases_resolve_to_helpers(self):
+        """Backward-compatible aliases should resolve to the helper functions."""
+        from app.services import gmail
+        from app.services.gmail import helpers
+
+        assert gmail._get_subject is helpers.get_subject
+        for name in gmail.__all__:
+            assert callable(getattr(gmail, name))